@@ -1,23 +1,63 @@
 import logging
-from typing import Optional
+import uuid
+from typing import List, Literal, Optional
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from src.backend.core.config import settings
-from src.backend.services.workflow_service import stream_generate_and_run, stream_generate_only, stream_execute_only
-from src.backend.services.docker_service import get_docker_client, rebuild_image, get_docker_status, cleanup_test_containers
+from src.backend.services.workflow_service import (
+    stream_generate_and_run, stream_generate_only, stream_execute_only,
+    has_inflight_generation, get_generation_flight_stats, cached_generation_events
+)
+from src.backend.services.generation_executor import get_generation_executor
+from src.backend.services.generation_cache import get_generation_cache
+from src.backend.services.batch_execution_service import find_duplicate_suite_names, stream_batch_execution
+from src.backend.services.learning_queue import get_learning_queue
+from src.backend.services.warmup_service import get_warmup_state
+from src.backend.services.docker_service import (
+    get_docker_client, rebuild_image, get_docker_status, cleanup_test_containers, run_in_docker_executor
+)
 
 router = APIRouter()
 
 class Query(BaseModel):
     query: str
+    bypass_cache: bool = False  # Optional: skip the generation cache and always run the crew
+
+async def _lookup_cached_generation(query: Query, model_name: str) -> Optional[List[dict]]:
+    """
+    Look up the generation cache before admission control.
+
+    Returns:
+        Events of a cache hit, [] on a miss, or None when the cache is bypassed
+    """
+    if query.bypass_cache:
+        return None
+    return await run_in_threadpool(cached_generation_events, query.query, model_name) or []
+
+def _ensure_generation_capacity(user_query: str, model_name: str):
+    """Reject the request with 429 + Retry-After when the generation queue is full."""
+    if has_inflight_generation(user_query, model_name):
+        # Joins the running identical generation without taking a queue slot
+        return
+    executor = get_generation_executor()
+    if not executor.has_capacity():
+        retry_after = executor.retry_after_seconds()
+        logging.warning(f"Generation queue full, rejecting request (Retry-After: {retry_after}s)")
+        raise HTTPException(
+            status_code=429,
+            detail="Too many test generations in progress. Please retry later.",
+            headers={"Retry-After": str(retry_after)}
+        )
 
 class ExecuteRequest(BaseModel):
     robot_code: str
     user_query: Optional[str] = None  # Optional: original user query for pattern learning
     workflow_id: Optional[str] = None  # Optional: workflow ID from generation for unified tracking
+    abort_on_failure: bool = False  # Optional: stop after the first failing test
 
 @router.post('/generate-test')
 async def generate_test_only(query: Query):
@@ -35,9 +75,17 @@ async def generate_test_only(query: Query):
     if model_provider == "online" and not settings.GEMINI_API_KEY:
         raise HTTPException(status_code=500, detail="GEMINI_API_KEY environment variable is not set.")
 
+    # Cache hits take no generation worker, so they are served even when the queue is full
+    cached_events = await _lookup_cached_generation(query, model_name)
+    if not cached_events:
+        _ensure_generation_capacity(user_query, model_name)
+
     logging.info(f"[GENERATE ONLY] Using {model_provider} model provider: {model_name}")
 
-    return StreamingResponse(stream_generate_only(user_query, model_provider, model_name), media_type="text/event-stream")
+    return StreamingResponse(
+        stream_generate_only(user_query, model_provider, model_name, query.bypass_cache, cached_events),
+        media_type="text/event-stream"
+    )
 
 @router.post('/execute-test')
 async def execute_test_only(request: ExecuteRequest):
@@ -63,7 +111,49 @@ async def execute_test_only(request: ExecuteRequest):
     else:
         logging.warning("[EXECUTE ONLY] ⚠️ No user query provided - pattern learning will be skipped")
 
-    return StreamingResponse(stream_execute_only(robot_code, user_query, workflow_id), media_type="text/event-stream")
+    return StreamingResponse(
+        stream_execute_only(robot_code, user_query, workflow_id, request.abort_on_failure),
+        media_type="text/event-stream"
+    )
+
+class BatchSuite(BaseModel):
+    name: str
+    robot_code: str
+
+class BatchExecuteRequest(BaseModel):
+    suites: List[BatchSuite]
+    split_by: Literal["suite", "test"] = "suite"  # Shard by suite file or by individual test
+    shards: Optional[int] = None  # Defaults to EXECUTION_BATCH_MAX_SHARDS
+
+@router.post('/execute-batch')
+async def execute_batch(request: BatchExecuteRequest):
+    """
+    Execute many Robot Framework suites (or one multi-test suite) in parallel shards.
+
+    Suites are split by suite or by test across concurrent containers and the shard
+    outputs are merged with rebot into a single report under /reports/<run_id>/.
+    """
+    suites = [(suite.name, suite.robot_code) for suite in request.suites if suite.robot_code.strip()]
+    if not suites:
+        raise HTTPException(status_code=400, detail="No robot code provided")
+    duplicates = find_duplicate_suite_names(suites)
+    if duplicates:
+        raise HTTPException(status_code=400,
+                            detail=f"Suite names must be unique within a batch, duplicated: {', '.join(duplicates)}")
+
+    max_shards = settings.EXECUTION_BATCH_MAX_SHARDS
+    shard_count = min(request.shards or max_shards, max_shards)
+    if shard_count < 1:
+        raise HTTPException(status_code=400, detail="shards must be at least 1")
+
+    run_id = str(uuid.uuid4())
+    logging.info(f"[EXECUTE BATCH] {len(suites)} suites, split by {request.split_by}, "
+                 f"up to {shard_count} shards (run_id={run_id})")
+
+    return StreamingResponse(
+        stream_batch_execution(run_id, suites, request.split_by, shard_count),
+        media_type="text/event-stream"
+    )
 
 @router.post('/generate-and-run')
 async def generate_and_run_streaming(query: Query):
@@ -81,15 +171,51 @@ async def generate_and_run_streaming(query: Query):
     if model_provider == "online" and not settings.GEMINI_API_KEY:
         raise HTTPException(status_code=500, detail="GEMINI_API_KEY environment variable is not set.")
 
+    # Cache hits take no generation worker, so they are served even when the queue is full
+    cached_events = await _lookup_cached_generation(query, model_name)
+    if not cached_events:
+        _ensure_generation_capacity(user_query, model_name)
+
     logging.info(f"[GENERATE AND RUN] Using {model_provider} model provider: {model_name}")
 
-    return StreamingResponse(stream_generate_and_run(user_query, model_provider, model_name), media_type="text/event-stream")
+    return StreamingResponse(
+        stream_generate_and_run(user_query, model_provider, model_name, query.bypass_cache, cached_events),
+        media_type="text/event-stream"
+    )
+
+@router.get('/generation-queue')
+async def generation_queue_status():
+    """Get current generation worker pool utilization (running, waiting, rejected, coalesced)."""
+    return {**get_generation_executor().get_stats(), **get_generation_flight_stats()}
+
+@router.get('/generation-cache')
+async def generation_cache_status():
+    """Get generation cache statistics (entries, hits, misses)."""
+    cache = get_generation_cache()
+    if cache is None:
+        return {"enabled": False}
+    stats = await run_in_threadpool(cache.get_stats)
+    return {"enabled": True, **stats}
+
+@router.delete('/generation-cache')
+async def clear_generation_cache():
+    """Remove all cached generations."""
+    cache = get_generation_cache()
+    if cache is None:
+        return {"enabled": False, "entries_removed": 0}
+    removed = await run_in_threadpool(cache.clear)
+    return {"enabled": True, "entries_removed": removed}
+
+@router.get('/learning-queue')
+async def learning_queue_status():
+    """Get background pattern learning statistics (queue depth, learned, dropped)."""
+    return get_learning_queue().get_stats()
 
 @router.post('/rebuild-docker-image')
 async def rebuild_docker_image_endpoint():
     try:
-        client = get_docker_client()
-        result = rebuild_image(client)
+        client = await run_in_docker_executor(get_docker_client)
+        result = await run_in_docker_executor(rebuild_image, client)
         return result
     except ConnectionError as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -97,11 +223,17 @@ async def rebuild_docker_image_endpoint():
         logging.error(f"Unexpected error during Docker image rebuild: {e}")
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
 
+@router.get('/ready')
+async def readiness_endpoint():
+    """Readiness probe: 503 until startup warm-up has finished (always ready when warm-up is disabled)."""
+    state = get_warmup_state()
+    return JSONResponse(status_code=200 if state.ready else 503, content=state.to_dict())
+
 @router.get('/docker-status')
 async def docker_status_endpoint():
     try:
-        client = get_docker_client()
-        status = get_docker_status(client)
+        client = await run_in_docker_executor(get_docker_client, ping=True)
+        status = await run_in_docker_executor(get_docker_status, client)
         return status
     except ConnectionError as e:
         logging.error(f"Docker connection error: {e}")
@@ -123,8 +255,8 @@ async def cleanup_test_containers_endpoint():
     for comprehensive maintenance.
     """
     try:
-        client = get_docker_client()
-        result = cleanup_test_containers(client)
+        client = await run_in_docker_executor(get_docker_client)
+        result = await run_in_docker_executor(cleanup_test_containers, client)
         return result
         
     except Exception as e:
@@ -23,12 +23,37 @@ class Settings(BaseSettings):
     # Service Configuration
     APP_PORT: int = Field(default=5000, description="Port for FastAPI service")
     BROWSER_USE_SERVICE_URL: str = Field(default="http://localhost:4999", description="URL for BrowserUse service")
+    SSE_HEARTBEAT_INTERVAL: float = Field(default=15.0, description="Seconds of inactivity before an SSE heartbeat comment is sent")
+    
+    # Startup Warm-up Configuration
+    STARTUP_WARMUP_ENABLED: bool = Field(default=False, description="Preload libdoc, embedding model, Chroma collections and the Docker image at startup; /ready reports 503 until done")
+    STARTUP_WARMUP_TIMEOUT: float = Field(default=300.0, description="Maximum seconds for each warm-up step")
+    
+    # Generation Worker Pool Configuration
+    GENERATION_MAX_WORKERS: int = Field(default=2, description="Maximum number of test generations running concurrently")
+    GENERATION_MAX_QUEUE_SIZE: int = Field(default=8, description="Maximum number of generations waiting for a free worker before requests get HTTP 429")
+    GENERATION_ESTIMATED_DURATION: float = Field(default=60.0, description="Initial estimate (seconds) of one generation, used for queue wait estimates")
+    
+    # Generation Cache Configuration
+    GENERATION_CACHE_ENABLED: bool = Field(default=True, description="Serve repeated identical generation requests from a persistent cache")
+    GENERATION_CACHE_DB_PATH: str = Field(default="./data/generation_cache.db", description="Path to generation cache SQLite database")
+    GENERATION_CACHE_TTL_SECONDS: int = Field(default=604800, description="Lifetime of a cached generation in seconds (default 7 days)")
+    GENERATION_CACHE_MAX_ENTRIES: int = Field(default=500, description="Maximum cached generations before least-recently-used entries are evicted")
+    
+    # Test Execution Configuration
+    EXECUTION_MAX_WORKERS: int = Field(default=4, description="Maximum number of Docker operations (builds, test runs) running concurrently off the event loop")
+    EXECUTION_POOL_SIZE: int = Field(default=2, description="Number of warm runner containers kept for test execution (0 disables pooling)")
+    EXECUTION_POOL_MAX_RUNS: int = Field(default=20, description="Recycle a warm runner container after this many test runs")
+    EXECUTION_BATCH_MAX_SHARDS: int = Field(default=4, description="Maximum number of parallel shards (containers) for batch execution")
+    EXECUTION_LIVE_EVENTS: bool = Field(default=True, description="Stream live per-test/per-keyword events from a Robot Framework listener")
+    EXECUTION_LIVE_EVENTS_MAX_DEPTH: int = Field(default=2, description="Deepest keyword nesting level streamed as live events (0 = tests only)")
     
     # Browser Configuration
     BROWSER_HEADLESS: bool = Field(default=True, description="Run browser in headless mode (no UI) for BrowserUse service")
     
     # Robot Framework Library Configuration
     ROBOT_LIBRARY: str = Field(default="selenium", description="Robot Framework library to use: 'selenium' or 'browser'")
+    LIBDOC_SPEC_DIR: str = Field(default="./data/libdoc", description="Directory of cached libdoc JSON specs (<library>-<version>.json); shipped specs are used when the library is not installed")
     
     # Agent Retry Configuration
     MAX_AGENT_ITERATIONS: int = Field(default=3, description="Maximum iterations for agents with delegation enabled (retry attempts)")
@@ -44,7 +69,17 @@ class Settings(BaseSettings):
     OPTIMIZATION_CHROMA_DB_PATH: str = Field(default="./chroma_db", description="Path to ChromaDB storage directory")
     OPTIMIZATION_PATTERN_DB_PATH: str = Field(default="./data/pattern_learning.db", description="Path to pattern learning SQLite database")
     OPTIMIZATION_EMBEDDING_MODEL: str = Field(default="all-MiniLM-L6-v2", description="Sentence transformer model for embeddings (used by ChromaDB)")
+    OPTIMIZATION_VECTOR_BACKEND: str = Field(default="chroma", description="Vector index backend: 'chroma' (ChromaDB) or 'numpy' (exact in-memory index, stored under <chroma path>/numpy)")
     OPTIMIZATION_KEYWORD_SEARCH_TOP_K: int = Field(default=3, description="Number of keywords to return from search")
+    OPTIMIZATION_KEYWORD_SEARCH_MODE: str = Field(default="hybrid", description="Keyword search retrieval: 'hybrid' (exact name/BM25 first, vector fallback), 'lexical' (never embeds) or 'vector'")
+    OPTIMIZATION_KEYWORD_CACHE_MAX_ENTRIES: int = Field(default=1000, description="Maximum keyword searches kept in the process-wide cache (0 disables it)")
+    OPTIMIZATION_KEYWORD_CACHE_TTL_SECONDS: int = Field(default=3600, description="Seconds a cached keyword search stays valid")
+    OPTIMIZATION_PATTERN_MERGE_THRESHOLD: float = Field(default=0.9, description="Similarity (0.0-1.0) above which a learned query is merged into an existing pattern")
+    OPTIMIZATION_PATTERN_MAX_COUNT: int = Field(default=5000, description="Maximum stored query patterns, least used are evicted first (0 for no limit)")
+    OPTIMIZATION_LEARNING_QUEUE_SIZE: int = Field(default=1000, description="Maximum passed tests waiting for background pattern learning (more are dropped)")
+    OPTIMIZATION_LEARNING_BATCH_SIZE: int = Field(default=32, description="Maximum passed tests stored per pattern learning flush")
+    OPTIMIZATION_LEARNING_FLUSH_SECONDS: float = Field(default=2.0, description="Maximum seconds a passed test waits before its learning batch is flushed")
+    OPTIMIZATION_LEARNING_SHUTDOWN_TIMEOUT: float = Field(default=10.0, description="Seconds to wait on shutdown for queued pattern learning to be stored")
     OPTIMIZATION_PATTERN_CONFIDENCE_THRESHOLD: float = Field(default=0.7, description="Minimum confidence for pattern prediction (0.0-1.0)")
     OPTIMIZATION_CONTEXT_PRUNING_ENABLED: bool = Field(default=True, description="Enable smart context pruning")
     OPTIMIZATION_CONTEXT_PRUNING_THRESHOLD: float = Field(default=0.6, description="Minimum confidence for category classification (0.0-1.0)")
@@ -77,7 +112,120 @@ class Settings(BaseSettings):
             raise ValueError(f"MAX_LOCATOR_STRATEGIES must be between 1 and 50, got {v}")
         return v
     
-    @validator('OPTIMIZATION_PATTERN_CONFIDENCE_THRESHOLD', 'OPTIMIZATION_CONTEXT_PRUNING_THRESHOLD')
+    @validator('STARTUP_WARMUP_TIMEOUT')
+    def validate_startup_warmup_timeout(cls, v):
+        """Validate that STARTUP_WARMUP_TIMEOUT is positive."""
+        if v <= 0:
+            raise ValueError(f"STARTUP_WARMUP_TIMEOUT must be positive, got {v}")
+        return v
+    
+    @validator('GENERATION_MAX_WORKERS')
+    def validate_generation_max_workers(cls, v):
+        """Validate that GENERATION_MAX_WORKERS is at least 1."""
+        if v < 1:
+            raise ValueError(f"GENERATION_MAX_WORKERS must be at least 1, got {v}")
+        return v
+    
+    @validator('GENERATION_MAX_QUEUE_SIZE')
+    def validate_generation_max_queue_size(cls, v):
+        """Validate that GENERATION_MAX_QUEUE_SIZE is not negative."""
+        if v < 0:
+            raise ValueError(f"GENERATION_MAX_QUEUE_SIZE must be 0 or greater, got {v}")
+        return v
+    
+    @validator('GENERATION_CACHE_TTL_SECONDS', 'GENERATION_CACHE_MAX_ENTRIES')
+    def validate_generation_cache_limits(cls, v):
+        """Validate that generation cache TTL and size limits are at least 1."""
+        if v < 1:
+            raise ValueError(f"Generation cache TTL and max entries must be at least 1, got {v}")
+        return v
+    
+    @validator('EXECUTION_MAX_WORKERS')
+    def validate_execution_max_workers(cls, v):
+        """Validate that EXECUTION_MAX_WORKERS is at least 1."""
+        if v < 1:
+            raise ValueError(f"EXECUTION_MAX_WORKERS must be at least 1, got {v}")
+        return v
+    
+    @validator('EXECUTION_POOL_SIZE')
+    def validate_execution_pool_size(cls, v):
+        """Validate that EXECUTION_POOL_SIZE is not negative."""
+        if v < 0:
+            raise ValueError(f"EXECUTION_POOL_SIZE must be 0 or greater, got {v}")
+        return v
+    
+    @validator('EXECUTION_POOL_MAX_RUNS')
+    def validate_execution_pool_max_runs(cls, v):
+        """Validate that EXECUTION_POOL_MAX_RUNS is at least 1."""
+        if v < 1:
+            raise ValueError(f"EXECUTION_POOL_MAX_RUNS must be at least 1, got {v}")
+        return v
+    
+    @validator('EXECUTION_BATCH_MAX_SHARDS')
+    def validate_execution_batch_max_shards(cls, v):
+        """Validate that EXECUTION_BATCH_MAX_SHARDS is at least 1."""
+        if v < 1:
+            raise ValueError(f"EXECUTION_BATCH_MAX_SHARDS must be at least 1, got {v}")
+        return v
+    
+    @validator('EXECUTION_LIVE_EVENTS_MAX_DEPTH')
+    def validate_execution_live_events_max_depth(cls, v):
+        """Validate that EXECUTION_LIVE_EVENTS_MAX_DEPTH is not negative."""
+        if v < 0:
+            raise ValueError(f"EXECUTION_LIVE_EVENTS_MAX_DEPTH must be 0 or greater, got {v}")
+        return v
+    
+    @validator('OPTIMIZATION_VECTOR_BACKEND')
+    def validate_optimization_vector_backend(cls, v):
+        """Validate that OPTIMIZATION_VECTOR_BACKEND is either 'chroma' or 'numpy'."""
+        if v.lower() not in ['chroma', 'numpy']:
+            raise ValueError(f"OPTIMIZATION_VECTOR_BACKEND must be 'chroma' or 'numpy', got '{v}'")
+        return v.lower()
+    
+    @validator('OPTIMIZATION_KEYWORD_SEARCH_MODE')
+    def validate_optimization_keyword_search_mode(cls, v):
+        """Validate that OPTIMIZATION_KEYWORD_SEARCH_MODE is 'hybrid', 'lexical' or 'vector'."""
+        if v.lower() not in ['hybrid', 'lexical', 'vector']:
+            raise ValueError(f"OPTIMIZATION_KEYWORD_SEARCH_MODE must be 'hybrid', 'lexical' or 'vector', got '{v}'")
+        return v.lower()
+    
+    @validator('OPTIMIZATION_KEYWORD_CACHE_MAX_ENTRIES')
+    def validate_optimization_keyword_cache_max_entries(cls, v):
+        """Validate that OPTIMIZATION_KEYWORD_CACHE_MAX_ENTRIES is not negative."""
+        if v < 0:
+            raise ValueError(f"OPTIMIZATION_KEYWORD_CACHE_MAX_ENTRIES must be 0 or greater, got {v}")
+        return v
+    
+    @validator('OPTIMIZATION_KEYWORD_CACHE_TTL_SECONDS')
+    def validate_optimization_keyword_cache_ttl_seconds(cls, v):
+        """Validate that OPTIMIZATION_KEYWORD_CACHE_TTL_SECONDS is at least 1."""
+        if v < 1:
+            raise ValueError(f"OPTIMIZATION_KEYWORD_CACHE_TTL_SECONDS must be at least 1, got {v}")
+        return v
+    
+    @validator('OPTIMIZATION_PATTERN_MAX_COUNT')
+    def validate_optimization_pattern_max_count(cls, v):
+        """Validate that OPTIMIZATION_PATTERN_MAX_COUNT is not negative."""
+        if v < 0:
+            raise ValueError(f"OPTIMIZATION_PATTERN_MAX_COUNT must be 0 or greater, got {v}")
+        return v
+    
+    @validator('OPTIMIZATION_LEARNING_QUEUE_SIZE', 'OPTIMIZATION_LEARNING_BATCH_SIZE')
+    def validate_optimization_learning_sizes(cls, v):
+        """Validate that the pattern learning queue and batch sizes are at least 1."""
+        if v < 1:
+            raise ValueError(f"Pattern learning queue and batch sizes must be at least 1, got {v}")
+        return v
+    
+    @validator('OPTIMIZATION_LEARNING_FLUSH_SECONDS', 'OPTIMIZATION_LEARNING_SHUTDOWN_TIMEOUT')
+    def validate_optimization_learning_seconds(cls, v):
+        """Validate that the pattern learning flush interval and shutdown timeout are positive."""
+        if v <= 0:
+            raise ValueError(f"Pattern learning flush interval and shutdown timeout must be greater than 0, got {v}")
+        return v
+    
+    @validator('OPTIMIZATION_PATTERN_CONFIDENCE_THRESHOLD', 'OPTIMIZATION_CONTEXT_PRUNING_THRESHOLD',
+               'OPTIMIZATION_PATTERN_MERGE_THRESHOLD')
     def validate_confidence_threshold(cls, v):
         """Validate that confidence thresholds are between 0.0 and 1.0."""
         if not 0.0 <= v <= 1.0:
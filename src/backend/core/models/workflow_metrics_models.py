@@ -68,6 +68,9 @@ class KeywordSearchStats(BaseModel):
     avg_latency_ms: float = 0.0
     returned_keywords: List[str] = Field(default_factory=list)
     accuracy: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_hit_rate: float = 0.0
 
 
 class PatternLearningStats(BaseModel):
@@ -123,6 +126,12 @@ class WorkflowMetricsBase(
     
     # Per-element approach metrics for pattern analysis
     element_approach_metrics: Optional[List[Dict[str, Any]]] = None
+    
+    # Generation cache outcome (None = cache bypassed or disabled)
+    generation_cache_hit: Optional[bool] = None
+
+    # Per-stage crew timings: {"planner": {"duration_seconds": 4.2, "tokens": 1830}, ...}
+    stage_timings: Optional[Dict[str, Dict[str, Any]]] = None
 
 
 class WorkflowMetrics(WorkflowMetricsBase):
@@ -171,7 +180,10 @@ class WorkflowMetrics(WorkflowMetricsBase):
                 "total_latency_ms": 0.0,
                 "avg_latency_ms": 0.0,
                 "returned_keywords": [],
-                "accuracy": 0.0
+                "accuracy": 0.0,
+                "cache_hits": 0,
+                "cache_misses": 0,
+                "cache_hit_rate": 0.0
             }
         
         if self.pattern_learning_stats is None:
@@ -252,8 +264,9 @@ class WorkflowMetrics(WorkflowMetricsBase):
             self.token_usage[agent_name] += token_count
             self.token_usage["total"] += token_count
     
-    def track_keyword_search(self, latency_ms: float, returned_keywords: List[str]) -> None:
-        """Track keyword search performance."""
+    def track_keyword_search(self, latency_ms: float, returned_keywords: List[str],
+                             cache_hit: Optional[bool] = None) -> None:
+        """Track keyword search performance (cache_hit is None when the search was not cached)."""
         self.keyword_search_stats["calls"] += 1
         self.keyword_search_stats["total_latency_ms"] += latency_ms
         self.keyword_search_stats["avg_latency_ms"] = (
@@ -261,6 +274,14 @@ class WorkflowMetrics(WorkflowMetricsBase):
             self.keyword_search_stats["calls"]
         )
         self.keyword_search_stats["returned_keywords"].extend(returned_keywords)
+        if cache_hit is not None:
+            key = "cache_hits" if cache_hit else "cache_misses"
+            self.keyword_search_stats[key] = self.keyword_search_stats.get(key, 0) + 1
+            lookups = (self.keyword_search_stats.get("cache_hits", 0) +
+                       self.keyword_search_stats.get("cache_misses", 0))
+            self.keyword_search_stats["cache_hit_rate"] = round(
+                self.keyword_search_stats.get("cache_hits", 0) / lookups, 3
+            )
     
     def track_pattern_learning(self, predicted: bool, keyword_count: int, accuracy: float = 0.0) -> None:
         """Track pattern learning usage."""
@@ -316,6 +337,8 @@ class WorkflowMetricsResponse(WorkflowMetricsBase):
             custom_action_usage_count=m.custom_action_usage_count,
             session_id=m.session_id,
             element_approach_metrics=m.element_approach_metrics,
+            generation_cache_hit=m.generation_cache_hit,
+            stage_timings=m.stage_timings,
         )
 
 
@@ -337,6 +360,9 @@ class AggregateMetricsResponse(BaseModel):
     avg_cost_per_element: float
     custom_action_usage_rate: float
     avg_execution_time: float
+    generation_cache_hits: int = 0
+    generation_cache_misses: int = 0
+    generation_cache_hit_rate: float = 0.0
     date_range: Dict[str, Optional[str]]
 
 
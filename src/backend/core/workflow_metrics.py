@@ -122,6 +122,9 @@ class WorkflowMetricsCollector:
                 'avg_cost_per_element': 0.0,
                 'custom_action_usage_rate': 0.0,
                 'avg_execution_time': 0.0,
+                'generation_cache_hits': 0,
+                'generation_cache_misses': 0,
+                'generation_cache_hit_rate': 0.0,
                 'date_range': {
                     'start': start_date.isoformat() if start_date else None,
                     'end': end_date.isoformat() if end_date else None
@@ -136,6 +139,8 @@ class WorkflowMetricsCollector:
         total_cost = sum(m.total_cost for m in metrics)
         custom_action_workflows = sum(1 for m in metrics if m.custom_actions_enabled)
         total_execution_time = sum(m.execution_time for m in metrics)
+        cache_hits = sum(1 for m in metrics if m.generation_cache_hit is True)
+        cache_misses = sum(1 for m in metrics if m.generation_cache_hit is False)
         
         return {
             'total_workflows': total_workflows,
@@ -149,6 +154,9 @@ class WorkflowMetricsCollector:
             'avg_cost_per_element': total_cost / total_elements if total_elements > 0 else 0.0,
             'custom_action_usage_rate': (custom_action_workflows / total_workflows * 100) if total_workflows > 0 else 0.0,
             'avg_execution_time': total_execution_time / total_workflows if total_workflows > 0 else 0.0,
+            'generation_cache_hits': cache_hits,
+            'generation_cache_misses': cache_misses,
+            'generation_cache_hit_rate': (cache_hits / (cache_hits + cache_misses) * 100) if (cache_hits + cache_misses) > 0 else 0.0,
             'date_range': {
                 'start': start_date.isoformat() if start_date else None,
                 'end': end_date.isoformat() if end_date else None
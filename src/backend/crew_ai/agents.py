@@ -2,9 +2,6 @@ import os
 import sys
 import logging
 from crewai import Agent
-from crewai.llm import LLM
-from crewai_tools import SeleniumScrapingTool, ScrapeElementFromWebsiteTool
-from langchain_ollama import OllamaLLM
 
 # Import browser_use_tool from tools package
 # Note: Path setup is handled by tools/__init__.py automatically
@@ -43,8 +40,6 @@ def get_llm(model_provider, model_name):
 
 # Initialize the tools
 # Note: These are tool instances, not classes. CrewAI requires instantiated tools.
-selenium_tool = SeleniumScrapingTool()
-scrape_tool = ScrapeElementFromWebsiteTool()
 # Primary tool: Batch processing for multiple elements with full context
 batch_browser_use_tool = BatchBrowserUseTool()
 
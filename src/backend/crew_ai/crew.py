@@ -1,56 +1,19 @@
-from crewai import Crew, Process
-from src.backend.crew_ai.agents import RobotAgents
-from src.backend.crew_ai.tasks import RobotTasks
 from src.backend.crew_ai.llm_output_cleaner import LLMOutputCleaner, formatting_monitor
+from src.backend.crew_ai.query_analysis import QueryAnalysis
+from src.backend.crew_ai.stage_progress import StageProgressTracker
 from src.backend.core.workflow_metrics import WorkflowMetrics, count_tokens
 from datetime import datetime
-import re
+from typing import Any, Callable, Dict, Optional
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
 
-def extract_url_from_query(query: str) -> str:
-    """
-    Dynamically extract URL from user query using regex patterns.
-    Returns the URL if found, otherwise returns a generic placeholder.
-    """
-    # Pattern 1: Full URLs with protocol (http:// or https://)
-    url_pattern = r'https?://[^\s]+'
-    match = re.search(url_pattern, query, re.IGNORECASE)
-    if match:
-        url = match.group(0).rstrip('.,;!?')  # Remove trailing punctuation
-        logger.info(f"Extracted full URL from query: {url}")
-        return url
-
-    # Pattern 2: Domain names with common TLDs (www.example.com, example.in, etc.)
-    domain_pattern = r'\b(?:www\.)?([a-zA-Z0-9-]+\.(?:com|in|org|net|co|io|ai|app|dev|tech))\b'
-    match = re.search(domain_pattern, query, re.IGNORECASE)
-    if match:
-        domain = match.group(0)
-        # Add https:// if not present
-        url = f"https://{domain}" if not domain.startswith('http') else domain
-        logger.info(f"Extracted domain from query and constructed URL: {url}")
-        return url
-
-    # Pattern 3: Website names without TLD (e.g., "on flipkart", "amazon", "google")
-    # Try to extract potential website name and construct URL
-    website_pattern = r'\b(?:on|from|at|in|visit|go to|open)\s+([a-zA-Z0-9]+)\b'
-    match = re.search(website_pattern, query, re.IGNORECASE)
-    if match:
-        website_name = match.group(1).lower()
-        # Common TLD is .com, user can be more specific if needed
-        url = f"https://www.{website_name}.com"
-        logger.info(
-            f"Inferred website name '{website_name}' and constructed URL: {url}")
-        return url
-
-    # If no URL found, return placeholder - let the popup analyzer handle it
-    logger.warning("No URL found in query, returning placeholder")
-    return "website mentioned in query"
-
-
-def run_crew(query: str, model_provider: str, model_name: str, library_type: str = None, workflow_id: str = ""):
+def run_crew(query: str, model_provider: str, model_name: str, library_type: str = None, workflow_id: str = "",
+             progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+             cancel_event: Optional[threading.Event] = None,
+             query_analysis: Optional[QueryAnalysis] = None):
     """
     Initializes and runs the CrewAI crew to generate Robot Framework test code.
 
@@ -60,6 +23,11 @@ def run_crew(query: str, model_provider: str, model_name: str, library_type: str
         model_name: Model identifier
         library_type: "selenium" or "browser" (optional, defaults to config setting)
         workflow_id: Unique workflow identifier for metrics tracking
+        progress_callback: Receives stage progress events while the crew runs
+            (see stage_progress.StageProgressTracker)
+        cancel_event: When set, the crew stops at the next agent step with GenerationCancelledError
+        query_analysis: Analysis of the query shared with the caller (created if not provided);
+            filled in by the optimization system and read by every agent context
 
     Architecture Note:
     - Rate limiting was removed during Phase 2 of codebase cleanup. Direct LLM calls
@@ -68,6 +36,12 @@ def run_crew(query: str, model_provider: str, model_name: str, library_type: str
     - Library context is loaded dynamically based on ROBOT_LIBRARY config setting.
     - Optimization system (pattern learning, ChromaDB) can be enabled via OPTIMIZATION_ENABLED config.
     """
+    # Heavy dependencies (crewai, LLM clients, tools) are imported on first use
+    # so that importing this module does not slow down API startup
+    from crewai import Crew, Process
+    from src.backend.crew_ai.agents import RobotAgents
+    from src.backend.crew_ai.tasks import RobotTasks
+
     # Load library context based on configuration
     from src.backend.core.config import settings
     from src.backend.crew_ai.library_context import get_library_context
@@ -81,6 +55,10 @@ def run_crew(query: str, model_provider: str, model_name: str, library_type: str
     logger.info(
         f"✅ Loaded {library_context.library_name} context with dynamic keywords")
 
+    # URL, embedding, predicted keywords and categories are computed once per workflow
+    if query_analysis is None:
+        query_analysis = QueryAnalysis.from_query(query)
+
     # Initialize metrics for optimization tracking
     optimization_metrics = None
     if settings.OPTIMIZATION_ENABLED:
@@ -89,7 +67,7 @@ def run_crew(query: str, model_provider: str, model_name: str, library_type: str
         optimization_metrics = WorkflowMetrics(
             workflow_id=workflow_id or "temp",
             timestamp=datetime.now(),
-            url=extract_url_from_query(query),
+            url=query_analysis.url,
             total_llm_calls=0,
             total_cost=0.0,
             execution_time=0.0
@@ -105,36 +83,19 @@ def run_crew(query: str, model_provider: str, model_name: str, library_type: str
     if settings.OPTIMIZATION_ENABLED:
         try:
             logger.info("🚀 Optimization system enabled - initializing components")
-            from src.backend.crew_ai.optimization import (
-                KeywordVectorStore,
-                QueryPatternMatcher,
-                SmartKeywordProvider,
-                ContextPruner
-            )
-            
-            # Initialize ChromaDB vector store
-            vector_store = KeywordVectorStore(
-                persist_directory=settings.OPTIMIZATION_CHROMA_DB_PATH
-            )
-            
-            # Ensure collection is ready (auto-rebuild if version mismatch)
-            vector_store.ensure_collection_ready(library_context.library_name)
+            from src.backend.crew_ai.optimization import SmartKeywordProvider, get_component_registry
             
-            # Initialize pattern matcher (with ChromaDB for query embeddings)
-            pattern_matcher = QueryPatternMatcher(
-                db_path=settings.OPTIMIZATION_PATTERN_DB_PATH,
-                chroma_store=vector_store  # Pass ChromaDB store for query embeddings
-            )
+            # Shared warm components (one ChromaDB client and embedding model per process);
+            # the collection is version-checked on first use only
+            registry = get_component_registry()
+            vector_store = registry.get_vector_store(library_context.library_name)
+            pattern_matcher = registry.get_pattern_matcher()
             
-            # Initialize context pruner if enabled
+            # Get context pruner if enabled
             context_pruner = None
             if settings.OPTIMIZATION_CONTEXT_PRUNING_ENABLED:
                 try:
-                    logger.info("🔍 Initializing context pruner...")
-                    context_pruner = ContextPruner(
-                        persist_directory=settings.OPTIMIZATION_CHROMA_DB_PATH
-                    )
-                    logger.info("✅ Context pruner initialized")
+                    context_pruner = registry.get_context_pruner()
                 except Exception as e:
                     logger.warning(f"⚠️ Failed to initialize context pruner: {e}")
                     logger.warning("   Context pruning will be disabled")
@@ -154,14 +115,15 @@ def run_crew(query: str, model_provider: str, model_name: str, library_type: str
             baseline_context = library_context.code_assembly_context
             baseline_context_tokens = count_tokens(baseline_context)
             
-            # Get optimized contexts for ALL agents
+            # Get optimized contexts for ALL agents (one embedding and prediction for all of them)
             logger.info("🎯 Generating optimized contexts for all agents...")
-            planner_context = smart_provider.get_agent_context(query, "planner")
+            smart_provider.analyze_query(query_analysis)
+            planner_context = smart_provider.get_agent_context(query, "planner", query_analysis)
             # Identifier context skipped - element_identifier_agent doesn't use context
             # It only needs batch_browser_automation tool, no keyword knowledge required
             identifier_context = None
-            assembler_context = smart_provider.get_agent_context(query, "assembler")
-            validator_context = smart_provider.get_agent_context(query, "validator")
+            assembler_context = smart_provider.get_agent_context(query, "assembler", query_analysis)
+            validator_context = smart_provider.get_agent_context(query, "validator", query_analysis)
             
             # Calculate total optimized tokens (skip None values)
             planner_tokens = count_tokens(planner_context)
@@ -230,6 +192,9 @@ def run_crew(query: str, model_provider: str, model_name: str, library_type: str
     assemble_code = tasks.assemble_code_task(code_assembler_agent)
     validate_code = tasks.validate_code_task(code_validator_agent, code_assembler_agent)
 
+    # Stage progress comes from the crew's own task/step callbacks
+    progress = StageProgressTracker(progress_callback or (lambda event: None), cancel_event)
+
     # Create and run the crew
     crew = Crew(
         agents=[step_planner_agent, element_identifier_agent,
@@ -238,7 +203,10 @@ def run_crew(query: str, model_provider: str, model_name: str, library_type: str
         process=Process.sequential,
         verbose=True,
         embedder=None,  # Disable automatic knowledge/embedding system
+        task_callback=progress.on_task_complete,
+        step_callback=progress.on_step,
     )
+    progress.bind(crew)
 
     logger.info("🚀 Starting CrewAI workflow execution...")
     logger.info(
@@ -247,6 +215,7 @@ def run_crew(query: str, model_provider: str, model_name: str, library_type: str
         f"📊 LLM Output Cleaner Status: {formatting_monitor.get_stats()}")
 
     try:
+        progress.start()
         result = crew.kickoff()
         logger.info("✅ CrewAI workflow completed successfully")
         logger.info(f"🏁 Crew execution finished - delegation cycle complete")
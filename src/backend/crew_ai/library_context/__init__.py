@@ -6,6 +6,9 @@ allowing them to dynamically generate code for different Robot Framework librari
 without hardcoding keywords or syntax.
 """
 
+import threading
+from typing import Dict
+
 from .base import LibraryContext
 from .selenium_context import SeleniumLibraryContext
 from .browser_context import BrowserLibraryContext
@@ -17,10 +20,17 @@ __all__ = [
     "get_library_context"
 ]
 
+# One shared context per library, so their rendered contexts survive across requests
+_library_contexts: Dict[str, LibraryContext] = {}
+_library_contexts_lock = threading.Lock()
+
 
 def get_library_context(library_type: str) -> LibraryContext:
     """
-    Factory function to get the appropriate library context.
+    Get the shared library context for a library type.
+    
+    The context is created once per process; its rendered agent contexts are
+    cached on the instance and reused by every request. Treat it as read-only.
     
     Args:
         library_type: "selenium" or "browser"
@@ -35,9 +45,16 @@ def get_library_context(library_type: str) -> LibraryContext:
     """
     library_type = library_type.lower()
     
-    if library_type == "selenium":
-        return SeleniumLibraryContext()
-    elif library_type == "browser":
-        return BrowserLibraryContext()
-    else:
-        raise ValueError(f"Unknown library type: {library_type}. Use 'selenium' or 'browser'")
+    context = _library_contexts.get(library_type)
+    if context is None:
+        with _library_contexts_lock:
+            context = _library_contexts.get(library_type)
+            if context is None:
+                if library_type == "selenium":
+                    context = SeleniumLibraryContext()
+                elif library_type == "browser":
+                    context = BrowserLibraryContext()
+                else:
+                    raise ValueError(f"Unknown library type: {library_type}. Use 'selenium' or 'browser'")
+                _library_contexts[library_type] = context
+    return context
@@ -177,6 +177,20 @@ class LibraryContext(ABC):
         """
         pass
 
+    def prerender(self) -> "LibraryContext":
+        """
+        Render every agent context now.
+
+        Library contexts are shared per process (see get_library_context), so
+        after this call requests only read cached strings.
+
+        Returns:
+            self, for chaining
+        """
+        for role in ("planner", "assembler", "validator"):
+            self.get_full_context(role)
+        return self
+
     def get_full_context(self, agent_role: str) -> str:
         """
         Get complete context for a specific agent role.
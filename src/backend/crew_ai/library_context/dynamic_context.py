@@ -5,20 +5,127 @@ This module automatically extracts keyword documentation from installed
 Robot Framework libraries, ensuring the context is always up-to-date
 with the installed library version.
 
-Uses in-memory caching to avoid repeated libdoc calls during server runtime.
+Extracted libdoc specs are cached in memory for the server runtime and on
+disk as ``<LIBDOC_SPEC_DIR>/<library>-<version>.json``, so libdoc only runs
+once per library version. The version is read from the package metadata,
+which takes microseconds. Specs in the directory can be shipped with the
+image: nodes without the library installed load the newest shipped spec.
 """
 
 import json
 import logging
+import os
+import re
 import tempfile
 from pathlib import Path
 from typing import Dict, Optional
 
+try:
+    # Optional: parses the multi-megabyte Browser spec several times faster than json
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 # Global cache for library documentation (persists during server runtime)
 _LIBRARY_DOC_CACHE: Dict[str, Dict] = {}
 
+# Package that provides each library, used to resolve its version without libdoc
+_LIBRARY_DISTRIBUTIONS = {
+    "SeleniumLibrary": "robotframework-seleniumlibrary",
+    "Browser": "robotframework-browser",
+}
+
+# Installed library versions (None = not installed), resolved once per process
+_LIBRARY_VERSION_CACHE: Dict[str, Optional[str]] = {}
+
+
+def get_installed_library_version(library_name: str) -> Optional[str]:
+    """
+    Get the installed version of a library from its package metadata.
+
+    Args:
+        library_name: Name of the Robot Framework library (e.g., 'SeleniumLibrary', 'Browser')
+
+    Returns:
+        Version string, or None if the library is not installed
+    """
+    if library_name not in _LIBRARY_VERSION_CACHE:
+        from importlib.metadata import PackageNotFoundError, version
+
+        distribution = _LIBRARY_DISTRIBUTIONS.get(library_name, library_name)
+        try:
+            _LIBRARY_VERSION_CACHE[library_name] = version(distribution)
+        except PackageNotFoundError:
+            _LIBRARY_VERSION_CACHE[library_name] = None
+    return _LIBRARY_VERSION_CACHE[library_name]
+
+
+def get_libdoc_spec_dir() -> Path:
+    """Directory holding the cached libdoc specs (LIBDOC_SPEC_DIR)."""
+    from src.backend.core.config import settings
+    return Path(settings.LIBDOC_SPEC_DIR)
+
+
+def get_libdoc_spec_path(library_name: str, version: str, spec_dir: Optional[Path] = None) -> Path:
+    """Path of the cached libdoc spec of a library version."""
+    safe_version = re.sub(r"[^0-9A-Za-z._-]", "_", version)
+    return (spec_dir or get_libdoc_spec_dir()) / f"{library_name}-{safe_version}.json"
+
+
+def find_latest_libdoc_spec(library_name: str, spec_dir: Optional[Path] = None) -> Optional[Path]:
+    """Return the cached spec with the highest version for a library, if any."""
+    spec_dir = spec_dir or get_libdoc_spec_dir()
+    if not spec_dir.is_dir():
+        return None
+
+    def version_key(path: Path):
+        version = path.stem[len(library_name) + 1:]
+        return [int(part) for part in re.findall(r"\d+", version)], version
+
+    # The version must start with a digit so "Browser-*" does not match e.g. "Browser-Extra-1.0"
+    specs = [p for p in spec_dir.glob(f"{library_name}-*.json") if p.stem[len(library_name) + 1:][:1].isdigit()]
+    return max(specs, key=version_key) if specs else None
+
+
+def load_libdoc_spec(path: Path) -> Dict:
+    """Load a libdoc JSON spec (bytes are parsed directly, no text decoding pass)."""
+    return _json_loads(path.read_bytes())
+
+
+def write_libdoc_spec(library_name: str, path: Path) -> Dict:
+    """
+    Run libdoc for a library and write its JSON spec atomically to ``path``.
+
+    Args:
+        library_name: Name of the Robot Framework library
+        path: Destination of the spec
+
+    Returns:
+        The extracted spec
+
+    Raises:
+        ImportError: If Robot Framework or the library is not installed
+    """
+    from robot.libdoc import libdoc
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write next to the destination so the rename is atomic; concurrent readers never see partial files
+    fd, temp_path = tempfile.mkstemp(prefix=f".{library_name}-", suffix='.json', dir=path.parent)
+    os.close(fd)
+    try:
+        libdoc(library_name, temp_path, format='JSON')
+        if os.path.getsize(temp_path) == 0:
+            # libdoc prints import errors and returns without writing the spec
+            raise ImportError(f"libdoc could not import {library_name}")
+        doc_data = load_libdoc_spec(Path(temp_path))
+        os.replace(temp_path, path)
+        return doc_data
+    finally:
+        Path(temp_path).unlink(missing_ok=True)
+
 
 class DynamicLibraryDocumentation:
     """
@@ -40,14 +147,17 @@ class DynamicLibraryDocumentation:
     
     def get_library_documentation(self) -> Dict:
         """
-        Extract library documentation using Robot Framework's libdoc.
-        Uses global cache to avoid repeated extraction during server runtime.
+        Get the library documentation extracted by Robot Framework's libdoc.
+        
+        Lookup order: the in-memory cache, the on-disk spec of the installed
+        version, a fresh libdoc extraction (written to disk), and - when the
+        library is not installed - the newest shipped spec.
         
         Returns:
             Dictionary containing library metadata and keywords
             
         Raises:
-            ImportError: If library is not installed
+            ImportError: If library is not installed and no spec is shipped
             Exception: If libdoc extraction fails
         """
         # Check global cache first
@@ -55,26 +165,25 @@ class DynamicLibraryDocumentation:
             logger.debug(f"Using cached documentation for {self.library_name}")
             return _LIBRARY_DOC_CACHE[self.library_name]
         
+        version = get_installed_library_version(self.library_name)
         try:
-            from robot.libdoc import libdoc
-            
-            # Create temporary file for JSON output
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
-                temp_path = temp_file.name
-            
-            logger.info(f"Extracting documentation for {self.library_name} using libdoc...")
-            
-            # Extract documentation in JSON format
-            libdoc(self.library_name, temp_path, format='JSON')
-            
-            # Read the generated JSON
-            with open(temp_path, 'r', encoding='utf-8') as f:
-                doc_data = json.load(f)
-            
-            # Clean up temp file
-            Path(temp_path).unlink(missing_ok=True)
-            
-            logger.info(f"Successfully extracted {len(doc_data.get('keywords', []))} keywords from {self.library_name}")
+            if version is None:
+                spec_path = find_latest_libdoc_spec(self.library_name)
+                if spec_path is None:
+                    raise ImportError(f"{self.library_name} is not installed and no libdoc spec is shipped "
+                                      f"in {get_libdoc_spec_dir()}")
+                doc_data = load_libdoc_spec(spec_path)
+                logger.info(f"📄 {self.library_name} is not installed, using shipped spec {spec_path.name}")
+            else:
+                spec_path = get_libdoc_spec_path(self.library_name, version)
+                if spec_path.exists():
+                    doc_data = load_libdoc_spec(spec_path)
+                    logger.debug(f"Loaded cached libdoc spec {spec_path}")
+                else:
+                    logger.info(f"Extracting documentation for {self.library_name} {version} using libdoc...")
+                    doc_data = write_libdoc_spec(self.library_name, spec_path)
+                    logger.info(f"Successfully extracted {len(doc_data.get('keywords', []))} keywords from "
+                                f"{self.library_name}, cached in {spec_path}")
             
             # Store in global cache
             _LIBRARY_DOC_CACHE[self.library_name] = doc_data
@@ -88,6 +197,21 @@ class DynamicLibraryDocumentation:
             logger.error(f"Failed to extract documentation for {self.library_name}: {e}")
             raise
     
+    def get_library_version(self) -> Optional[str]:
+        """
+        Get the library version without loading the documentation.
+        
+        Returns:
+            Installed version, the version of the newest shipped spec if the
+            library is not installed, or None if neither is available
+        """
+        version = get_installed_library_version(self.library_name)
+        if version is None:
+            spec_path = find_latest_libdoc_spec(self.library_name)
+            if spec_path is not None:
+                version = spec_path.stem[len(self.library_name) + 1:]
+        return version
+    
     def get_keywords_summary(self, max_keywords: int = 25) -> str:
         """
         Get a formatted summary of available keywords.
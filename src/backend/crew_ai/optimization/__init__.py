@@ -3,17 +3,22 @@ Optimization module for CrewAI-based Robot Framework code generation.
 
 This module provides:
 - ChromaDB vector store for keyword embeddings
-- Semantic keyword search tool for agents
+- Hybrid (exact name, BM25 and semantic) keyword search tool for agents
+- Process-wide cache of keyword search results
 - Pattern learning from successful executions
 - Smart keyword provider with hybrid architecture
+- Process-wide registry of warm (shared) components
 - Centralized logging configuration
 """
 
 from .chroma_store import KeywordVectorStore
 from .keyword_search_tool import KeywordSearchTool
+from .hybrid_search import HybridKeywordRetriever
+from .search_cache import KeywordSearchCache, get_keyword_search_cache
 from .pattern_learning import QueryPatternMatcher
 from .smart_keyword_provider import SmartKeywordProvider
 from .context_pruner import ContextPruner
+from .component_registry import OptimizationComponentRegistry, get_component_registry
 from .logging_config import (
     get_optimization_logger,
     configure_optimization_logging,
@@ -26,9 +31,14 @@ from .logging_config import (
 __all__ = [
     "KeywordVectorStore",
     "KeywordSearchTool",
+    "HybridKeywordRetriever",
+    "KeywordSearchCache",
+    "get_keyword_search_cache",
     "QueryPatternMatcher",
     "SmartKeywordProvider",
     "ContextPruner",
+    "OptimizationComponentRegistry",
+    "get_component_registry",
     "get_optimization_logger",
     "configure_optimization_logging",
     "LogMessages",
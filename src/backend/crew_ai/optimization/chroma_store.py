@@ -3,17 +3,144 @@ ChromaDB vector store for keyword embeddings and semantic search.
 
 This module provides persistent storage and semantic search for Robot Framework
 keywords using ChromaDB with sentence-transformers embeddings.
+
+Keyword collections are versioned and rebuilt blue/green: a library upgrade
+builds a new ``keywords_<library>_<version>_<id>`` collection (in a background
+thread when a collection is already serving), then atomically repoints the
+``keywords_<library>`` alias at it. Searches use the old collection until the
+swap, and superseded collections are deleted after a grace period.
+
+``hybrid_search`` answers searches that name a keyword or contain
+distinctive terms from lexical indexes (see hybrid_search), and only embeds
+the query otherwise.
 """
 
 import json
 import logging
-from typing import List, Dict, Optional
+import re
+import threading
+import uuid
+from typing import Any, List, Dict, Optional
 import chromadb
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
 
+from .hybrid_search import SEARCH_MODES, HybridKeywordRetriever
+from .search_cache import get_keyword_search_cache, normalize_keyword_name
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Collection whose metadata maps each keyword alias to its live versioned collection
+ALIAS_COLLECTION_NAME = "keyword_collection_aliases"
+
+# Superseded collections are deleted this long after the swap, so searches that
+# already hold them can finish
+SUPERSEDED_COLLECTION_GRACE_SECONDS = 60.0
+
+
+def create_chroma_client(persist_directory: str):
+    """
+    Create a persistent ChromaDB client.
+
+    Args:
+        persist_directory: Path to ChromaDB storage directory
+    """
+    return chromadb.PersistentClient(
+        path=persist_directory,
+        settings=Settings(
+            anonymized_telemetry=False,
+            allow_reset=True
+        )
+    )
+
+
+def create_embedding_function(model_name: str = DEFAULT_EMBEDDING_MODEL):
+    """
+    Create the sentence-transformers embedding function (loads the model).
+
+    Args:
+        model_name: Name of sentence-transformers model to use
+    """
+    # ChromaDB 0.5.x changed the API - now uses default embedding function
+    try:
+        # Try ChromaDB 0.5.x API first (model_name parameter)
+        return embedding_functions.SentenceTransformerEmbeddingFunction(
+            model_name=model_name
+        )
+    except TypeError:
+        # Fallback for ChromaDB 0.4.x API (no model_name parameter)
+        return embedding_functions.SentenceTransformerEmbeddingFunction()
+
+
+def filter_public_keywords(keywords: List[Dict]) -> List[Dict]:
+    """
+    Drop internal and deprecated keywords from a libdoc keyword list.
+    
+    Only keywords that are deprecated THEMSELVES are dropped (mentioned in the
+    first ~150 chars). Some keywords have deprecated PARAMETERS but are still
+    valid (e.g., Click With Options).
+    """
+    return [
+        kw for kw in keywords
+        if not kw['name'].startswith('_') and
+           'deprecated' not in kw.get('doc', '')[:150].lower()
+    ]
+
+
+def keyword_alias_name(library_name: str) -> str:
+    """Alias of a library's keyword collection (also the pre-versioning collection name)."""
+    return f"keywords_{library_name.lower()}"
+
+
+def versioned_collection_name(library_name: str, version: Optional[str]) -> str:
+    """
+    Name of a new keyword collection for a library version.
+    
+    A random suffix keeps names unique when the same version is rebuilt.
+    
+    Args:
+        library_name: "Browser" or "SeleniumLibrary"
+        version: Library version (None if unknown)
+    """
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", version or "unknown").strip("-")[:16] or "unknown"
+    return f"{keyword_alias_name(library_name)}_{slug}_{uuid.uuid4().hex[:8]}"
+
+
+def _format_keyword_metadata(name: str, args, doc: str) -> Dict:
+    """Keyword entry in the format returned by search() and get_by_names()."""
+    return {
+        "name": name,
+        "args": args,
+        "description": doc[:500] if doc else ""
+    }
+
+
+def build_keyword_index(library_name: str) -> Dict[str, Dict]:
+    """
+    Build the exact-name keyword index of a library from its libdoc spec.
+    
+    No embeddings are involved. Keys are lowercased keyword names, as Robot
+    Framework keyword names are case-insensitive.
+    
+    Args:
+        library_name: "Browser" or "SeleniumLibrary"
+        
+    Returns:
+        Mapping of lowercased keyword name to keyword metadata
+        
+    Raises:
+        Exception: If the library documentation cannot be loaded
+    """
+    from ..library_context.dynamic_context import DynamicLibraryDocumentation
+    
+    doc_data = DynamicLibraryDocumentation(library_name).get_library_documentation()
+    return {
+        kw['name'].lower(): _format_keyword_metadata(kw['name'], kw.get('args', []), kw.get('doc', ''))
+        for kw in filter_public_keywords(doc_data.get('keywords', []))
+    }
+
 
 class KeywordVectorStore:
     """
@@ -26,35 +153,39 @@ class KeywordVectorStore:
     - Version tracking and auto-rebuild
     """
     
-    def __init__(self, persist_directory: str = "./chroma_db"):
+    def __init__(self, persist_directory: str = "./chroma_db", client=None, embedding_function=None,
+                 search_mode: str = "hybrid"):
         """
         Initialize ChromaDB client with persistence.
         
         Args:
             persist_directory: Path to ChromaDB storage directory
+            client: Existing ChromaDB client to share (created if not provided)
+            embedding_function: Existing embedding function to share (created if not provided)
+            search_mode: Default mode of hybrid_search: "hybrid", "lexical" or "vector"
         """
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"search_mode must be one of {SEARCH_MODES}, got '{search_mode}'")
         self.persist_directory = persist_directory
+        self.search_mode = search_mode
+        # Exact-name keyword index per library, built from the libdoc spec on first use
+        self._keyword_index: Dict[str, Dict[str, Dict]] = {}
+        # Normalized keyword names per library (see is_keyword_name)
+        self._keyword_names: Dict[str, set] = {}
+        # Lexical + vector retriever per library, built from the keyword index on first use
+        self._retrievers: Dict[str, HybridKeywordRetriever] = {}
+        # Live keyword collection name per library (resolved from the alias collection)
+        self._active_collections: Dict[str, str] = {}
+        # Guards alias updates and the background rebuild threads
+        self._rebuild_lock = threading.Lock()
+        self._rebuild_threads: Dict[str, threading.Thread] = {}
         
         try:
             # Initialize ChromaDB client with persistence
-            self.client = chromadb.PersistentClient(
-                path=persist_directory,
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                )
-            )
+            self.client = client or create_chroma_client(persist_directory)
             
             # Initialize embedding function (sentence-transformers)
-            # ChromaDB 0.5.x changed the API - now uses default embedding function
-            try:
-                # Try ChromaDB 0.5.x API first (model_name parameter)
-                self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-                    model_name="all-MiniLM-L6-v2"
-                )
-            except TypeError:
-                # Fallback for ChromaDB 0.4.x API (no model_name parameter)
-                self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction()
+            self.embedding_function = embedding_function or create_embedding_function()
             
             logger.info(f"ChromaDB initialized at {persist_directory}")
             
@@ -62,9 +193,49 @@ class KeywordVectorStore:
             logger.error(f"Failed to initialize ChromaDB: {e}")
             raise
     
+    def _get_alias_collection(self):
+        return self.client.get_or_create_collection(
+            name=ALIAS_COLLECTION_NAME,
+            embedding_function=self.embedding_function,
+            metadata={"type": "collection_aliases"}
+        )
+    
+    def get_collection_name(self, library_name: str) -> str:
+        """
+        Get the name of the live keyword collection of a library.
+        
+        Args:
+            library_name: "Browser" or "SeleniumLibrary"
+            
+        Returns:
+            Versioned collection name the alias points at, or the alias itself for
+            stores built before collections were versioned
+        """
+        alias = keyword_alias_name(library_name)
+        name = self._active_collections.get(library_name)
+        if name is None:
+            try:
+                metadata = self._get_alias_collection().metadata or {}
+            except Exception as e:
+                logger.warning(f"Could not read collection aliases: {e}")
+                metadata = {}
+            name = metadata.get(alias, alias)
+            self._active_collections[library_name] = name
+        return name
+    
+    def _swap_alias(self, library_name: str, collection_name: str) -> None:
+        """Atomically point the library's alias at another collection."""
+        with self._rebuild_lock:
+            alias_collection = self._get_alias_collection()
+            metadata = dict(alias_collection.metadata or {})
+            metadata[keyword_alias_name(library_name)] = collection_name
+            alias_collection.modify(metadata=metadata)
+            self._active_collections[library_name] = collection_name
+        logger.info(f"🔀 Alias {keyword_alias_name(library_name)} now points at {collection_name}")
+    
     def create_or_get_collection(self, library_name: str):
         """
-        Get or create collection for library keywords.
+        Get or create the live collection for library keywords.
         
         Args:
             library_name: "Browser" or "SeleniumLibrary"
@@ -72,7 +243,7 @@ class KeywordVectorStore:
         Returns:
             ChromaDB collection for keywords
         """
-        collection_name = f"keywords_{library_name.lower()}"
+        collection_name = self.get_collection_name(library_name)
         
         try:
             collection = self.client.get_or_create_collection(
@@ -110,19 +281,20 @@ class KeywordVectorStore:
             raise
 
     
-    def add_keywords(self, library_name: str, keywords: List[Dict]) -> None:
+    def add_keywords(self, library_name: str, keywords: List[Dict], collection=None) -> None:
         """
         Add keywords to ChromaDB collection.
         
         Args:
             library_name: "Browser" or "SeleniumLibrary"
             keywords: List of keyword dictionaries with name, doc, args
+            collection: Collection to fill (default: the live collection)
         """
         if not keywords:
             logger.warning(f"No keywords provided for {library_name}")
             return
         
-        collection = self.create_or_get_collection(library_name)
+        collection = collection or self.create_or_get_collection(library_name)
         
         try:
             # Prepare documents (keyword name + documentation for embedding)
@@ -167,12 +339,13 @@ class KeywordVectorStore:
             logger.error(f"Failed to add keywords to {library_name}: {e}")
             raise
     
-    def ingest_library_keywords(self, library_name: str) -> None:
+    def ingest_library_keywords(self, library_name: str, collection=None) -> None:
         """
         Extract and ingest all keywords from a library using DynamicLibraryDocumentation.
         
         Args:
             library_name: "Browser" or "SeleniumLibrary"
+            collection: Collection to fill (default: the live collection)
         """
         try:
             # Import here to avoid circular dependency
@@ -182,21 +355,13 @@ class KeywordVectorStore:
             doc_extractor = DynamicLibraryDocumentation(library_name)
             doc_data = doc_extractor.get_library_documentation()
             
-            keywords = doc_data.get('keywords', [])
-            
             # Filter out internal/deprecated keywords
-            # NOTE: Only filter if keyword ITSELF is deprecated (mentioned in first ~150 chars)
-            # Some keywords have deprecated PARAMETERS but are still valid (e.g., Click With Options)
-            public_keywords = [
-                kw for kw in keywords 
-                if not kw['name'].startswith('_') and 
-                   'deprecated' not in kw.get('doc', '')[:150].lower()  # Only check first 150 chars
-            ]
+            public_keywords = filter_public_keywords(doc_data.get('keywords', []))
             
             logger.info(f"Found {len(public_keywords)} public keywords in {library_name}")
             
             # Add to ChromaDB
-            self.add_keywords(library_name, public_keywords)
+            self.add_keywords(library_name, public_keywords, collection)
             
         except Exception as e:
             logger.error(f"Failed to ingest keywords from {library_name}: {e}")
@@ -250,12 +415,137 @@ class KeywordVectorStore:
         except Exception as e:
             logger.error(f"Search failed for query '{query}': {e}")
             return []
+    
+    def is_keyword_name(self, library_name: str, query: str) -> bool:
+        """
+        Check whether a query is a keyword name of the library.
+        
+        Compared like Robot Framework compares keyword names (case, underscore
+        and space insensitive), against the exact-name keyword index.
+        """
+        names = self._keyword_names.get(library_name)
+        if names is None:
+            index = self.get_keyword_index(library_name)
+            names = {normalize_keyword_name(keyword['name']) for keyword in index.values()}
+            if index:
+                self._keyword_names[library_name] = names
+        return normalize_keyword_name(query) in names
+    
+    def get_hybrid_retriever(self, library_name: str) -> Optional[HybridKeywordRetriever]:
+        """
+        Get the hybrid retriever of a library, building its name trie and BM25 index on first use.
+        
+        Args:
+            library_name: "Browser" or "SeleniumLibrary"
+            
+        Returns:
+            HybridKeywordRetriever, or None if the library documentation is unavailable
+        """
+        retriever = self._retrievers.get(library_name)
+        if retriever is None:
+            index = self.get_keyword_index(library_name)
+            if not index:
+                return None
+            retriever = HybridKeywordRetriever(
+                index,
+                vector_search=lambda query, top_k: self.search(library_name, query, top_k)
+            )
+            self._retrievers[library_name] = retriever
+            logger.debug(f"Built hybrid keyword retriever for {library_name} with {len(retriever)} keywords")
+        return retriever
+    
+    def hybrid_search(self, library_name: str, query: str, top_k: int = 3,
+                      mode: Optional[str] = None) -> List[Dict]:
+        """
+        Search keywords by exact name, name prefix and BM25, falling back to vector search.
+        
+        Queries matching keyword names do not run the embedding model. Other
+        queries fuse the BM25 and vector rankings (reciprocal rank fusion).
+        
+        Args:
+            library_name: "Browser" or "SeleniumLibrary"
+            query: Keyword name or natural language query
+            top_k: Number of results to return (default: 3)
+            mode: "hybrid", "lexical" or "vector" (default: the store's search_mode)
+            
+        Returns:
+            Keywords in the format of search(), with a "match" field
+            ("exact", "prefix", "lexical", "hybrid" or "vector")
+        """
+        mode = mode or self.search_mode
+        retriever = self.get_hybrid_retriever(library_name) if mode != "vector" else None
+        if retriever is None:
+            return [dict(kw, match="vector") for kw in self.search(library_name, query, top_k)]
+        return retriever.search(query, top_k, mode)
+    
+    def get_hybrid_search_stats(self) -> Dict[str, Any]:
+        """Return per-library counts of how hybrid searches were answered."""
+        return {library_name: retriever.get_stats() for library_name, retriever in self._retrievers.items()}
+    
+    def get_keyword_index(self, library_name: str) -> Dict[str, Dict]:
+        """
+        Get the exact-name keyword index of a library.
+        
+        Built once with build_keyword_index() and kept for the process.
+        
+        Args:
+            library_name: "Browser" or "SeleniumLibrary"
+            
+        Returns:
+            Mapping of lowercased keyword name to keyword metadata
+            (empty if the library documentation is unavailable)
+        """
+        index = self._keyword_index.get(library_name)
+        if index is None:
+            try:
+                index = build_keyword_index(library_name)
+                logger.debug(f"Built keyword index for {library_name} with {len(index)} keywords")
+            except Exception as e:
+                logger.warning(f"Could not build keyword index for {library_name}: {e}")
+                return {}
+            self._keyword_index[library_name] = index
+        return index
+    
+    def get_by_names(self, library_name: str, names: List[str]) -> List[Dict]:
+        """
+        Get keyword documentation by exact keyword name.
+        
+        Names are resolved from the in-memory keyword index; names missing
+        from it are fetched from ChromaDB in one batched ``collection.get``.
+        Unknown names are skipped.
+        
+        Args:
+            library_name: "Browser" or "SeleniumLibrary"
+            names: Keyword names (e.g., ["Click", "Fill Text"])
+            
+        Returns:
+            Keyword metadata in the order of ``names``
+            Format: [{"name": str, "args": list, "description": str}, ...]
+        """
+        index = self.get_keyword_index(library_name)
+        found = {name: index[name.lower()] for name in names if name.lower() in index}
+        
+        missing = [name for name in names if name not in found]
+        if missing:
+            try:
+                results = self.create_or_get_collection(library_name).get(ids=missing, include=["metadatas"])
+                for keyword_id, metadata in zip(results['ids'], results['metadatas']):
+                    found[keyword_id] = _format_keyword_metadata(
+                        metadata['name'], json.loads(metadata['args']), metadata['doc']
+                    )
+            except Exception as e:
+                logger.warning(f"Keyword lookup by name failed for {missing}: {e}")
+        
+        return [found[name] for name in names if name in found]
 
     
     def get_library_version(self, library_name: str) -> Optional[str]:
         """
         Get the version of the installed library.
         
+        Reads the package metadata (or the shipped libdoc spec), so the
+        check does not run libdoc.
+        
         Args:
             library_name: "Browser" or "SeleniumLibrary"
             
@@ -265,9 +555,7 @@ class KeywordVectorStore:
         try:
             from ..library_context.dynamic_context import DynamicLibraryDocumentation
             
-            doc_extractor = DynamicLibraryDocumentation(library_name)
-            doc_data = doc_extractor.get_library_documentation()
-            version = doc_data.get('version', None)
+            version = DynamicLibraryDocumentation(library_name).get_library_version()
             
             logger.debug(f"{library_name} version: {version}")
             return version
@@ -328,23 +616,18 @@ class KeywordVectorStore:
     
     def rebuild_collection(self, library_name: str) -> None:
         """
-        Rebuild collection by deleting and re-ingesting keywords.
+        Build a new versioned collection, then swap the library's alias to it.
+        
+        The live collection keeps serving searches while the new one is filled.
+        If ingestion fails or yields no keywords, the alias is left unchanged.
         
         Args:
             library_name: "Browser" or "SeleniumLibrary"
         """
         try:
-            collection_name = f"keywords_{library_name.lower()}"
-            
-            # Delete existing collection
-            try:
-                self.client.delete_collection(name=collection_name)
-                logger.info(f"Deleted existing collection: {collection_name}")
-            except Exception as e:
-                logger.debug(f"Collection {collection_name} does not exist or could not be deleted: {e}")
-            
             # Get current library version
             current_version = self.get_library_version(library_name)
+            collection_name = versioned_collection_name(library_name, current_version)
             
             # Create new collection with version metadata
             collection = self.client.create_collection(
@@ -359,26 +642,122 @@ class KeywordVectorStore:
             logger.info(f"Created new collection: {collection_name} (version: {current_version})")
             
             # Ingest keywords
-            self.ingest_library_keywords(library_name)
+            try:
+                self.ingest_library_keywords(library_name, collection)
+                keyword_count = collection.count()
+            except Exception:
+                self.client.delete_collection(name=collection_name)
+                raise
+            if not keyword_count:
+                self.client.delete_collection(name=collection_name)
+                logger.warning(f"No keywords ingested for {library_name}, keeping the current collection")
+                return
+            
+            self._swap_alias(library_name, collection_name)
             
-            logger.info(f"Successfully rebuilt collection for {library_name}")
+            # Cached lookups refer to the old collection
+            self._keyword_index.pop(library_name, None)
+            self._keyword_names.pop(library_name, None)
+            self._retrievers.pop(library_name, None)
+            get_keyword_search_cache().invalidate_library(library_name)
+            self._schedule_superseded_cleanup(library_name)
+            
+            logger.info(f"Successfully rebuilt collection for {library_name} ({keyword_count} keywords)")
             
         except Exception as e:
             logger.error(f"Failed to rebuild collection for {library_name}: {e}")
             raise
     
+    def rebuild_collection_in_background(self, library_name: str) -> bool:
+        """
+        Start rebuild_collection in a daemon thread.
+        
+        Args:
+            library_name: "Browser" or "SeleniumLibrary"
+            
+        Returns:
+            True if a rebuild was started, False if one is already running
+        """
+        with self._rebuild_lock:
+            running = self._rebuild_threads.get(library_name)
+            if running is not None and running.is_alive():
+                return False
+            thread = threading.Thread(
+                target=self._run_background_rebuild, args=(library_name,),
+                name=f"rebuild-{keyword_alias_name(library_name)}", daemon=True
+            )
+            self._rebuild_threads[library_name] = thread
+            thread.start()
+        return True
+    
+    def _run_background_rebuild(self, library_name: str) -> None:
+        try:
+            self.rebuild_collection(library_name)
+        except Exception:
+            # Already logged; the current collection keeps serving
+            pass
+    
+    def get_rebuilding_libraries(self) -> List[str]:
+        """Libraries whose keyword collection is being rebuilt in the background."""
+        with self._rebuild_lock:
+            return sorted(name for name, thread in self._rebuild_threads.items() if thread.is_alive())
+    
+    def _schedule_superseded_cleanup(self, library_name: str) -> None:
+        timer = threading.Timer(SUPERSEDED_COLLECTION_GRACE_SECONDS,
+                                self.delete_superseded_collections, args=(library_name,))
+        timer.daemon = True
+        timer.start()
+    
+    def delete_superseded_collections(self, library_name: str) -> List[str]:
+        """
+        Delete the library's keyword collections other than the live one.
+        
+        Args:
+            library_name: "Browser" or "SeleniumLibrary"
+            
+        Returns:
+            Names of the deleted collections
+        """
+        alias = keyword_alias_name(library_name)
+        active = self.get_collection_name(library_name)
+        deleted = []
+        try:
+            # ChromaDB < 0.6 returns Collection objects, later versions (and the NumPy backend) names
+            names = [getattr(c, "name", c) for c in self.client.list_collections()]
+        except Exception as e:
+            logger.warning(f"Could not list collections for cleanup: {e}")
+            return deleted
+        for name in names:
+            if name == active or not (name == alias or name.startswith(f"{alias}_")):
+                continue
+            try:
+                self.client.delete_collection(name=name)
+                deleted.append(name)
+            except Exception as e:
+                logger.debug(f"Could not delete superseded collection {name}: {e}")
+        if deleted:
+            logger.info(f"🧹 Deleted superseded keyword collections: {deleted}")
+        return deleted
+    
     def ensure_collection_ready(self, library_name: str) -> None:
         """
         Ensure collection is ready and up-to-date.
-        Auto-rebuilds if version mismatch detected.
+        
+        On a version mismatch, a collection that already has keywords keeps
+        serving while the new one is built in the background. Only a library
+        without any keyword collection is built on the calling thread.
         
         Args:
             library_name: "Browser" or "SeleniumLibrary"
         """
         try:
             if self.needs_rebuild(library_name):
-                logger.info(f"Rebuilding collection for {library_name}...")
-                self.rebuild_collection(library_name)
+                if self.create_or_get_collection(library_name).count() > 0:
+                    if self.rebuild_collection_in_background(library_name):
+                        logger.info(f"Rebuilding collection for {library_name} in the background...")
+                else:
+                    logger.info(f"Building collection for {library_name}...")
+                    self.rebuild_collection(library_name)
             else:
                 logger.debug(f"Collection for {library_name} is up-to-date")
                 
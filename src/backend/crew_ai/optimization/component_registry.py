@@ -0,0 +1,186 @@
+"""
+Process-wide registry of warm optimization components.
+
+Constructing the optimization components is expensive: every
+``chromadb.PersistentClient`` opens the store again, and every
+``SentenceTransformerEmbeddingFunction`` loads the embedding model into
+memory. The registry creates one Chroma client and one embedding function
+per process. It hands out shared ``KeywordVectorStore``,
+``QueryPatternMatcher`` and ``ContextPruner`` instances built on top of them
+to ``run_crew`` and to pattern learning.
+
+Each component is created on first use under a lock. The keyword collection
+of each library is checked (and rebuilt if outdated) once per process.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .chroma_store import KeywordVectorStore, create_embedding_function
+from .context_pruner import ContextPruner
+from .pattern_learning import QueryPatternMatcher
+from .search_cache import get_keyword_search_cache
+from .vector_index import create_vector_client
+
+logger = logging.getLogger(__name__)
+
+
+class OptimizationComponentRegistry:
+    """
+    Thread-safe holder of the shared optimization components.
+
+    The components themselves keep no per-request state, so one instance of
+    each serves all concurrent workflows.
+    """
+
+    def __init__(self, chroma_db_path: str = "./chroma_db",
+                 pattern_db_path: str = "./data/pattern_learning.db",
+                 embedding_model: str = "all-MiniLM-L6-v2",
+                 vector_backend: str = "chroma",
+                 keyword_search_mode: str = "hybrid",
+                 pattern_merge_threshold: float = 0.9,
+                 max_patterns: int = 5000):
+        """
+        Args:
+            chroma_db_path: Path to ChromaDB storage directory
+            pattern_db_path: Path to pattern learning SQLite database
+            embedding_model: Sentence-transformers model shared by all components
+            vector_backend: Vector index backend, "chroma" or "numpy" (see vector_index)
+            keyword_search_mode: Keyword search tool retrieval, "hybrid", "lexical" or "vector"
+            pattern_merge_threshold: Similarity above which learned queries merge into a stored pattern
+            max_patterns: Maximum stored query patterns (0 for no limit)
+        """
+        self.chroma_db_path = chroma_db_path
+        self.pattern_db_path = pattern_db_path
+        self.embedding_model = embedding_model
+        self.vector_backend = vector_backend
+        self.keyword_search_mode = keyword_search_mode
+        self.pattern_merge_threshold = pattern_merge_threshold
+        self.max_patterns = max_patterns
+        self._lock = threading.RLock()
+        self._client = None
+        self._embedding_function = None
+        self._vector_store: Optional[KeywordVectorStore] = None
+        self._pattern_matcher: Optional[QueryPatternMatcher] = None
+        self._context_pruner: Optional[ContextPruner] = None
+        self._ready_libraries = set()
+        self._load_seconds: Dict[str, float] = {}
+
+    @property
+    def client(self):
+        """Shared vector store client (ChromaDB or NumPy backend)."""
+        with self._lock:
+            if self._client is None:
+                started = time.monotonic()
+                self._client = create_vector_client(self.chroma_db_path, self.vector_backend)
+                self._load_seconds["chroma_client"] = round(time.monotonic() - started, 3)
+            return self._client
+
+    @property
+    def embedding_function(self):
+        """Shared embedding function (the model is loaded once per process)."""
+        with self._lock:
+            if self._embedding_function is None:
+                started = time.monotonic()
+                self._embedding_function = create_embedding_function(self.embedding_model)
+                self._load_seconds["embedding_function"] = round(time.monotonic() - started, 3)
+                logger.info(f"🧠 Embedding model '{self.embedding_model}' loaded in "
+                            f"{self._load_seconds['embedding_function']}s")
+            return self._embedding_function
+
+    def get_vector_store(self, library_name: Optional[str] = None) -> KeywordVectorStore:
+        """
+        Get the shared keyword vector store.
+
+        Args:
+            library_name: If given, the library's keyword collection is made ready
+                (version check and rebuild) the first time it is requested
+        """
+        with self._lock:
+            if self._vector_store is None:
+                self._vector_store = KeywordVectorStore(
+                    persist_directory=self.chroma_db_path,
+                    client=self.client,
+                    embedding_function=self.embedding_function,
+                    search_mode=self.keyword_search_mode,
+                )
+            if library_name and library_name not in self._ready_libraries:
+                started = time.monotonic()
+                self._vector_store.ensure_collection_ready(library_name)
+                self._ready_libraries.add(library_name)
+                self._load_seconds[f"collection_{library_name}"] = round(time.monotonic() - started, 3)
+            return self._vector_store
+
+    def get_pattern_matcher(self) -> QueryPatternMatcher:
+        """Get the shared query pattern matcher."""
+        with self._lock:
+            if self._pattern_matcher is None:
+                self._pattern_matcher = QueryPatternMatcher(
+                    db_path=self.pattern_db_path,
+                    chroma_store=self.get_vector_store(),
+                    merge_threshold=self.pattern_merge_threshold,
+                    max_patterns=self.max_patterns,
+                )
+            return self._pattern_matcher
+
+    def get_context_pruner(self) -> ContextPruner:
+        """Get the shared context pruner."""
+        with self._lock:
+            if self._context_pruner is None:
+                self._context_pruner = ContextPruner(
+                    model_name=self.embedding_model,
+                    persist_directory=self.chroma_db_path,
+                    client=self.client,
+                    embedding_function=self.embedding_function,
+                )
+            return self._context_pruner
+
+    def invalidate_library(self, library_name: str) -> None:
+        """Force the next get_vector_store(library_name) to re-check the collection."""
+        with self._lock:
+            self._ready_libraries.discard(library_name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return which components are warm and how long each took to load."""
+        with self._lock:
+            return {
+                "vector_backend": self.vector_backend,
+                "chroma_client": self._client is not None,
+                "embedding_function": self._embedding_function is not None,
+                "vector_store": self._vector_store is not None,
+                "pattern_matcher": self._pattern_matcher is not None,
+                "context_pruner": self._context_pruner is not None,
+                "ready_libraries": sorted(self._ready_libraries),
+                "rebuilding_libraries": (self._vector_store.get_rebuilding_libraries()
+                                         if self._vector_store is not None else []),
+                "load_seconds": dict(self._load_seconds),
+                "keyword_search_cache": get_keyword_search_cache().get_stats(),
+                "hybrid_search": (self._vector_store.get_hybrid_search_stats()
+                                  if self._vector_store is not None else {}),
+            }
+
+
+# Global instance
+_component_registry: Optional[OptimizationComponentRegistry] = None
+_component_registry_lock = threading.Lock()
+
+
+def get_component_registry() -> OptimizationComponentRegistry:
+    """Get the global optimization component registry instance."""
+    global _component_registry
+    if _component_registry is None:
+        with _component_registry_lock:
+            if _component_registry is None:
+                from src.backend.core.config import settings
+                _component_registry = OptimizationComponentRegistry(
+                    chroma_db_path=settings.OPTIMIZATION_CHROMA_DB_PATH,
+                    pattern_db_path=settings.OPTIMIZATION_PATTERN_DB_PATH,
+                    embedding_model=settings.OPTIMIZATION_EMBEDDING_MODEL,
+                    vector_backend=settings.OPTIMIZATION_VECTOR_BACKEND,
+                    keyword_search_mode=settings.OPTIMIZATION_KEYWORD_SEARCH_MODE,
+                    pattern_merge_threshold=settings.OPTIMIZATION_PATTERN_MERGE_THRESHOLD,
+                    max_patterns=settings.OPTIMIZATION_PATTERN_MAX_COUNT,
+                )
+    return _component_registry
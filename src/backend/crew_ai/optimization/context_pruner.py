@@ -4,27 +4,43 @@ Context Pruner for Smart Keyword Filtering
 This module classifies user queries into action categories and prunes
 keyword context to include only relevant keywords, reducing token usage
 while maintaining code generation accuracy.
+
+Categories are derived per library from its libdoc spec: every public
+keyword is assigned to a category by its name (``KEYWORD_CATEGORIES`` holds
+explicit assignments, ``CATEGORY_NAME_PATTERNS`` the rules), and each
+category is represented by a centroid vector (mean embedding of its keywords
+plus the category description). Centroids are stored in the
+``category_centroids`` collection per library version, so they are embedded
+once. A query is scored against all centroids with one matrix-vector product.
 """
 
+import hashlib
 import logging
-from typing import List, Dict
-import chromadb
-from chromadb.config import Settings
-from chromadb.utils import embedding_functions
+import re
+import threading
+from typing import Any, List, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .chroma_store import create_chroma_client, create_embedding_function, filter_public_keywords
 
 logger = logging.getLogger(__name__)
 
+# Key of the centroids built from the category descriptions only (no library spec)
+GENERIC_CENTROIDS = "generic"
+
 
 class ContextPruner:
     """
     Classify queries and prune context to relevant keyword categories.
     
-    Uses ChromaDB for semantic similarity to classify queries into action 
-    categories (navigation, input, interaction, extraction, assertion, wait) 
-    and filters keywords to only those in relevant categories.
+    Classifies queries into action categories (navigation, input,
+    interaction, extraction, assertion, wait) by cosine similarity to
+    per-library category centroids, and filters keywords to only those in
+    relevant categories. Keywords that belong to no category are kept.
     """
     
-    # Keyword category mappings
+    # Explicit keyword category assignments (take precedence over CATEGORY_NAME_PATTERNS)
     KEYWORD_CATEGORIES = {
         "navigation": [
             "New Browser", "New Page", "Go To", "Go Back", "Go Forward",
@@ -52,10 +68,33 @@ class ContextPruner:
         ]
     }
     
+    # Keyword name rules for library keywords, checked in this order (first match wins)
+    CATEGORY_NAME_PATTERNS = [
+        ("wait", r"^(wait|sleep)\b"),
+        ("assertion", r"\bshould\b"),
+        ("extraction", r"^(get|capture)\b"),
+        ("input", r"^(fill|input|type|press|upload|clear|choose file|keyboard)\b"),
+        ("interaction", r"^(click|double click|hover|drag|select|unselect|deselect|check|uncheck|"
+                        r"mouse|scroll|focus|tap|submit form|open context menu)\b"),
+        ("navigation", r"^(new|open|close|go|switch|reload|navigate|maximize)\b|\b(browser|page|window)\b"),
+    ]
+    
+    # Semantic descriptions of the categories (part of every centroid)
+    CATEGORY_DESCRIPTIONS = {
+        "navigation": "open browser navigate to website go to page url address",
+        "input": "type text fill form input data enter information write",
+        "interaction": "click button press element hover drag drop select",
+        "extraction": "get text retrieve data extract information read content",
+        "assertion": "verify check validate assert should be equal confirm",
+        "wait": "wait for element visible ready loaded appear timeout"
+    }
+    
     def __init__(
         self, 
         model_name: str = "all-MiniLM-L6-v2",
-        persist_directory: str = "./chroma_db"
+        persist_directory: str = "./chroma_db",
+        client=None,
+        embedding_function=None
     ):
         """
         Initialize with ChromaDB for semantic classification.
@@ -63,33 +102,35 @@ class ContextPruner:
         Args:
             model_name: Name of sentence-transformers model to use
             persist_directory: Path to ChromaDB storage directory
+            client: Existing ChromaDB client to share (created if not provided)
+            embedding_function: Existing embedding function to share (created if not provided)
         """
         logger.info(f"Initializing ContextPruner with ChromaDB at {persist_directory}")
         
+        # Library (or GENERIC_CENTROIDS) -> (category names, normalized centroid matrix)
+        self._centroids: Dict[str, Tuple[List[str], np.ndarray]] = {}
+        # Library -> lowercased keyword name -> category
+        self._keyword_categories: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self._name_patterns = [(category, re.compile(pattern, re.IGNORECASE))
+                               for category, pattern in self.CATEGORY_NAME_PATTERNS]
+        
         try:
             # Initialize ChromaDB client (same pattern as KeywordVectorStore)
-            self.client = chromadb.PersistentClient(
-                path=persist_directory,
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                )
-            )
+            self.client = client or create_chroma_client(persist_directory)
             
             # Initialize embedding function
-            self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-                model_name=model_name
-            )
+            self.embedding_function = embedding_function or create_embedding_function(model_name)
             
-            # Create or get category collection
+            # Precomputed centroids, one entry per library and category
             self.collection = self.client.get_or_create_collection(
-                name="category_descriptions",
+                name="category_centroids",
                 embedding_function=self.embedding_function,
-                metadata={"type": "query_categories"}
+                metadata={"type": "category_centroids"}
             )
             
-            # Initialize category descriptions in ChromaDB
-            self._init_category_collection()
+            # Centroids from the descriptions alone, used when no library is given
+            self._get_centroids(None)
             
             logger.info("ContextPruner initialized successfully with ChromaDB")
             
@@ -97,66 +138,235 @@ class ContextPruner:
             logger.error(f"Failed to initialize ContextPruner: {e}")
             raise
     
-    def _init_category_collection(self):
+    @property
+    def categories(self) -> List[str]:
+        """All category names."""
+        return list(self.KEYWORD_CATEGORIES.keys())
+    
+    def categorize_keyword(self, keyword_name: str, library_name: Optional[str] = None) -> Optional[str]:
         """
-        Initialize ChromaDB collection with category descriptions.
+        Get the category of a keyword.
         
-        Stores semantic representations of each category for fast
-        similarity comparison during query classification.
+        Args:
+            keyword_name: Keyword name (e.g., "Input Text")
+            library_name: Library whose spec-derived categories to use (optional)
+            
+        Returns:
+            Category name, or None if the keyword belongs to no category
+        """
+        if library_name:
+            category = self.get_keyword_categories(library_name).get(keyword_name.lower())
+            if category:
+                return category
+        for category, names in self.KEYWORD_CATEGORIES.items():
+            if keyword_name in names:
+                return category
+        for category, pattern in self._name_patterns:
+            if pattern.search(keyword_name):
+                return category
+        return None
+    
+    def get_keyword_categories(self, library_name: str) -> Dict[str, str]:
         """
-        logger.debug("Initializing category descriptions in ChromaDB")
+        Get the category of every categorized public keyword of a library.
         
-        # Define category descriptions for semantic matching
-        category_descriptions = {
-            "navigation": "open browser navigate to website go to page url address",
-            "input": "type text fill form input data enter information write",
-            "interaction": "click button press element hover drag drop select",
-            "extraction": "get text retrieve data extract information read content",
-            "assertion": "verify check validate assert should be equal confirm",
-            "wait": "wait for element visible ready loaded appear timeout"
-        }
+        Args:
+            library_name: "Browser" or "SeleniumLibrary"
+            
+        Returns:
+            Mapping of lowercased keyword name to category (empty if the spec is unavailable)
+        """
+        mapping = self._keyword_categories.get(library_name)
+        if mapping is None:
+            mapping = {}
+            for keyword in self._library_keywords(library_name):
+                category = self.categorize_keyword(keyword["name"])
+                if category:
+                    mapping[keyword["name"].lower()] = category
+            # An empty mapping means the spec could not be loaded; the next call retries
+            if mapping:
+                self._keyword_categories[library_name] = mapping
+        return mapping
+    
+    def _library_keywords(self, library_name: str) -> List[Dict]:
+        try:
+            from ..library_context.dynamic_context import DynamicLibraryDocumentation
+            
+            doc_data = DynamicLibraryDocumentation(library_name).get_library_documentation()
+            return filter_public_keywords(doc_data.get("keywords", []))
+        except Exception as e:
+            logger.warning(f"Could not load keywords of {library_name} for categories: {e}")
+            return []
+    
+    def _centroid_version(self, library_name: Optional[str]) -> str:
+        """Version stamp of stored centroids; a change recomputes them."""
+        parts = [repr(sorted(self.CATEGORY_DESCRIPTIONS.items())), repr(self.CATEGORY_NAME_PATTERNS),
+                 repr(sorted(self.KEYWORD_CATEGORIES.items()))]
+        if library_name:
+            try:
+                from ..library_context.dynamic_context import DynamicLibraryDocumentation
+                parts.append(DynamicLibraryDocumentation(library_name).get_library_version() or "unknown")
+            except Exception:
+                parts.append("unknown")
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+    
+    def _get_centroids(self, library_name: Optional[str]) -> Tuple[List[str], np.ndarray]:
+        """Get the category centroids of a library, loading or computing them on first use."""
+        key = library_name or GENERIC_CENTROIDS
+        centroids = self._centroids.get(key)
+        if centroids is not None:
+            return centroids
         
-        # Check if collection is already populated
-        existing_count = self.collection.count()
-        if existing_count == len(category_descriptions):
-            logger.debug(f"Category collection already populated with {existing_count} entries")
-            return
+        if library_name and not self.get_keyword_categories(library_name):
+            # Spec unavailable: use the generic centroids without caching or storing them
+            # under the library, so the library centroids are built once the spec loads
+            return self._get_centroids(None)
         
-        # Add category descriptions to ChromaDB
+        with self._lock:
+            centroids = self._centroids.get(key)
+            if centroids is None:
+                version = self._centroid_version(library_name)
+                centroids = self._load_centroids(key, version)
+                if centroids is None:
+                    centroids = self._compute_centroids(library_name)
+                    self._store_centroids(key, version, centroids)
+                self._centroids[key] = centroids
+        return centroids
+    
+    def _load_centroids(self, key: str, version: str) -> Optional[Tuple[List[str], np.ndarray]]:
+        categories = self.categories
+        try:
+            stored = self.collection.get(ids=[f"{key}:{category}" for category in categories],
+                                         include=["metadatas", "embeddings"])
+        except Exception as e:
+            logger.debug(f"Could not load category centroids for {key}: {e}")
+            return None
+        if len(stored["ids"]) != len(categories) or any(
+                (metadata or {}).get("version") != version for metadata in stored["metadatas"]):
+            return None
+        by_id = dict(zip(stored["ids"], stored["embeddings"]))
+        matrix = np.asarray([by_id[f"{key}:{category}"] for category in categories], dtype=np.float32)
+        logger.debug(f"Loaded {len(categories)} category centroids for {key}")
+        return categories, matrix
+    
+    def _store_centroids(self, key: str, version: str, centroids: Tuple[List[str], np.ndarray]) -> None:
+        categories, matrix = centroids
         try:
-            ids = list(category_descriptions.keys())
-            documents = list(category_descriptions.values())
-            metadatas = [{"category": cat} for cat in ids]
-            
-            # Upsert to handle re-initialization
             self.collection.upsert(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas
+                ids=[f"{key}:{category}" for category in categories],
+                embeddings=matrix.tolist(),
+                documents=[self.CATEGORY_DESCRIPTIONS.get(category, category) for category in categories],
+                metadatas=[{"library": key, "category": category, "version": version} for category in categories]
             )
+        except Exception as e:
+            # Centroids still work from memory; they are recomputed on the next start
+            logger.warning(f"Could not store category centroids for {key}: {e}")
+    
+    def _compute_centroids(self, library_name: Optional[str]) -> Tuple[List[str], np.ndarray]:
+        """
+        Compute normalized centroids: mean keyword embedding plus the category description.
+        
+        All keyword texts and descriptions are embedded in one call.
+        """
+        categories = self.categories
+        texts = [self.CATEGORY_DESCRIPTIONS.get(category, category) for category in categories]
+        members: Dict[str, List[int]] = {category: [] for category in categories}
+        
+        if library_name:
+            mapping = self.get_keyword_categories(library_name)
+            for keyword in self._library_keywords(library_name):
+                category = mapping.get(keyword["name"].lower())
+                if category in members:
+                    # Name plus the first sentence of the documentation
+                    summary = (keyword.get("doc") or "").strip().split("\n")[0].split(". ")[0][:200]
+                    members[category].append(len(texts))
+                    texts.append(f"{keyword['name']}: {summary}")
+        
+        embeddings = _normalize(self.embedding_function(texts))
+        rows = []
+        for i, category in enumerate(categories):
+            centroid = embeddings[i].copy()
+            if members[category]:
+                keyword_mean = embeddings[members[category]].mean(axis=0)
+                centroid += keyword_mean / max(np.linalg.norm(keyword_mean), 1e-12)
+            rows.append(centroid)
+        matrix = _normalize(rows)
+        
+        keyword_counts = {category: len(indices) for category, indices in members.items()}
+        logger.info(f"Computed category centroids for {library_name or GENERIC_CENTROIDS}: {keyword_counts}")
+        return categories, matrix
+    
+    def prepare(self, library_name: Optional[str] = None) -> "ContextPruner":
+        """Load or compute the centroids and keyword categories of a library ahead of use."""
+        self._get_centroids(library_name)
+        if library_name:
+            self.get_keyword_categories(library_name)
+        return self
+    
+    def score_queries(self, query_embeddings: Sequence, library_name: Optional[str] = None) -> np.ndarray:
+        """
+        Cosine similarity of each query to each category centroid.
+        
+        Args:
+            query_embeddings: Embeddings of the queries
+            library_name: Library whose centroids to use (generic centroids if None)
             
-            logger.info(f"Initialized {len(category_descriptions)} category descriptions in ChromaDB")
+        Returns:
+            Matrix of shape (queries, categories), columns in ``self.categories`` order
+        """
+        _, matrix = self._get_centroids(library_name)
+        return _normalize(query_embeddings) @ matrix.T
+    
+    def classify_queries(
+        self,
+        user_queries: Optional[List[str]] = None,
+        confidence_threshold: float = 0.8,
+        query_embeddings: Optional[Sequence] = None,
+        library_name: Optional[str] = None
+    ) -> List[List[str]]:
+        """
+        Classify several queries at once (one embedding call, one matrix product).
+        
+        Args:
+            user_queries: Queries to classify (embedded if query_embeddings is not given)
+            confidence_threshold: Minimum cosine similarity for category inclusion (0.0-1.0)
+            query_embeddings: Precomputed embeddings of the queries
+            library_name: Library whose categories to use (generic if None)
             
-        except Exception as e:
-            logger.error(f"Failed to initialize category collection: {e}")
-            raise
+        Returns:
+            Relevant categories per query (all categories for a query below the threshold)
+        """
+        if query_embeddings is None:
+            if not user_queries:
+                return []
+            query_embeddings = self.embedding_function(list(user_queries))
+        
+        categories, _ = self._get_centroids(library_name)
+        results = []
+        for scores in self.score_queries(query_embeddings, library_name):
+            relevant = [category for category, score in zip(categories, scores) if score >= confidence_threshold]
+            results.append(relevant or list(categories))
+        return results
     
     def classify_query(
         self, 
         user_query: str, 
-        confidence_threshold: float = 0.8
+        confidence_threshold: float = 0.8,
+        query_embedding=None,
+        library_name: Optional[str] = None
     ) -> List[str]:
         """
-        Classify query into action categories using ChromaDB semantic search.
+        Classify query into action categories by similarity to the category centroids.
         
-        Queries the ChromaDB collection to find similar categories based on
-        normalized cosine similarity. Returns categories that meet the 
-        confidence threshold, or all categories if no category meets the 
-        threshold (graceful degradation).
+        Returns categories whose cosine similarity meets the confidence
+        threshold, or all categories if no category meets the threshold
+        (graceful degradation).
         
         Args:
             user_query: User's natural language query
-            confidence_threshold: Minimum similarity for category inclusion (0.0-1.0)
+            confidence_threshold: Minimum cosine similarity for category inclusion (0.0-1.0)
+            query_embedding: Precomputed embedding of the query (skips embedding it again)
+            library_name: Library whose categories to use (generic if None)
             
         Returns:
             List of relevant category names (e.g., ["input", "interaction"])
@@ -165,25 +375,14 @@ class ContextPruner:
         logger.debug(f"Classifying query: {user_query[:50]}...")
         
         try:
-            # Query ChromaDB for similar categories
-            # ChromaDB returns normalized cosine distance (0 = identical, 2 = opposite)
-            # We need to convert to similarity: similarity = 1 - (distance / 2)
-            results = self.collection.query(
-                query_texts=[user_query],
-                n_results=len(self.KEYWORD_CATEGORIES)
-            )
+            if query_embedding is None:
+                query_embedding = self.embedding_function([user_query])[0]
             
-            # Extract categories and convert distances to similarities
-            similarities = {}
-            if results.get('ids') and results['ids'][0]:
-                for idx, category_id in enumerate(results['ids'][0]):
-                    distance = results['distances'][0][idx]
-                    # Convert cosine distance to similarity (0-1 range)
-                    # ChromaDB cosine distance range: [0, 2]
-                    # Similarity = 1 - (distance / 2) gives us [0, 1] range
-                    similarity = 1.0 - (distance / 2.0)
-                    similarities[category_id] = similarity
-                    logger.debug(f"Category '{category_id}': distance={distance:.4f}, similarity={similarity:.4f}")
+            categories, _ = self._get_centroids(library_name)
+            scores = self.score_queries([query_embedding], library_name)[0]
+            similarities = dict(zip(categories, scores.tolist()))
+            for category, similarity in similarities.items():
+                logger.debug(f"Category '{category}': similarity={similarity:.4f}")
             
             # Filter categories by confidence threshold
             relevant_categories = [
@@ -199,46 +398,45 @@ class ContextPruner:
                 return relevant_categories
             else:
                 # Graceful degradation: return all categories if none meet threshold
-                all_categories = list(self.KEYWORD_CATEGORIES.keys())
                 logger.warning(
                     f"No categories met threshold {confidence_threshold}. "
                     f"Highest similarity: {max(similarities.values()):.4f}. "
                     f"Falling back to all categories."
                 )
-                return all_categories
+                return list(categories)
                 
         except Exception as e:
             logger.error(f"Classification failed: {e}. Falling back to all categories.")
-            return list(self.KEYWORD_CATEGORIES.keys())
+            return self.categories
     
     def prune_keywords(
         self, 
         all_keywords: List[Dict], 
-        categories: List[str]
+        categories: List[str],
+        library_name: Optional[str] = None
     ) -> List[Dict]:
         """
         Filter keywords to only those in relevant categories.
         
+        Keywords that belong to no category (e.g., "Log", "Set Variable")
+        are kept, since no classification can rule them out.
+        
         Args:
             all_keywords: List of keyword dicts with 'name' field
             categories: List of relevant category names
+            library_name: Library whose spec-derived categories to use (optional)
             
         Returns:
             Filtered list of keyword dicts
         """
         logger.debug(f"Pruning keywords for categories: {categories}")
         
-        # Build set of relevant keyword names
-        relevant_names = set()
-        for category in categories:
-            if category in self.KEYWORD_CATEGORIES:
-                relevant_names.update(self.KEYWORD_CATEGORIES[category])
-        
-        # Filter keywords
-        pruned = [
-            kw for kw in all_keywords 
-            if kw.get("name") in relevant_names
-        ]
+        relevant = set(categories)
+        pruned = []
+        for kw in all_keywords:
+            category = self.categorize_keyword(kw.get("name", ""), library_name)
+            if category is None or category in relevant:
+                pruned.append(kw)
         
         if all_keywords:
             logger.info(f"Pruned {len(all_keywords)} keywords to {len(pruned)} ({len(pruned)/len(all_keywords)*100:.1f}% retained)")
@@ -281,3 +479,12 @@ class ContextPruner:
             "reduction_rate": reduction,
             "reduction_percentage": reduction * 100
         }
+
+
+def _normalize(vectors: Any) -> np.ndarray:
+    """Convert to a float32 matrix with unit-length rows."""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
@@ -0,0 +1,348 @@
+"""
+Hybrid lexical + vector keyword retrieval.
+
+Agent searches often contain a literal keyword name ("Wait Until Element Is
+Visible") or a distinctive token ("checkbox", "iframe"). Those are answered
+from in-memory lexical indexes built from the libdoc spec, without running
+the embedding model:
+
+1. Exact name: the query is a keyword name (case, underscore and space
+   insensitive, like Robot Framework keyword names)
+2. Name prefix: the query is the beginning of keyword names
+   ("wait until element"), ranked by BM25
+3. Name terms: keyword NAMES contain enough of the query's terms
+   (IDF-weighted), e.g. "take a screenshot"; those keywords are ranked
+   first by BM25 over names and docs
+
+Other queries fall back to vector search, and the vector and BM25 rankings
+are merged with reciprocal rank fusion. Terms that only occur in the
+documentation never answer a query on their own: doc-text BM25 picks
+plausible but wrong keywords for natural language ("click a button" ->
+Mouse Button).
+"""
+
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .search_cache import normalize_keyword_name, normalize_search_query
+
+logger = logging.getLogger(__name__)
+
+# How a search was answered (see HybridKeywordRetriever.search)
+MATCH_EXACT = "exact"
+MATCH_PREFIX = "prefix"
+MATCH_LEXICAL = "lexical"
+MATCH_HYBRID = "hybrid"
+MATCH_VECTOR = "vector"
+
+SEARCH_MODES = ("hybrid", "lexical", "vector")
+
+# Words ignored by BM25 in addition to the search cache filler words
+_STOP_WORDS = {
+    "and", "or", "is", "it", "be", "by", "at", "as", "that", "this", "then", "i", "want",
+    "how", "do", "can", "use", "using", "from", "are", "if", "its", "given", "when"
+}
+
+# Reciprocal rank fusion constant (the usual value from the RRF paper)
+_RRF_K = 60
+
+
+def _stem(token: str) -> str:
+    if len(token) > 5 and token.endswith("ing"):
+        return token[:-3]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into BM25 terms.
+
+    Uses the search cache normalization (filler words, synonyms such as
+    "check box" -> "checkbox"), then drops stop words and strips plural and
+    "-ing" endings.
+    """
+    words = re.findall(r"[a-z0-9]+", normalize_search_query(text))
+    return [_stem(word) for word in words if word not in _STOP_WORDS]
+
+
+class NameTrie:
+    """Word-level trie of keyword names for exact and prefix lookups."""
+
+    def __init__(self, names: List[str]):
+        """
+        Args:
+            names: Keyword names (e.g., ["Click", "Click Element"])
+        """
+        self._root: Dict[str, Any] = {}
+        self._names: Dict[str, str] = {}
+        for name in names:
+            key = normalize_keyword_name(name)
+            self._names[key] = name
+            node = self._root
+            for word in key.split():
+                node = node.setdefault(word, {})
+            node[""] = name
+
+    def exact(self, query: str) -> Optional[str]:
+        """Return the keyword name matching the query exactly, or None."""
+        return self._names.get(normalize_keyword_name(query))
+
+    def prefix(self, query: str) -> List[str]:
+        """
+        Return keyword names starting with the query's words.
+
+        The last query word may be incomplete ("wait until elem") if it has
+        at least three characters.
+        """
+        words = normalize_keyword_name(query).split()
+        if not words:
+            return []
+        node = self._root
+        for word in words[:-1]:
+            node = node.get(word)
+            if node is None:
+                return []
+        last = words[-1]
+        if last in node:
+            starts = [node[last]]
+        elif len(last) >= 3:
+            starts = [child for word, child in node.items() if word and word.startswith(last)]
+        else:
+            starts = []
+
+        names = []
+        stack = starts
+        while stack:
+            current = stack.pop()
+            for word, child in current.items():
+                if word:
+                    stack.append(child)
+                else:
+                    names.append(child)
+        return names
+
+
+class BM25Index:
+    """In-memory BM25 (Okapi) index with an inverted posting list per term."""
+
+    def __init__(self, documents: List[List[str]], k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            documents: Tokenized documents
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.doc_count = len(documents)
+        self._lengths = [len(tokens) for tokens in documents]
+        self._average_length = (sum(self._lengths) / self.doc_count) if self.doc_count else 0.0
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        for doc_id, tokens in enumerate(documents):
+            for term, frequency in Counter(tokens).items():
+                self._postings.setdefault(term, []).append((doc_id, frequency))
+        self._idf = {
+            term: math.log(1 + (self.doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+        self._max_idf = max(self._idf.values(), default=1.0)
+
+    def idf(self, term: str) -> float:
+        """IDF of a term; unknown terms get the highest IDF (they are as distinctive as it gets)."""
+        return self._idf.get(term, self._max_idf)
+
+    def search(self, terms: List[str], top_k: int = 10) -> List[Tuple[int, float, float]]:
+        """
+        Score documents against query terms.
+
+        Args:
+            terms: Tokenized query
+            top_k: Number of documents to return
+
+        Returns:
+            (document id, BM25 score, coverage) tuples, best first. Coverage
+            is the IDF-weighted share of the query terms found in the document.
+        """
+        unique_terms = list(dict.fromkeys(terms))
+        total_idf = sum(self.idf(term) for term in unique_terms)
+        scores: Dict[int, float] = {}
+        matched_idf: Dict[int, float] = {}
+        for term in unique_terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf[term]
+            for doc_id, frequency in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / self._average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+                matched_idf[doc_id] = matched_idf.get(doc_id, 0.0) + idf
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(doc_id, score, matched_idf[doc_id] / total_idf) for doc_id, score in ranked]
+
+
+class HybridKeywordRetriever:
+    """
+    Keyword retriever for one library: name trie and name-term BM25 first, vector search as fallback.
+
+    Built from the exact-name keyword index (libdoc spec), so building it
+    needs no embeddings. Results use the format of KeywordVectorStore.search,
+    plus a "match" field telling which path answered.
+    """
+
+    def __init__(
+        self,
+        keyword_index: Dict[str, Dict],
+        vector_search: Optional[Callable[[str, int], List[Dict]]] = None,
+        min_coverage: float = 0.8,
+        name_weight: int = 3
+    ):
+        """
+        Args:
+            keyword_index: Lowercased keyword name -> {"name", "args", "description"}
+            vector_search: Callable(query, top_k) returning KeywordVectorStore.search results
+            min_coverage: Share of the query terms (IDF-weighted) a keyword name must
+                contain for the query to be answered without vector search
+            name_weight: How many times name terms are counted relative to doc terms
+        """
+        self.vector_search = vector_search
+        self.min_coverage = min_coverage
+        self._keywords = list(keyword_index.values())
+        self._positions = {normalize_keyword_name(kw["name"]): i for i, kw in enumerate(self._keywords)}
+        self._trie = NameTrie([kw["name"] for kw in self._keywords])
+        self._bm25 = BM25Index([
+            tokenize(kw["name"]) * name_weight + tokenize(kw.get("description") or "")
+            for kw in self._keywords
+        ])
+        # Names only: decides whether a query is answered lexically
+        self._name_bm25 = BM25Index([tokenize(kw["name"]) for kw in self._keywords])
+        self._lock = threading.Lock()
+        self._matches: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def search(self, query: str, top_k: int = 3, mode: str = "hybrid") -> List[Dict]:
+        """
+        Search keywords.
+
+        Args:
+            query: Keyword name or natural language description
+            top_k: Number of results to return
+            mode: "hybrid" (lexical when names match, else fused with vector search),
+                "lexical" (never embeds) or "vector" (vector search only)
+
+        Returns:
+            List of {"name", "args", "description", "similarity", "match"} dicts
+        """
+        if mode == "vector":
+            results = self._vector(query, top_k)
+            self._count(MATCH_VECTOR)
+            return results
+
+        candidates = top_k if mode == "lexical" else max(top_k * 3, 10)
+        results, confident = self._lexical(query, candidates)
+        if confident or mode == "lexical":
+            results = results[:top_k]
+            if results:
+                self._count(results[0]["match"])
+            return results
+
+        # No keyword name matches the query: fuse the lexical ranking with vector search
+        vector_results = self._vector(query, candidates)
+        if not results:
+            self._count(MATCH_VECTOR)
+            return vector_results[:top_k]
+
+        fused: Dict[str, float] = {}
+        for ranking in ([kw["name"] for kw in results], [kw["name"] for kw in vector_results]):
+            for rank, name in enumerate(ranking):
+                fused[name] = fused.get(name, 0.0) + 1.0 / (_RRF_K + rank + 1)
+        by_name = {kw["name"]: kw for kw in vector_results}
+        best = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        self._count(MATCH_HYBRID)
+        return [
+            self._result(by_name.get(name) or self._keyword(name), score * (_RRF_K + 1) / 2, MATCH_HYBRID)
+            for name, score in best
+        ]
+
+    def _lexical(self, query: str, limit: int) -> Tuple[List[Dict], bool]:
+        """
+        Rank keywords lexically.
+
+        Exact and prefix name matches come first, then keywords whose names
+        cover the query terms, then the rest of the BM25 ranking. Similarity
+        is derived from the rank (1 / rank), so it always follows the order.
+
+        Returns:
+            (up to limit results best first, whether a keyword name matched the query)
+        """
+        exact = self._trie.exact(query)
+        prefix_names = self._trie.prefix(query)
+        terms = tokenize(query)
+
+        ranked = self._bm25.search(terms, len(self._keywords)) if terms else []
+        name_matches = {
+            doc_id for doc_id, _, coverage in self._name_bm25.search(terms, len(self._keywords))
+            if coverage >= self.min_coverage
+        } if terms else set()
+
+        # Name matches first, BM25 order within each group
+        doc_ids = ([doc_id for doc_id, _, _ in ranked if doc_id in name_matches]
+                   + [doc_id for doc_id, _, _ in ranked if doc_id not in name_matches])
+        ranking = [(self._keywords[doc_id]["name"], MATCH_LEXICAL) for doc_id in doc_ids]
+
+        if exact or prefix_names:
+            # Rank name completions by BM25 (shortest name first without a score)
+            scores = {self._keywords[doc_id]["name"]: score for doc_id, score, _ in ranked}
+            names = sorted((name for name in prefix_names if name != exact),
+                           key=lambda name: (-scores.get(name, 0.0), len(name)))
+            leading = [(exact, MATCH_EXACT)] if exact else []
+            leading += [(name, MATCH_PREFIX) for name in names]
+            seen = {name for name, _ in leading}
+            ranking = leading + [item for item in ranking if item[0] not in seen]
+
+        results = [
+            self._result(self._keyword(name), 1.0 / (rank + 1), match)
+            for rank, (name, match) in enumerate(ranking[:limit])
+        ]
+        return results, bool(exact or prefix_names or name_matches)
+
+    def _vector(self, query: str, top_k: int) -> List[Dict]:
+        if self.vector_search is None:
+            return []
+        return [dict(kw, match=MATCH_VECTOR) for kw in self.vector_search(query, top_k)]
+
+    def _keyword(self, name: str) -> Dict:
+        return self._keywords[self._positions[normalize_keyword_name(name)]]
+
+    @staticmethod
+    def _result(keyword: Dict, similarity: float, match: str) -> Dict:
+        return {
+            "name": keyword["name"],
+            "args": keyword["args"],
+            "description": keyword["description"],
+            "similarity": similarity,
+            "match": match
+        }
+
+    def _count(self, match: str) -> None:
+        with self._lock:
+            self._matches[match] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the number of searches answered by each path."""
+        with self._lock:
+            total = sum(self._matches.values())
+            embedded = self._matches[MATCH_HYBRID] + self._matches[MATCH_VECTOR]
+            return {
+                "keywords": len(self._keywords),
+                "searches": total,
+                "matches": dict(self._matches),
+                "embedding_skipped_rate": round((total - embedded) / total, 3) if total else 0.0,
+            }
@@ -1,8 +1,12 @@
 """
 Keyword search tool for CrewAI agents.
 
-Provides semantic search over Robot Framework keywords, allowing agents
+Provides hybrid search over Robot Framework keywords, allowing agents
 to find relevant keywords on-demand without having all keywords in context.
+Searches naming a keyword or containing distinctive terms are answered from
+lexical indexes; only the others embed the query (see hybrid_search).
+Results are kept in the process-wide keyword search cache, so searches
+repeated across workflows are not embedded again.
 """
 
 import json
@@ -11,13 +15,14 @@ import time
 from typing import Optional
 from crewai.tools import BaseTool
 from .chroma_store import KeywordVectorStore
+from .search_cache import get_keyword_search_cache
 
 logger = logging.getLogger(__name__)
 
 
 class KeywordSearchTool(BaseTool):
     """
-    CrewAI tool for semantic keyword search using ChromaDB.
+    CrewAI tool for hybrid (lexical + semantic) keyword search.
     
     Agents call this tool when they need to find relevant keywords for an action.
     Returns top K matching keywords with descriptions and examples.
@@ -28,7 +33,7 @@ class KeywordSearchTool(BaseTool):
 Search for Robot Framework keywords by describing what you want to do.
 Use this when you need to find the right keyword for an action.
 
-Input: Natural language query (e.g., "click a button", "wait for element", "fill text input")
+Input: Natural language query or keyword name (e.g., "click a button", "wait for element", "Fill Text")
 Output: Top 3 matching keywords with descriptions, arguments, and examples
 
 Example usage:
@@ -40,7 +45,6 @@ Example usage:
     # Use Pydantic's PrivateAttr for internal state
     _library_name: str
     _vector_store: KeywordVectorStore
-    _cache: dict
     _metrics: Optional[object]
     
     def __init__(self, library_name: str, vector_store: KeywordVectorStore, metrics: Optional[object] = None):
@@ -55,7 +59,6 @@ Example usage:
         super().__init__()
         object.__setattr__(self, '_library_name', library_name)
         object.__setattr__(self, '_vector_store', vector_store)
-        object.__setattr__(self, '_cache', {})
         object.__setattr__(self, '_metrics', metrics)
     
     def _run(self, query: str, top_k: int = 3) -> str:
@@ -72,15 +75,20 @@ Example usage:
         # Start timing for metrics
         start_time = time.time()
         
-        # Check cache
-        cache_key = f"{query}:{top_k}"
-        if cache_key in self._cache:
+        # Check the shared cache (keyword names are keyed verbatim, not folded like queries)
+        cache = get_keyword_search_cache()
+        exact_name = self._vector_store.is_keyword_name(self._library_name, query)
+        # Read before searching, so results of a search racing a collection rebuild are not cached
+        generation = cache.generation(self._library_name)
+        cached_results = cache.get(self._library_name, query, top_k, exact_name=exact_name)
+        if cached_results is not None:
             logger.debug(f"Cache hit for query: {query}")
-            return self._cache[cache_key]
+            self._track(start_time, cached_results, cache_hit=True)
+            return self._format_results(query, cached_results)
         
         try:
-            # Search ChromaDB
-            keywords = self._vector_store.search(
+            # Exact name, BM25, then vector search
+            keywords = self._vector_store.hybrid_search(
                 library_name=self._library_name,
                 query=query,
                 top_k=top_k
@@ -106,26 +114,12 @@ Example usage:
                     "similarity": round(kw['similarity'], 3)
                 })
             
-            result_json = json.dumps({
-                "query": query,
-                "library": self._library_name,
-                "results": results
-            }, indent=2)
+            cache.put(self._library_name, query, top_k, results, generation=generation, exact_name=exact_name)
+            self._track(start_time, results, cache_hit=False)
             
-            # Cache result (limit cache size to 100 entries)
-            if len(self._cache) >= 100:
-                # Remove oldest entry (simple FIFO)
-                self._cache.pop(next(iter(self._cache)))
-            self._cache[cache_key] = result_json
-            
-            # Track metrics if available
-            if self._metrics:
-                latency_ms = (time.time() - start_time) * 1000
-                returned_keyword_names = [r['name'] for r in results]
-                self._metrics.track_keyword_search(latency_ms, returned_keyword_names)
-            
-            logger.info(f"Keyword search for '{query}' returned {len(results)} results")
-            return result_json
+            logger.info(f"Keyword search for '{query}' returned {len(results)} results "
+                        f"({keywords[0].get('match', 'vector')} match)")
+            return self._format_results(query, results)
             
         except Exception as e:
             logger.error(f"Keyword search failed: {e}")
@@ -134,6 +128,21 @@ Example usage:
                 "results": []
             })
     
+    def _format_results(self, query: str, results: list) -> str:
+        """Format search results as the JSON string returned to the agent."""
+        return json.dumps({
+            "query": query,
+            "library": self._library_name,
+            "results": results
+        }, indent=2)
+    
+    def _track(self, start_time: float, results: list, cache_hit: bool) -> None:
+        """Track search latency, returned keywords and cache usage if metrics are available."""
+        if self._metrics:
+            latency_ms = (time.time() - start_time) * 1000
+            returned_keyword_names = [r['name'] for r in results]
+            self._metrics.track_keyword_search(latency_ms, returned_keyword_names, cache_hit=cache_hit)
+    
     def _get_example(self, keyword_name: str, args: list) -> str:
         """
         Generate usage example for keyword with clear argument structure.
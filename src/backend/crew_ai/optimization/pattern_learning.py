@@ -6,18 +6,112 @@ are commonly used for specific query types and predicts relevant keywords
 for new queries based on similarity to past queries.
 
 Uses ChromaDB for semantic similarity search (efficient) and SQLite for usage statistics.
+
+SQLite access uses one connection per thread in WAL mode, so statistics
+reads never wait for a learning write, and each learn call upserts all of
+its keywords with one executemany in a single transaction.
+
+The pattern collection is kept compact: pattern IDs are a hash of the
+normalized query, a learned query that is a near-duplicate of a stored
+pattern is merged into it (keyword lists unioned, counts kept), and the
+collection is capped at ``max_patterns`` by evicting the patterns with the
+lowest recency-weighted frequency. ``compact()`` applies the same rules to
+the whole collection (see tools/compact_patterns.py).
 """
 
+import hashlib
 import sqlite3
 import json
-import time
+import threading
 import logging
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# A pattern used this many days ago weighs half as much as one used today
+_RECENCY_HALF_LIFE_DAYS = 30.0
+
+# Incremental eviction shrinks the collection to this fraction of max_patterns,
+# so it does not run again on the very next learn call
+_EVICTION_LOW_WATERMARK = 0.9
+
+# ChromaDB rejects very large add/upsert/delete calls
+_WRITE_BATCH_SIZE = 1000
+
+# Statements are kept as constants so every call reuses the connection's prepared statement
+_UPSERT_KEYWORD_STATS_SQL = """
+    INSERT INTO keyword_stats (keyword_name, usage_count, last_used)
+    VALUES (?, ?, ?)
+    ON CONFLICT(keyword_name) DO UPDATE SET
+        usage_count = usage_count + excluded.usage_count,
+        last_used = excluded.last_used
+"""
+
+_SELECT_KEYWORD_STATS_SQL = """
+    SELECT keyword_name, usage_count, last_used
+    FROM keyword_stats
+    ORDER BY usage_count DESC
+"""
+
+
+def pattern_id_for_query(user_query: str) -> str:
+    """
+    Collision-free pattern ID: a hash of the query with case and whitespace normalized.
+    
+    Args:
+        user_query: User query stored as the pattern document
+        
+    Returns:
+        Pattern ID such as "pattern_3f2a9c0d1e4b5a6f"
+    """
+    normalized = " ".join(user_query.lower().split())
+    return "pattern_" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def _read_pattern(metadata: Optional[Dict[str, Any]]) -> Tuple[Dict[str, int], int, str]:
+    """Keyword counts, execution count and last-learned timestamp of a stored pattern."""
+    metadata = metadata or {}
+    if "keyword_counts" in metadata:
+        keyword_counts = json.loads(metadata["keyword_counts"])
+    else:
+        # Patterns stored before merging existed hold one execution
+        keyword_counts = {keyword: 1 for keyword in json.loads(metadata.get("keywords", "[]"))}
+    return keyword_counts, int(metadata.get("count", 1)), metadata.get("timestamp", "")
+
+
+def _pattern_metadata(keyword_counts: Dict[str, int], count: int, timestamp: str) -> Dict[str, Any]:
+    """Build the stored metadata; "keywords" lists the most used keywords first."""
+    keywords = sorted(keyword_counts, key=lambda keyword: keyword_counts[keyword], reverse=True)
+    return {
+        "keywords": json.dumps(keywords),
+        "keyword_counts": json.dumps(keyword_counts),
+        "count": count,
+        "timestamp": timestamp,
+    }
+
+
+def _merge_keyword_counts(target: Dict[str, int], source: Dict[str, int]) -> None:
+    for keyword, count in source.items():
+        target[keyword] = target.get(keyword, 0) + count
+
+
+def _retention_score(count: int, timestamp: str, now: datetime) -> float:
+    """Recency-weighted frequency: the execution count halves every _RECENCY_HALF_LIFE_DAYS."""
+    try:
+        age_days = max(0.0, (now - datetime.fromisoformat(timestamp)).total_seconds() / 86400)
+    except ValueError:
+        age_days = 10 * _RECENCY_HALF_LIFE_DAYS
+    return count * 0.5 ** (age_days / _RECENCY_HALF_LIFE_DAYS)
+
+
+def _similarity(distance: float) -> float:
+    # Same distance-to-similarity conversion as get_relevant_keywords
+    return 1 / (1 + distance)
+
 
 class QueryPatternMatcher:
     """
@@ -25,16 +119,31 @@ class QueryPatternMatcher:
     Uses ChromaDB for semantic similarity search (efficient) and SQLite for usage tracking.
     """
     
-    def __init__(self, db_path: str = "./data/pattern_learning.db", chroma_store=None):
+    def __init__(self, db_path: str = "./data/pattern_learning.db", chroma_store=None,
+                 merge_threshold: float = 0.9, max_patterns: int = 5000):
         """
         Initialize with SQLite database path and ChromaDB store.
         
         Args:
             db_path: Path to SQLite database file (for usage statistics)
             chroma_store: KeywordVectorStore instance (for query embeddings)
+            merge_threshold: Similarity (0.0-1.0) above which a learned query is merged
+                into an existing pattern
+            max_patterns: Maximum stored patterns (0 for no limit)
         """
         self.db_path = db_path
         self.chroma_store = chroma_store
+        self.merge_threshold = merge_threshold
+        self.max_patterns = max_patterns
+        # Serializes pattern collection read-merge-write cycles (learning and compaction)
+        self._pattern_lock = threading.RLock()
+        
+        # One SQLite connection per thread; writers are serialized in-process so they
+        # queue on this lock instead of spinning on SQLite's busy timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._write_lock = threading.Lock()
         
         # Ensure data directory exists
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
@@ -51,9 +160,36 @@ class QueryPatternMatcher:
         
         logger.info(f"QueryPatternMatcher initialized with database: {db_path}")
     
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get this thread's SQLite connection, opening it in WAL mode on first use.
+        
+        Returns:
+            Connection owned by the calling thread
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can close it from another thread
+            conn = sqlite3.connect(self.db_path, timeout=10, cached_statements=64,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def close(self) -> None:
+        """Close the SQLite connections of all threads."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+    
     def _init_database(self):
         """Create database schema if it doesn't exist (SQLite for statistics only)."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Create keyword_stats table (usage tracking)
@@ -72,7 +208,6 @@ class QueryPatternMatcher:
         """)
         
         conn.commit()
-        conn.close()
         
         logger.info("Database schema initialized successfully")
     
@@ -151,56 +286,244 @@ class QueryPatternMatcher:
             generated_code: Successfully generated Robot Framework code
         """
         try:
+            self.learn_batch([(user_query, generated_code)])
+        except Exception as e:
+            logger.error(f"Failed to learn from execution: {e}", exc_info=True)
+    
+    def learn_batch(self, executions: List[Tuple[str, str]]) -> int:
+        """
+        Learn from several executions with one ChromaDB write and one SQLite transaction.
+        
+        All queries of the batch are embedded in a single call. A query whose nearest
+        stored pattern is at least ``merge_threshold`` similar is merged into that
+        pattern instead of being stored again.
+        
+        Args:
+            executions: (user_query, generated_code) pairs of successful executions
+            
+        Returns:
+            Number of executions learned (those without keywords are skipped)
+            
+        Raises:
+            Exception: If storing the patterns or statistics fails
+        """
+        timestamp = datetime.now().isoformat()
+        # Pattern ID -> [document, keyword counts, execution count]
+        learned: Dict[str, list] = {}
+        keyword_counts: Dict[str, int] = {}
+        learned_count = 0
+        
+        for user_query, generated_code in executions:
             # Extract keywords used in code
             used_keywords = self._extract_keywords_from_code(generated_code)
             
             if not used_keywords:
                 logger.warning("No keywords extracted from code, skipping pattern learning")
-                return
-            
-            timestamp = datetime.now().isoformat()
-            
-            # Store pattern in ChromaDB (for semantic search)
-            if self.pattern_collection:
-                pattern_id = f"pattern_{int(time.time() * 1000)}"
-                self.pattern_collection.add(
-                    documents=[user_query],
-                    ids=[pattern_id],
-                    metadatas=[{
-                        "keywords": json.dumps(used_keywords),
-                        "timestamp": timestamp
-                    }]
-                )
-                logger.debug(f"Stored pattern in ChromaDB: {pattern_id}")
-            
-            # Update keyword statistics in SQLite
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            for keyword in used_keywords:
-                cursor.execute("""
-                    INSERT INTO keyword_stats (keyword_name, usage_count, last_used)
-                    VALUES (?, 1, ?)
-                    ON CONFLICT(keyword_name) DO UPDATE SET
-                        usage_count = usage_count + 1,
-                        last_used = ?
-                """, (keyword, timestamp, timestamp))
-            
-            conn.commit()
-            conn.close()
+                continue
             
+            entry = learned.setdefault(pattern_id_for_query(user_query), [user_query, {}, 0])
+            _merge_keyword_counts(entry[1], {keyword: 1 for keyword in used_keywords})
+            entry[2] += 1
+            _merge_keyword_counts(keyword_counts, {keyword: 1 for keyword in used_keywords})
+            learned_count += 1
             logger.info(f"Learned pattern: query='{user_query[:50]}...', keywords={used_keywords}")
+        
+        if not learned_count:
+            return 0
+        
+        # Store patterns in ChromaDB (for semantic search)
+        if self.pattern_collection:
+            with self._pattern_lock:
+                self._store_patterns(learned, timestamp)
+                if self.max_patterns and self.pattern_collection.count() > self.max_patterns:
+                    self._evict(int(self.max_patterns * _EVICTION_LOW_WATERMARK))
+        
+        # Update keyword statistics in SQLite
+        self.record_keyword_usage(keyword_counts, timestamp)
+        return learned_count
+    
+    def _store_patterns(self, learned: Dict[str, list], timestamp: str) -> None:
+        """Merge learned patterns into their nearest stored pattern or add them."""
+        ids = list(learned)
+        documents = [learned[pattern_id][0] for pattern_id in ids]
+        embeddings = [np.asarray(e, dtype=float).tolist() for e in self.chroma_store.embedding_function(documents)]
+        
+        # Final pattern ID -> [document, keyword counts, execution count, embedding]
+        merged: Dict[str, list] = {}
+        nearest = None
+        if self.pattern_collection.count() > 0:
+            nearest = self.pattern_collection.query(
+                query_embeddings=embeddings, n_results=1,
+                include=["metadatas", "documents", "distances", "embeddings"]
+            )
+        
+        for i, pattern_id in enumerate(ids):
+            document, counts, count = learned[pattern_id]
+            if nearest and nearest["ids"][i] and _similarity(nearest["distances"][i][0]) >= self.merge_threshold:
+                target_id = nearest["ids"][i][0]
+                if target_id not in merged:
+                    stored_counts, stored_count, _ = _read_pattern(nearest["metadatas"][i][0])
+                    merged[target_id] = [nearest["documents"][i][0], stored_counts, stored_count,
+                                         np.asarray(nearest["embeddings"][i][0], dtype=float).tolist()]
+                target = merged[target_id]
+            else:
+                target = merged.setdefault(pattern_id, [document, {}, 0, embeddings[i]])
+            _merge_keyword_counts(target[1], counts)
+            target[2] += count
+        
+        final_ids = list(merged)
+        self.pattern_collection.upsert(
+            ids=final_ids,
+            documents=[merged[pattern_id][0] for pattern_id in final_ids],
+            metadatas=[_pattern_metadata(merged[pattern_id][1], merged[pattern_id][2], timestamp)
+                       for pattern_id in final_ids],
+            embeddings=[merged[pattern_id][3] for pattern_id in final_ids],
+        )
+        logger.debug(f"Stored {len(final_ids)} patterns in ChromaDB ({len(ids)} learned)")
+    
+    def _evict(self, keep: int) -> int:
+        """Delete all but the ``keep`` patterns with the highest retention score."""
+        stored = self.pattern_collection.get(include=["metadatas"])
+        if len(stored["ids"]) <= keep:
+            return 0
+        now = datetime.now()
+        scored = []
+        for pattern_id, metadata in zip(stored["ids"], stored["metadatas"]):
+            _, count, timestamp = _read_pattern(metadata)
+            scored.append((_retention_score(count, timestamp, now), pattern_id))
+        scored.sort(reverse=True)
+        evicted = [pattern_id for _, pattern_id in scored[keep:]]
+        for start in range(0, len(evicted), _WRITE_BATCH_SIZE):
+            self.pattern_collection.delete(ids=evicted[start:start + _WRITE_BATCH_SIZE])
+        logger.info(f"🧹 Evicted {len(evicted)} least used query patterns (kept {keep})")
+        return len(evicted)
+    
+    def compact(self, merge_threshold: Optional[float] = None, max_patterns: Optional[int] = None,
+                dry_run: bool = False) -> Dict[str, int]:
+        """
+        Merge near-duplicate patterns, re-key them by content hash and enforce the size limit.
+        
+        Patterns are visited from most to least executed; each one is merged into the
+        first kept pattern that is at least ``merge_threshold`` similar, otherwise it
+        is kept. Stored embeddings are reused, nothing is embedded again.
+        
+        Args:
+            merge_threshold: Similarity above which patterns are merged (default: instance setting)
+            max_patterns: Maximum patterns to keep, 0 for no limit (default: instance setting)
+            dry_run: Only report what would change
             
-        except Exception as e:
-            logger.error(f"Failed to learn from execution: {e}", exc_info=True)
+        Returns:
+            Counts of patterns before and after, merged, re-keyed and evicted
+        """
+        merge_threshold = self.merge_threshold if merge_threshold is None else merge_threshold
+        max_patterns = self.max_patterns if max_patterns is None else max_patterns
+        stats = {"patterns_before": 0, "merged": 0, "rekeyed": 0, "evicted": 0, "patterns_after": 0}
+        if not self.pattern_collection:
+            return stats
+        
+        with self._pattern_lock:
+            stored = self.pattern_collection.get(include=["documents", "metadatas", "embeddings"])
+            stats["patterns_before"] = len(stored["ids"])
+            if not stored["ids"]:
+                return stats
+            
+            patterns = []
+            for i, pattern_id in enumerate(stored["ids"]):
+                counts, count, timestamp = _read_pattern(stored["metadatas"][i])
+                patterns.append({"id": pattern_id, "document": stored["documents"][i],
+                                 "counts": counts, "count": count, "timestamp": timestamp})
+            embeddings = np.asarray(stored["embeddings"], dtype=np.float32)
+            
+            # Greedy clustering, most executed patterns become the representatives
+            order = sorted(range(len(patterns)),
+                           key=lambda i: (patterns[i]["count"], patterns[i]["timestamp"]), reverse=True)
+            kept: List[int] = []
+            for i in order:
+                if kept:
+                    # Squared L2, the distance the "l2" collection space reports
+                    distances = ((embeddings[kept] - embeddings[i]) ** 2).sum(axis=1)
+                    best = int(np.argmin(distances))
+                    if _similarity(float(distances[best])) >= merge_threshold:
+                        target = patterns[kept[best]]
+                        _merge_keyword_counts(target["counts"], patterns[i]["counts"])
+                        target["count"] += patterns[i]["count"]
+                        target["timestamp"] = max(target["timestamp"], patterns[i]["timestamp"])
+                        stats["merged"] += 1
+                        continue
+                kept.append(i)
+            
+            if max_patterns and len(kept) > max_patterns:
+                now = datetime.now()
+                kept.sort(key=lambda i: _retention_score(patterns[i]["count"], patterns[i]["timestamp"], now),
+                          reverse=True)
+                stats["evicted"] = len(kept) - max_patterns
+                kept = kept[:max_patterns]
+            
+            final_ids = {}
+            for i in kept:
+                final_id = pattern_id_for_query(patterns[i]["document"])
+                if final_id in final_ids:
+                    # Same normalized query under two legacy IDs that were not similar enough to merge
+                    target = patterns[final_ids[final_id]]
+                    _merge_keyword_counts(target["counts"], patterns[i]["counts"])
+                    target["count"] += patterns[i]["count"]
+                    target["timestamp"] = max(target["timestamp"], patterns[i]["timestamp"])
+                    stats["merged"] += 1
+                    continue
+                final_ids[final_id] = i
+                if final_id != patterns[i]["id"]:
+                    stats["rekeyed"] += 1
+            stats["patterns_after"] = len(final_ids)
+            
+            if dry_run:
+                return stats
+            
+            upsert_ids = list(final_ids)
+            for start in range(0, len(upsert_ids), _WRITE_BATCH_SIZE):
+                chunk = upsert_ids[start:start + _WRITE_BATCH_SIZE]
+                rows = [patterns[final_ids[pattern_id]] for pattern_id in chunk]
+                self.pattern_collection.upsert(
+                    ids=chunk,
+                    documents=[row["document"] for row in rows],
+                    metadatas=[_pattern_metadata(row["counts"], row["count"], row["timestamp"]) for row in rows],
+                    embeddings=[embeddings[final_ids[pattern_id]].tolist() for pattern_id in chunk],
+                )
+            # Delete after writing, so an interrupted compaction leaves duplicates rather than gaps
+            stale_ids = [pattern["id"] for pattern in patterns if pattern["id"] not in final_ids]
+            for start in range(0, len(stale_ids), _WRITE_BATCH_SIZE):
+                self.pattern_collection.delete(ids=stale_ids[start:start + _WRITE_BATCH_SIZE])
+        
+        logger.info(f"🧹 Compacted query patterns: {stats['patterns_before']} -> {stats['patterns_after']} "
+                    f"({stats['merged']} merged, {stats['evicted']} evicted, {stats['rekeyed']} re-keyed)")
+        return stats
     
-    def get_relevant_keywords(self, user_query: str, confidence_threshold: float = 0.7) -> List[str]:
+    def record_keyword_usage(self, keyword_counts: Dict[str, int], timestamp: Optional[str] = None) -> None:
+        """
+        Add usage counts to the keyword statistics in one transaction.
+        
+        Args:
+            keyword_counts: Mapping of keyword name to number of new uses
+            timestamp: ISO timestamp stored as last_used (default: now)
+        """
+        if not keyword_counts:
+            return
+        timestamp = timestamp or datetime.now().isoformat()
+        rows = [(keyword, count, timestamp) for keyword, count in keyword_counts.items()]
+        
+        conn = self._connect()
+        with self._write_lock:
+            with conn:
+                conn.executemany(_UPSERT_KEYWORD_STATS_SQL, rows)
+    
+    def get_relevant_keywords(self, user_query: str, confidence_threshold: float = 0.7,
+                              query_embedding=None) -> List[str]:
         """
         Predict relevant keywords based on similar past queries using ChromaDB.
         
         Args:
             user_query: New user query
             confidence_threshold: Minimum similarity score (0.0-1.0)
+            query_embedding: Precomputed embedding of the query (skips embedding it again)
             
         Returns:
             List of predicted keyword names (empty if confidence too low)
@@ -210,11 +533,11 @@ class QueryPatternMatcher:
                 logger.debug("No ChromaDB pattern collection available")
                 return []
             
-            # Search for similar patterns in ChromaDB
-            results = self.pattern_collection.query(
-                query_texts=[user_query],
-                n_results=5  # Get top 5 similar patterns
-            )
+            # Search for similar patterns in ChromaDB (top 5 similar patterns)
+            if query_embedding is not None:
+                results = self.pattern_collection.query(query_embeddings=[query_embedding], n_results=5)
+            else:
+                results = self.pattern_collection.query(query_texts=[user_query], n_results=5)
             
             # Check if we have results
             if not results['ids'][0]:
@@ -265,23 +588,16 @@ class QueryPatternMatcher:
             Dictionary mapping keyword names to usage statistics
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT keyword_name, usage_count, last_used
-                FROM keyword_stats
-                ORDER BY usage_count DESC
-            """)
+            # WAL readers see the last committed state without waiting for writers
+            rows = self._connect().execute(_SELECT_KEYWORD_STATS_SQL).fetchall()
             
             stats = {}
-            for keyword_name, usage_count, last_used in cursor.fetchall():
+            for keyword_name, usage_count, last_used in rows:
                 stats[keyword_name] = {
                     "usage_count": usage_count,
                     "last_used": last_used
                 }
             
-            conn.close()
             return stats
             
         except Exception as e:
@@ -0,0 +1,210 @@
+"""
+Process-wide cache of keyword_search tool results.
+
+Agents repeat the same searches ("click button", "wait for element") in
+almost every workflow, and every KeywordSearchTool instance lives for one
+workflow only. This LRU cache with TTL is shared by all tool instances, so a
+repeated search is served without embedding the query again.
+
+Queries are normalized before lookup (case, whitespace, punctuation, filler
+words and a few synonyms), so trivially different phrasings share an entry.
+Queries that are a keyword name are keyed on the name itself (see
+``normalize_keyword_name``), since folding would merge distinct keywords
+such as "Get Element" and "Get Elements".
+
+Entries of a library are dropped when its keyword collection is rebuilt
+(for example after a library upgrade). Results of a search that started
+before the rebuild are not stored.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Words that do not change which keyword an agent is looking for
+_FILLER_WORDS = {"a", "an", "the", "to", "on", "in", "into", "for", "of", "with", "please", "keyword", "keywords"}
+
+# Phrasings of the same UI concept, mapped to one spelling
+_SYNONYMS = [
+    (re.compile(r"\b(?:text ?box|input ?field|text ?input)\b"), "text field"),
+    (re.compile(r"\bdrop[- ]?down\b"), "select"),
+    (re.compile(r"\bcheck ?box(es)?\b"), "checkbox"),
+    (re.compile(r"\bbtn\b"), "button"),
+    (re.compile(r"\bbuttons\b"), "button"),
+    (re.compile(r"\belements\b"), "element"),
+]
+
+
+def normalize_keyword_name(text: str) -> str:
+    """Normalize a keyword name or verbatim query: lowercase, underscores as spaces, no punctuation."""
+    text = re.sub(r"[^\w\s]", " ", text.lower().replace("_", " "))
+    return " ".join(text.split())
+
+
+def normalize_search_query(query: str) -> str:
+    """
+    Normalize a keyword search query into its cache key form.
+
+    Args:
+        query: Natural language search query from an agent
+
+    Returns:
+        Lowercased query without punctuation and filler words, with synonyms unified
+    """
+    text = re.sub(r"[^\w\s-]", " ", query.lower())
+    text = " ".join(text.split())
+    for pattern, replacement in _SYNONYMS:
+        text = pattern.sub(replacement, text)
+    words = [word for word in text.split() if word not in _FILLER_WORDS]
+    return " ".join(words) or text
+
+
+class KeywordSearchCache:
+    """
+    Thread-safe LRU cache with TTL for keyword search results.
+
+    Keys are (library, normalized query, top_k). Each library has a
+    generation counter; invalidating a library bumps it so its old entries
+    are never returned again (they age out of the LRU order). Callers read
+    the generation before searching and pass it to ``put``, so results
+    computed against a superseded collection are discarded.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 3600.0):
+        """
+        Args:
+            max_entries: Maximum cached searches before least-recently-used ones are evicted
+                (0 disables the cache)
+            ttl_seconds: Lifetime of a cached search in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def _key(self, library_name: str, generation: int, query: str, top_k: int, exact_name: bool) -> Tuple:
+        if exact_name:
+            return (library_name, generation, "name", normalize_keyword_name(query), top_k)
+        return (library_name, generation, "query", normalize_search_query(query), top_k)
+
+    def generation(self, library_name: str) -> int:
+        """Current generation of a library; read it before searching and pass it to put()."""
+        with self._lock:
+            return self._generations.get(library_name, 0)
+
+    def get(self, library_name: str, query: str, top_k: int,
+            exact_name: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached search results.
+
+        Args:
+            library_name: Library searched
+            query: Search query
+            top_k: Number of results requested
+            exact_name: The query is a keyword name (keyed without query folding)
+
+        Returns:
+            The cached results, or None on a miss or expired entry
+        """
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            key = self._key(library_name, self._generations.get(library_name, 0), query, top_k, exact_name)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            stored_at, results = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return results
+
+    def put(self, library_name: str, query: str, top_k: int, results: List[Dict[str, Any]],
+            generation: Optional[int] = None, exact_name: bool = False) -> None:
+        """
+        Store search results, evicting the least recently used entries when full.
+
+        Args:
+            library_name: Library searched
+            query: Search query
+            top_k: Number of results requested
+            results: Results to cache
+            generation: Library generation read before the search started; results are
+                dropped if the library was invalidated since (None stores unconditionally)
+            exact_name: The query is a keyword name (keyed without query folding)
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            current = self._generations.get(library_name, 0)
+            if generation is not None and generation != current:
+                logger.debug(f"Not caching keyword search '{query}', {library_name} was invalidated meanwhile")
+                return
+            key = self._key(library_name, current, query, top_k, exact_name)
+            self._entries[key] = (time.monotonic(), results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate_library(self, library_name: str) -> None:
+        """Drop all cached searches of a library (call after its collection is rebuilt)."""
+        with self._lock:
+            self._generations[library_name] = self._generations.get(library_name, 0) + 1
+            stale = [key for key in self._entries if key[0] == library_name]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            logger.info(f"🧹 Invalidated {len(stale)} cached keyword searches for {library_name}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+
+# Global instance
+_keyword_search_cache: Optional[KeywordSearchCache] = None
+_keyword_search_cache_lock = threading.Lock()
+
+
+def get_keyword_search_cache() -> KeywordSearchCache:
+    """Get the global keyword search cache instance."""
+    global _keyword_search_cache
+    if _keyword_search_cache is None:
+        with _keyword_search_cache_lock:
+            if _keyword_search_cache is None:
+                from src.backend.core.config import settings
+                _keyword_search_cache = KeywordSearchCache(
+                    max_entries=settings.OPTIMIZATION_KEYWORD_CACHE_MAX_ENTRIES,
+                    ttl_seconds=settings.OPTIMIZATION_KEYWORD_CACHE_TTL_SECONDS,
+                )
+    return _keyword_search_cache
@@ -13,6 +13,7 @@ from .pattern_learning import QueryPatternMatcher
 from .chroma_store import KeywordVectorStore
 from .keyword_search_tool import KeywordSearchTool
 from .context_pruner import ContextPruner
+from ..query_analysis import QueryAnalysis
 
 logger = logging.getLogger(__name__)
 
@@ -111,7 +112,8 @@ Result: Click, Click Element, Click Button (with docs and examples)
 Use this tool whenever you need to find the right keyword for an action.
 """
     
-    def _format_predicted_context(self, predicted_keywords: List[str], agent_role: str, user_query: str = "") -> str:
+    def _format_predicted_context(self, predicted_keywords: List[str], agent_role: str, user_query: str = "",
+                                  categories: Optional[List[str]] = None) -> str:
         """
         Format context with predicted keywords from pattern learning.
         
@@ -123,6 +125,7 @@ Use this tool whenever you need to find the right keyword for an action.
             predicted_keywords: List of keyword names predicted by pattern learning
             agent_role: "planner", "assembler", or "validator"
             user_query: User's query (used for pruning if enabled)
+            categories: Precomputed query categories for pruning (classified from user_query if not given)
             
         Returns:
             Formatted context string with core rules + predicted keyword docs
@@ -133,13 +136,16 @@ Use this tool whenever you need to find the right keyword for an action.
         # Apply context pruning if enabled
         keywords_to_fetch = predicted_keywords[:5]  # Limit to top 5 for efficiency
         
-        if self.pruning_enabled and user_query:
+        if self.pruning_enabled and (categories is not None or user_query):
             try:
-                # Classify query into categories
-                relevant_categories = self.context_pruner.classify_query(
-                    user_query, 
-                    confidence_threshold=self.pruning_threshold
-                )
+                # Classify query into categories (unless already classified for this workflow)
+                relevant_categories = categories
+                if relevant_categories is None:
+                    relevant_categories = self.context_pruner.classify_query(
+                        user_query, 
+                        confidence_threshold=self.pruning_threshold,
+                        library_name=self.library_context.library_name
+                    )
                 
                 # Create keyword dicts for pruning
                 keyword_dicts = [{'name': kw} for kw in keywords_to_fetch]
@@ -147,7 +153,8 @@ Use this tool whenever you need to find the right keyword for an action.
                 # Prune keywords to relevant categories
                 pruned_keyword_dicts = self.context_pruner.prune_keywords(
                     keyword_dicts, 
-                    relevant_categories
+                    relevant_categories,
+                    library_name=self.library_context.library_name
                 )
                 
                 # Extract pruned keyword names
@@ -165,31 +172,22 @@ Use this tool whenever you need to find the right keyword for an action.
             except Exception as e:
                 logger.warning(f"Context pruning failed: {e}, using all predicted keywords")
         
-        # Get full documentation for keywords from ChromaDB
+        # Get full documentation for keywords by exact name (dictionary lookup, no embedding)
         logger.info(f"Fetching documentation for {len(keywords_to_fetch)} keywords")
         keyword_docs = []
-        for keyword_name in keywords_to_fetch:
-            # Search for exact keyword in ChromaDB
-            results = self.vector_store.search(
-                library_name=self.library_context.library_name,
-                query=keyword_name,
-                top_k=1
-            )
+        for kw in self.vector_store.get_by_names(self.library_context.library_name, keywords_to_fetch):
+            # Format keyword documentation - MINIMAL format to reduce tokens
+            # Only include essential info: name and first 2 args
+            args_list = kw['args'][:2] if kw['args'] else []
+            args_str = ', '.join([str(arg) for arg in args_list])
+            if len(kw['args']) > 2:
+                args_str += ', ...'
             
-            if results and results[0]['name'] == keyword_name:
-                kw = results[0]
-                # Format keyword documentation - MINIMAL format to reduce tokens
-                # Only include essential info: name and first 2 args
-                args_list = kw['args'][:2] if kw['args'] else []
-                args_str = ', '.join([str(arg) for arg in args_list])
-                if len(kw['args']) > 2:
-                    args_str += ', ...'
-                
-                # Very short description (50 chars max)
-                doc_str = kw['description'][:50] if kw['description'] else ''
-                
-                # Compact format: one line per keyword
-                keyword_docs.append(f"• {kw['name']}({args_str}): {doc_str}")
+            # Very short description (50 chars max)
+            doc_str = kw['description'][:50] if kw['description'] else ''
+            
+            # Compact format: one line per keyword
+            keyword_docs.append(f"• {kw['name']}({args_str}): {doc_str}")
         
         logger.info(f"Formatted {len(keyword_docs)} keyword docs in compact format")
         
@@ -207,7 +205,58 @@ You are an expert Robot Framework developer using {self.library_context.library_
 Use keyword_search tool if you need additional keywords.
 """
     
-    def get_agent_context(self, user_query: str, agent_role: str) -> str:
+    def analyze_query(self, query_analysis: QueryAnalysis) -> QueryAnalysis:
+        """
+        Fill in the embedding, predicted keywords and categories of a query.
+        
+        The query is embedded once; pattern prediction and category
+        classification both reuse that embedding. Already analyzed queries
+        are returned unchanged.
+        
+        Args:
+            query_analysis: Analysis created with QueryAnalysis.from_query
+            
+        Returns:
+            The same QueryAnalysis instance, filled in
+        """
+        if query_analysis.analyzed:
+            return query_analysis
+        
+        text = query_analysis.normalized_query
+        try:
+            query_analysis.embedding = self.vector_store.embedding_function([text])[0]
+        except Exception as e:
+            logger.warning(f"Query embedding failed: {e}, components will embed the query themselves")
+        
+        try:
+            query_analysis.predicted_keywords = self.pattern_matcher.get_relevant_keywords(
+                text, query_embedding=query_analysis.embedding
+            )
+        except Exception as e:
+            logger.warning(f"Pattern learning failed: {e}, falling back to zero-context")
+            query_analysis.predicted_keywords = []
+        
+        # Categories are only used to prune predicted keywords
+        if self.pruning_enabled and query_analysis.predicted_keywords:
+            try:
+                query_analysis.categories = self.context_pruner.classify_query(
+                    text,
+                    confidence_threshold=self.pruning_threshold,
+                    query_embedding=query_analysis.embedding,
+                    library_name=self.library_context.library_name
+                )
+            except Exception as e:
+                logger.warning(f"Query classification failed: {e}, pruning will be skipped")
+        
+        query_analysis.analyzed = True
+        logger.info(
+            f"Analyzed query: {len(query_analysis.predicted_keywords)} predicted keywords, "
+            f"categories={query_analysis.categories}"
+        )
+        return query_analysis
+    
+    def get_agent_context(self, user_query: str, agent_role: str,
+                          query_analysis: Optional[QueryAnalysis] = None) -> str:
         """
         Get optimized context for an agent based on query and role.
         
@@ -219,6 +268,8 @@ Use keyword_search tool if you need additional keywords.
         Args:
             user_query: User's natural language query
             agent_role: "planner", "assembler", or "validator"
+            query_analysis: Analysis of the query shared by all agents of the workflow
+                (analyzed here if not provided)
             
         Returns:
             Optimized context string with minimal, relevant keywords
@@ -229,39 +280,33 @@ Use keyword_search tool if you need additional keywords.
         logger.info(f"Building context for {agent_role} agent")
         logger.debug(f"Core rules: {len(core_rules)} chars")
         
-        # Tier 2: Try pattern learning for keyword prediction
-        try:
-            predicted_keywords = self.pattern_matcher.get_relevant_keywords(user_query)
+        # Tier 2: Try pattern learning for keyword prediction (computed once per query)
+        if query_analysis is None:
+            query_analysis = QueryAnalysis.from_query(user_query)
+        self.analyze_query(query_analysis)
+        predicted_keywords = query_analysis.predicted_keywords
+        
+        if predicted_keywords:
+            logger.info(f"Pattern learning predicted {len(predicted_keywords)} keywords")
             
-            if predicted_keywords:
-                logger.info(f"Pattern learning predicted {len(predicted_keywords)} keywords")
-                
-                # Track pattern learning metrics
-                if self.metrics:
-                    self.metrics.track_pattern_learning(
-                        predicted=True,
-                        keyword_count=len(predicted_keywords),
-                        accuracy=0.0  # Accuracy will be calculated after execution
-                    )
-                
-                try:
-                    return self._format_predicted_context(predicted_keywords, agent_role, user_query)
-                except Exception as e:
-                    logger.warning(f"Failed to format predicted context: {e}, falling back to zero-context")
-            else:
-                logger.info("No predictions from pattern learning, using zero-context + tool")
-                
-                # Track that no prediction was used
-                if self.metrics:
-                    self.metrics.track_pattern_learning(
-                        predicted=False,
-                        keyword_count=0,
-                        accuracy=0.0
-                    )
-        except Exception as e:
-            logger.warning(f"Pattern learning failed: {e}, falling back to zero-context")
+            # Track pattern learning metrics
+            if self.metrics:
+                self.metrics.track_pattern_learning(
+                    predicted=True,
+                    keyword_count=len(predicted_keywords),
+                    accuracy=0.0  # Accuracy will be calculated after execution
+                )
+            
+            try:
+                return self._format_predicted_context(
+                    predicted_keywords, agent_role, user_query, categories=query_analysis.categories
+                )
+            except Exception as e:
+                logger.warning(f"Failed to format predicted context: {e}, falling back to zero-context")
+        else:
+            logger.info("No predictions from pattern learning, using zero-context + tool")
             
-            # Track that prediction failed
+            # Track that no prediction was used
             if self.metrics:
                 self.metrics.track_pattern_learning(
                     predicted=False,
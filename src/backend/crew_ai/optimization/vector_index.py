@@ -0,0 +1,414 @@
+"""
+Pluggable vector index backends for the optimization system.
+
+``KeywordVectorStore``, ``ContextPruner`` and ``QueryPatternMatcher`` only use
+a small part of the ChromaDB collection API (add/upsert, query, get, count,
+delete, metadata). ``VectorIndex`` describes that part, and ChromaDB
+collections satisfy it as they are. The backend is selected with
+OPTIMIZATION_VECTOR_BACKEND:
+
+- ``chroma`` (default): ChromaDB persistent client (SQLite + HNSW)
+- ``numpy``: ``NumpyVectorIndex``, an exact in-memory index
+
+The collections are small (a few hundred library keywords, six category
+descriptions, thousands of learned query patterns). At that size an exact
+search over a contiguous float32 matrix is one vectorized dot product and is
+faster than going through Chroma's client, SQLite and HNSW layers. Embeddings
+are stored normalized in ``embeddings.npy`` (memory-mapped on load) next to a
+JSON file with ids, documents and metadata.
+
+Distances follow Chroma's conventions, so callers convert them to
+similarities the same way for both backends: ``l2`` (default, squared L2
+distance) is ``2 - 2 * cos`` for normalized vectors, ``cosine`` is
+``1 - cos`` and ``ip`` is ``1 - dot``.
+
+Run ``python tools/benchmark_vector_index.py`` to compare both backends.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VECTOR_BACKENDS = ("chroma", "numpy")
+
+_EMBEDDINGS_FILE = "embeddings.npy"
+_RECORDS_FILE = "records.json"
+
+
+class VectorIndex(ABC):
+    """
+    Collection interface used by the optimization components.
+
+    Results use ChromaDB's shapes: ``query`` returns one list per query
+    (``{"ids": [[...]], "distances": [[...]], "metadatas": [[...]], ...}``)
+    and ``get`` returns flat lists.
+    """
+
+    name: str
+    metadata: Dict[str, Any]
+
+    @abstractmethod
+    def add(self, ids: List[str], documents: Optional[List[str]] = None,
+            metadatas: Optional[List[Dict]] = None, embeddings: Optional[Sequence] = None) -> None:
+        """Add entries (existing ids are skipped)."""
+
+    @abstractmethod
+    def upsert(self, ids: List[str], documents: Optional[List[str]] = None,
+               metadatas: Optional[List[Dict]] = None, embeddings: Optional[Sequence] = None) -> None:
+        """Add entries, replacing entries with the same id."""
+
+    @abstractmethod
+    def query(self, query_texts: Optional[List[str]] = None, query_embeddings: Optional[Sequence] = None,
+              n_results: int = 10, include: Optional[List[str]] = None) -> Dict[str, List]:
+        """Return the n_results nearest entries for each query."""
+
+    @abstractmethod
+    def get(self, ids: Optional[List[str]] = None, include: Optional[List[str]] = None,
+            limit: Optional[int] = None) -> Dict[str, List]:
+        """Return entries by id (all entries if ids is None)."""
+
+    @abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        """Delete entries by id."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Return the number of entries."""
+
+
+class _IndexState:
+    """Immutable snapshot of an index; writers replace it, readers never lock."""
+
+    __slots__ = ("ids", "documents", "metadatas", "embeddings", "positions")
+
+    def __init__(self, ids: List[str], documents: List[Optional[str]], metadatas: List[Optional[Dict]],
+                 embeddings: np.ndarray):
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        self.embeddings = embeddings
+        self.positions = {entry_id: i for i, entry_id in enumerate(ids)}
+
+
+def _normalize(vectors) -> np.ndarray:
+    matrix = np.ascontiguousarray(np.asarray(vectors, dtype=np.float32))
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class NumpyVectorIndex(VectorIndex):
+    """
+    Exact vector index over a contiguous float32 matrix of normalized embeddings.
+
+    Thread-safe: writes are serialized and publish a new snapshot; queries
+    read the current snapshot without locking.
+    """
+
+    def __init__(self, name: str, directory: Optional[Path] = None, embedding_function=None,
+                 metadata: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            name: Collection name
+            directory: Storage directory (None keeps the index in memory only)
+            embedding_function: Callable turning a list of texts into embeddings
+            metadata: Collection metadata (e.g., {"hnsw:space": "cosine", "version": "18.0.0"})
+        """
+        self.name = name
+        self.directory = Path(directory) if directory is not None else None
+        self.embedding_function = embedding_function
+        self.metadata: Dict[str, Any] = dict(metadata or {})
+        self._write_lock = threading.Lock()
+        self._state = _IndexState([], [], [], np.zeros((0, 0), dtype=np.float32))
+        if self.directory is not None and (self.directory / _RECORDS_FILE).exists():
+            self._load()
+
+    @property
+    def space(self) -> str:
+        return self.metadata.get("hnsw:space", "l2")
+
+    def _load(self) -> None:
+        records = json.loads((self.directory / _RECORDS_FILE).read_text(encoding="utf-8"))
+        self.metadata = records.get("metadata") or self.metadata
+        embeddings_path = self.directory / _EMBEDDINGS_FILE
+        if records["ids"]:
+            embeddings = np.load(embeddings_path, mmap_mode="r")
+        else:
+            embeddings = np.zeros((0, 0), dtype=np.float32)
+        self._state = _IndexState(records["ids"], records["documents"], records["metadatas"], embeddings)
+        logger.debug(f"Loaded vector index '{self.name}' with {len(records['ids'])} entries")
+
+    def _persist(self, state: _IndexState) -> None:
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to temp files and rename, so a crash never leaves a half-written index
+        fd, embeddings_tmp = tempfile.mkstemp(suffix=".npy", dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, np.asarray(state.embeddings))
+        fd, records_tmp = tempfile.mkstemp(suffix=".json", dir=self.directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"metadata": self.metadata, "ids": state.ids, "documents": state.documents,
+                       "metadatas": state.metadatas}, f)
+        os.replace(embeddings_tmp, self.directory / _EMBEDDINGS_FILE)
+        os.replace(records_tmp, self.directory / _RECORDS_FILE)
+
+    def _embed(self, documents: Optional[List[str]], embeddings: Optional[Sequence], count: int) -> np.ndarray:
+        if embeddings is None:
+            if documents is None or self.embedding_function is None:
+                raise ValueError(f"Index '{self.name}' needs documents and an embedding function or embeddings")
+            embeddings = self.embedding_function(list(documents))
+        matrix = _normalize(embeddings)
+        if len(matrix) != count:
+            raise ValueError(f"Got {len(matrix)} embeddings for {count} ids")
+        return matrix
+
+    def _write(self, ids: List[str], documents: Optional[List[str]], metadatas: Optional[List[Dict]],
+               embeddings: Optional[Sequence], replace: bool) -> None:
+        if not ids:
+            return
+        documents = list(documents) if documents is not None else [None] * len(ids)
+        metadatas = list(metadatas) if metadatas is not None else [None] * len(ids)
+
+        with self._write_lock:
+            state = self._state
+            if not replace:
+                keep = [i for i, entry_id in enumerate(ids) if entry_id not in state.positions]
+                if len(keep) < len(ids):
+                    logger.warning(f"Skipping {len(ids) - len(keep)} existing ids in index '{self.name}'")
+                ids = [ids[i] for i in keep]
+                documents = [documents[i] for i in keep]
+                metadatas = [metadatas[i] for i in keep]
+                if embeddings is not None:
+                    embeddings = [embeddings[i] for i in keep]
+                if not ids:
+                    return
+
+            new_vectors = self._embed(documents, embeddings, len(ids))
+            all_ids, all_documents, all_metadatas = list(state.ids), list(state.documents), list(state.metadatas)
+            matrix = np.array(state.embeddings, dtype=np.float32) if len(state.ids) else np.zeros(
+                (0, new_vectors.shape[1]), dtype=np.float32)
+            appended = []
+            for i, entry_id in enumerate(ids):
+                position = state.positions.get(entry_id)
+                if position is None:
+                    appended.append(i)
+                    all_ids.append(entry_id)
+                    all_documents.append(documents[i])
+                    all_metadatas.append(metadatas[i])
+                else:
+                    matrix[position] = new_vectors[i]
+                    all_documents[position] = documents[i]
+                    all_metadatas[position] = metadatas[i]
+            if appended:
+                matrix = np.concatenate([matrix, new_vectors[appended]])
+
+            new_state = _IndexState(all_ids, all_documents, all_metadatas, np.ascontiguousarray(matrix))
+            self._persist(new_state)
+            self._state = new_state
+
+    def add(self, ids, documents=None, metadatas=None, embeddings=None) -> None:
+        self._write(list(ids), documents, metadatas, embeddings, replace=False)
+
+    def upsert(self, ids, documents=None, metadatas=None, embeddings=None) -> None:
+        self._write(list(ids), documents, metadatas, embeddings, replace=True)
+
+    def delete(self, ids) -> None:
+        with self._write_lock:
+            state = self._state
+            remove = {state.positions[entry_id] for entry_id in ids if entry_id in state.positions}
+            if not remove:
+                return
+            keep = [i for i in range(len(state.ids)) if i not in remove]
+            new_state = _IndexState(
+                [state.ids[i] for i in keep],
+                [state.documents[i] for i in keep],
+                [state.metadatas[i] for i in keep],
+                np.ascontiguousarray(np.asarray(state.embeddings)[keep]) if keep
+                else np.zeros((0, 0), dtype=np.float32),
+            )
+            self._persist(new_state)
+            self._state = new_state
+
+    def count(self) -> int:
+        return len(self._state.ids)
+
+    def _distances(self, scores: np.ndarray) -> np.ndarray:
+        if self.space == "l2":
+            # Squared L2 distance of unit vectors
+            return np.maximum(2.0 - 2.0 * scores, 0.0)
+        return 1.0 - scores
+
+    def query(self, query_texts=None, query_embeddings=None, n_results: int = 10, include=None) -> Dict[str, List]:
+        """
+        Return the nearest entries for each query (batched).
+
+        Args:
+            query_texts: Texts to embed and search for
+            query_embeddings: Precomputed query embeddings (used instead of query_texts)
+            n_results: Number of results per query
+            include: Fields to return besides ids (default: metadatas, documents, distances)
+
+        Returns:
+            ChromaDB-style result with one list per query
+        """
+        include = include or ["metadatas", "documents", "distances"]
+        if query_embeddings is None:
+            if query_texts is None or self.embedding_function is None:
+                raise ValueError("query() needs query_texts with an embedding function, or query_embeddings")
+            query_embeddings = self.embedding_function(list(query_texts))
+        queries = _normalize(query_embeddings)
+        state = self._state
+
+        result: Dict[str, List] = {"ids": []}
+        for field in include:
+            result[field] = []
+        k = min(n_results, len(state.ids))
+        if k == 0:
+            for key in result:
+                result[key] = [[] for _ in range(len(queries))]
+            return result
+
+        scores = queries @ np.asarray(state.embeddings).T
+        # Top-k per row without a full sort, then order the k candidates
+        if k < scores.shape[1]:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.tile(np.arange(scores.shape[1]), (len(queries), 1))
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+        top = np.take_along_axis(candidates, order, axis=1)
+        top_distances = self._distances(np.take_along_axis(candidate_scores, order, axis=1))
+
+        for row, positions in enumerate(top):
+            result["ids"].append([state.ids[i] for i in positions])
+            if "distances" in result:
+                result["distances"].append(top_distances[row].tolist())
+            if "metadatas" in result:
+                result["metadatas"].append([state.metadatas[i] for i in positions])
+            if "documents" in result:
+                result["documents"].append([state.documents[i] for i in positions])
+            if "embeddings" in result:
+                result["embeddings"].append([np.asarray(state.embeddings[i]).tolist() for i in positions])
+        return result
+
+    def get(self, ids=None, include=None, limit: Optional[int] = None) -> Dict[str, List]:
+        include = include or ["metadatas", "documents"]
+        state = self._state
+        if ids is None:
+            positions = list(range(len(state.ids)))
+        else:
+            positions = [state.positions[entry_id] for entry_id in ids if entry_id in state.positions]
+        if limit is not None:
+            positions = positions[:limit]
+
+        result: Dict[str, List] = {"ids": [state.ids[i] for i in positions]}
+        if "metadatas" in include:
+            result["metadatas"] = [state.metadatas[i] for i in positions]
+        if "documents" in include:
+            result["documents"] = [state.documents[i] for i in positions]
+        if "embeddings" in include:
+            result["embeddings"] = [np.asarray(state.embeddings[i]).tolist() for i in positions]
+        return result
+
+    def modify(self, name: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Update the collection metadata (renaming is not supported)."""
+        if name is not None and name != self.name:
+            raise ValueError("NumpyVectorIndex does not support renaming")
+        if metadata is not None:
+            with self._write_lock:
+                self.metadata = dict(metadata)
+                self._persist(self._state)
+
+
+class NumpyVectorClient:
+    """
+    Client with the collection-management subset of the ChromaDB client API,
+    backed by NumpyVectorIndex collections stored under one directory.
+    """
+
+    def __init__(self, persist_directory: str):
+        """
+        Args:
+            persist_directory: Directory holding one subdirectory per collection
+        """
+        self.persist_directory = Path(persist_directory)
+        self._collections: Dict[str, NumpyVectorIndex] = {}
+        self._lock = threading.Lock()
+
+    def _collection_dir(self, name: str) -> Path:
+        if not re.fullmatch(r"[A-Za-z0-9._-]+", name):
+            raise ValueError(f"Invalid collection name: {name!r}")
+        return self.persist_directory / name
+
+    def _exists(self, name: str) -> bool:
+        return name in self._collections or (self._collection_dir(name) / _RECORDS_FILE).exists()
+
+    def get_or_create_collection(self, name: str, embedding_function=None,
+                                 metadata: Optional[Dict[str, Any]] = None) -> NumpyVectorIndex:
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                directory = self._collection_dir(name)
+                exists = (directory / _RECORDS_FILE).exists()
+                collection = NumpyVectorIndex(name, directory, embedding_function, metadata)
+                if not exists:
+                    collection._persist(collection._state)
+                self._collections[name] = collection
+            elif embedding_function is not None:
+                collection.embedding_function = embedding_function
+            return collection
+
+    def get_collection(self, name: str, embedding_function=None) -> NumpyVectorIndex:
+        if not self._exists(name):
+            raise ValueError(f"Collection {name} does not exist.")
+        return self.get_or_create_collection(name, embedding_function)
+
+    def create_collection(self, name: str, embedding_function=None,
+                          metadata: Optional[Dict[str, Any]] = None) -> NumpyVectorIndex:
+        if self._exists(name):
+            raise ValueError(f"Collection {name} already exists.")
+        return self.get_or_create_collection(name, embedding_function, metadata)
+
+    def delete_collection(self, name: str) -> None:
+        with self._lock:
+            directory = self._collection_dir(name)
+            if name not in self._collections and not directory.exists():
+                raise ValueError(f"Collection {name} does not exist.")
+            self._collections.pop(name, None)
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def list_collections(self) -> List[str]:
+        if not self.persist_directory.is_dir():
+            return sorted(self._collections)
+        on_disk = {p.parent.name for p in self.persist_directory.glob(f"*/{_RECORDS_FILE}")}
+        return sorted(on_disk | set(self._collections))
+
+
+def create_vector_client(persist_directory: str, backend: str = "chroma"):
+    """
+    Create the vector store client of the configured backend.
+
+    Args:
+        persist_directory: Storage directory (the numpy backend uses a "numpy" subdirectory)
+        backend: "chroma" or "numpy"
+    """
+    if backend == "numpy":
+        return NumpyVectorClient(os.path.join(persist_directory, "numpy"))
+    if backend == "chroma":
+        from .chroma_store import create_chroma_client
+        return create_chroma_client(persist_directory)
+    raise ValueError(f"Unknown vector backend: {backend}. Use one of {VECTOR_BACKENDS}")
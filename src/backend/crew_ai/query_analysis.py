@@ -0,0 +1,102 @@
+"""
+Per-request analysis of the user's query.
+
+Several consumers need the same facts about a query: the target URL (metrics,
+planning), its embedding, the keywords predicted from similar past queries
+and the action categories used for context pruning. ``QueryAnalysis`` holds
+them so they are computed once per workflow and read by every agent, instead
+of each agent context re-embedding and re-querying ChromaDB.
+
+The URL fields are filled by ``QueryAnalysis.from_query``. The embedding,
+predictions and categories are filled by
+``SmartKeywordProvider.analyze_query`` when the optimization system is enabled.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Returned by extract_url_from_query when the query names no website
+URL_PLACEHOLDER = "website mentioned in query"
+
+
+def extract_url_from_query(query: str) -> str:
+    """
+    Dynamically extract URL from user query using regex patterns.
+    Returns the URL if found, otherwise returns a generic placeholder.
+    """
+    # Pattern 1: Full URLs with protocol (http:// or https://)
+    url_pattern = r'https?://[^\s]+'
+    match = re.search(url_pattern, query, re.IGNORECASE)
+    if match:
+        url = match.group(0).rstrip('.,;!?')  # Remove trailing punctuation
+        logger.info(f"Extracted full URL from query: {url}")
+        return url
+
+    # Pattern 2: Domain names with common TLDs (www.example.com, example.in, etc.)
+    domain_pattern = r'\b(?:www\.)?([a-zA-Z0-9-]+\.(?:com|in|org|net|co|io|ai|app|dev|tech))\b'
+    match = re.search(domain_pattern, query, re.IGNORECASE)
+    if match:
+        domain = match.group(0)
+        # Add https:// if not present
+        url = f"https://{domain}" if not domain.startswith('http') else domain
+        logger.info(f"Extracted domain from query and constructed URL: {url}")
+        return url
+
+    # Pattern 3: Website names without TLD (e.g., "on flipkart", "amazon", "google")
+    # Try to extract potential website name and construct URL
+    website_pattern = r'\b(?:on|from|at|in|visit|go to|open)\s+([a-zA-Z0-9]+)\b'
+    match = re.search(website_pattern, query, re.IGNORECASE)
+    if match:
+        website_name = match.group(1).lower()
+        # Common TLD is .com, user can be more specific if needed
+        url = f"https://www.{website_name}.com"
+        logger.info(
+            f"Inferred website name '{website_name}' and constructed URL: {url}")
+        return url
+
+    # If no URL found, return placeholder - let the popup analyzer handle it
+    logger.warning("No URL found in query, returning placeholder")
+    return URL_PLACEHOLDER
+
+
+@dataclass
+class QueryAnalysis:
+    """Facts about one user query, shared by all agents of a workflow."""
+
+    query: str
+    normalized_query: str
+    url: str
+    domain: Optional[str] = None
+    # Embedding of normalized_query (None until analyzed or if embedding failed)
+    embedding: Optional[Any] = None
+    # Keywords used by similar past queries (empty if none were similar enough)
+    predicted_keywords: List[str] = field(default_factory=list)
+    # Action categories for context pruning (None when pruning did not run)
+    categories: Optional[List[str]] = None
+    # Whether SmartKeywordProvider.analyze_query has run
+    analyzed: bool = False
+
+    @classmethod
+    def from_query(cls, query: str) -> "QueryAnalysis":
+        """
+        Create the analysis of a query with its normalized text, URL and domain.
+
+        Args:
+            query: User's natural language query
+
+        Returns:
+            QueryAnalysis without embedding, predictions or categories
+        """
+        url = extract_url_from_query(query)
+        domain = urlparse(url).hostname if url != URL_PLACEHOLDER else None
+        return cls(
+            query=query,
+            normalized_query=" ".join(query.split()),
+            url=url,
+            domain=domain,
+        )
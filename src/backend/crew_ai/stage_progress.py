@@ -0,0 +1,177 @@
+"""
+Real per-stage progress for the sequential test generation crew.
+
+CrewAI runs the four tasks (plan, identify, assemble, validate) inside a
+single blocking ``crew.kickoff()``. This module hooks the crew's
+``task_callback`` and ``step_callback`` so the caller receives events while
+the crew runs:
+
+- ``stage_start`` / ``stage_end`` for every agent stage, with the stage's
+  wall time and LLM token count (delta of the crew usage metrics)
+- ``plan`` with the planner's step list as soon as the planner finishes
+- ``step`` whenever an agent invokes a tool
+
+Tasks run sequentially, so the end of one stage is the start of the next.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.backend.config.logging_config import EMOJI
+from src.backend.core.workflow_metrics import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# (stage key, progress message, progress at start, progress at end), in task order
+GENERATION_STAGES = [
+    ("planner", f"{EMOJI['ai']} Planning test steps...", 10, 25),
+    ("identifier", f"{EMOJI['search']} Identifying page elements...", 25, 50),
+    ("assembler", f"{EMOJI['code']} Generating test code...", 50, 75),
+    ("validator", f"{EMOJI['validate']} Validating code...", 75, 90),
+]
+
+
+class GenerationCancelledError(RuntimeError):
+    """Raised inside the crew run to abort a generation nobody is waiting for anymore."""
+
+
+class StageProgressTracker:
+    """
+    Turns CrewAI task/step callbacks into stage progress events.
+
+    Events are passed to ``sink`` on the crew's worker thread. If
+    ``cancel_event`` is set, the next step or task boundary raises
+    GenerationCancelledError, which aborts ``crew.kickoff()``.
+    """
+
+    def __init__(self, sink: Callable[[Dict[str, Any]], None],
+                 cancel_event: Optional[threading.Event] = None):
+        """
+        Args:
+            sink: Callback receiving each progress event
+            cancel_event: Event that requests the crew run to stop early
+        """
+        self.sink = sink
+        self.cancel_event = cancel_event
+        self.crew = None
+        self._stage_index = -1
+        self._stage_started = 0.0
+        self._stage_tokens_before = 0
+
+    def bind(self, crew) -> None:
+        """Attach the crew whose usage metrics provide per-stage token counts."""
+        self.crew = crew
+
+    def start(self) -> None:
+        """Emit the start of the first stage (call right before ``crew.kickoff()``)."""
+        self._start_stage(0)
+
+    def on_step(self, step_output: Any) -> None:
+        """CrewAI ``step_callback``: report tool use of the current stage."""
+        self._check_cancelled()
+        tool = getattr(step_output, "tool", None)
+        if not tool or not 0 <= self._stage_index < len(GENERATION_STAGES):
+            return
+        stage = GENERATION_STAGES[self._stage_index][0]
+        self._emit({
+            "status": "running",
+            "message": f"🔧 {stage.capitalize()} is using {tool}",
+            "progress": GENERATION_STAGES[self._stage_index][2],
+            "agent_stage": stage,
+            "stage_event": "step",
+            "tool": tool,
+        })
+
+    def on_task_complete(self, task_output: Any) -> None:
+        """CrewAI ``task_callback``: finish the current stage and start the next one."""
+        index = self._stage_index
+        if not 0 <= index < len(GENERATION_STAGES):
+            return
+        stage, _, _, end_progress = GENERATION_STAGES[index]
+        duration = round(time.monotonic() - self._stage_started, 2)
+        total_tokens = self._total_tokens()
+        tokens = max(0, total_tokens - self._stage_tokens_before) if total_tokens is not None else None
+        raw_output = getattr(task_output, "raw", "") or ""
+
+        logger.info(f"⏱️ Stage '{stage}' finished in {duration}s ({tokens} tokens)")
+        self._emit({
+            "status": "running",
+            "message": f"{EMOJI['success']} {stage.capitalize()} finished in {duration}s",
+            "progress": end_progress,
+            "agent_stage": stage,
+            "stage_event": "end",
+            "duration_seconds": duration,
+            "tokens": tokens,
+            "output_tokens": count_tokens(raw_output) if isinstance(raw_output, str) else 0,
+        })
+
+        if stage == "planner":
+            steps = extract_planned_steps(task_output)
+            if steps is not None:
+                self._emit({
+                    "status": "running",
+                    "message": f"📋 Planned {len(steps)} test steps",
+                    "progress": end_progress,
+                    "agent_stage": stage,
+                    "stage_event": "plan",
+                    "steps": steps,
+                })
+
+        self._check_cancelled()
+        if index + 1 < len(GENERATION_STAGES):
+            self._start_stage(index + 1)
+        else:
+            self._stage_index = len(GENERATION_STAGES)
+
+    def _start_stage(self, index: int) -> None:
+        self._stage_index = index
+        self._stage_started = time.monotonic()
+        total_tokens = self._total_tokens()
+        self._stage_tokens_before = total_tokens or 0
+        stage, message, start_progress, _ = GENERATION_STAGES[index]
+        self._emit({
+            "status": "running",
+            "message": message,
+            "progress": start_progress,
+            "agent_stage": stage,
+            "stage_event": "start",
+        })
+
+    def _total_tokens(self) -> Optional[int]:
+        if self.crew is None:
+            return None
+        try:
+            return self.crew.calculate_usage_metrics().total_tokens
+        except Exception as e:
+            logger.debug(f"Could not read crew usage metrics: {e}")
+            return None
+
+    def _check_cancelled(self) -> None:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise GenerationCancelledError("Generation cancelled: no client is waiting for the result.")
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        try:
+            self.sink(event)
+        except Exception as e:
+            logger.warning(f"⚠️ Progress sink failed: {e}")
+
+
+def extract_planned_steps(task_output: Any) -> Optional[List[Dict[str, Any]]]:
+    """Return the planner's steps as plain dictionaries, or None if the output cannot be read."""
+    pydantic_output = getattr(task_output, "pydantic", None)
+    if pydantic_output is not None and hasattr(pydantic_output, "steps"):
+        return [step.model_dump() for step in pydantic_output.steps]
+
+    json_output = getattr(task_output, "json_dict", None)
+    if not json_output:
+        try:
+            json_output = json.loads(getattr(task_output, "raw", "") or "")
+        except (json.JSONDecodeError, TypeError):
+            return None
+    if isinstance(json_output, dict) and isinstance(json_output.get("steps"), list):
+        return json_output["steps"]
+    return None
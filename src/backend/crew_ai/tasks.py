@@ -1,7 +1,9 @@
 from crewai import Task
 import logging
+import threading
+from dataclasses import dataclass
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 # Import reusable prompt components
 from .prompts import PromptComponents
@@ -64,6 +66,24 @@ class AssemblyOutput(BaseModel):
         default=None, description="Any warnings generated during code assembly")
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# LIBRARY-SPECIFIC PROMPT FRAGMENTS (RENDERED ONCE PER LIBRARY)
+# ═══════════════════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class TaskPromptFragments:
+    """Library-specific parts of the task descriptions."""
+    keyword_guidelines: str
+    code_structure: str
+    browser_init: str
+    viewport: str
+
+
+# Rendered fragments by library name (None = no library context)
+_prompt_fragments: Dict[Optional[str], TaskPromptFragments] = {}
+_prompt_fragments_lock = threading.Lock()
+
+
 class RobotTasks:
     def __init__(self, library_context=None, workflow_id: str = ""):
         """
@@ -76,12 +96,30 @@ class RobotTasks:
         self.library_context = library_context
         self.workflow_id = workflow_id
         
-        # Cache static context - computed once on initialization
-        # These values depend on library_context which is set at init time
-        self._cached_keyword_guidelines = self._get_keyword_guidelines()
-        self._cached_code_structure = self._get_code_structure_template()
-        self._cached_browser_init = self._get_browser_init_instructions()
-        self._cached_viewport = self._get_viewport_instructions()
+        # Static context depends only on the library, so it is rendered once
+        # per library and shared by all requests
+        fragments = self._get_prompt_fragments()
+        self._cached_keyword_guidelines = fragments.keyword_guidelines
+        self._cached_code_structure = fragments.code_structure
+        self._cached_browser_init = fragments.browser_init
+        self._cached_viewport = fragments.viewport
+
+    def _get_prompt_fragments(self) -> TaskPromptFragments:
+        """Get the rendered prompt fragments of this library, rendering them on first use."""
+        key = self.library_context.library_name if self.library_context else None
+        fragments = _prompt_fragments.get(key)
+        if fragments is None:
+            with _prompt_fragments_lock:
+                fragments = _prompt_fragments.get(key)
+                if fragments is None:
+                    fragments = TaskPromptFragments(
+                        keyword_guidelines=self._get_keyword_guidelines(),
+                        code_structure=self._get_code_structure_template(),
+                        browser_init=self._get_browser_init_instructions(),
+                        viewport=self._get_viewport_instructions(),
+                    )
+                    _prompt_fragments[key] = fragments
+        return fragments
 
     def _get_keyword_guidelines(self) -> str:
         """Get MINIMAL keyword guidelines for planning phase."""
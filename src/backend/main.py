@@ -1,5 +1,6 @@
 import os
 import sys
+import asyncio
 import logging
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
@@ -62,8 +63,30 @@ app.mount("/", StaticFiles(directory=FRONTEND_DIR, html=True), name="static")
 
 @app.on_event("startup")
 async def startup_event():
+    from src.backend.core.config import settings
+    if settings.STARTUP_WARMUP_ENABLED:
+        # Runs in the background; /ready reports 503 until it has finished
+        from src.backend.services.warmup_service import schedule_startup_warmup
+        app.state.warmup_task = schedule_startup_warmup()
     logging.info("Application startup complete.")
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    from src.backend.services.generation_executor import get_generation_executor
+    from src.backend.services.docker_service import shutdown_docker_executor
+    from src.backend.services.batch_execution_service import shutdown_shard_executor
+    from src.backend.services.runner_pool import shutdown_runner_pool
+    from src.backend.services.learning_queue import shutdown_learning_queue
+    from src.backend.core.config import settings
+    warmup_task = getattr(app.state, "warmup_task", None)
+    if warmup_task is not None:
+        warmup_task.cancel()
+    get_generation_executor().shutdown(wait=False)
+    shutdown_docker_executor(wait=False)
+    shutdown_shard_executor(wait=False)
+    shutdown_runner_pool()
+    # Store patterns from passed tests that are still queued
+    await asyncio.get_running_loop().run_in_executor(
+        None, shutdown_learning_queue, settings.OPTIMIZATION_LEARNING_SHUTDOWN_TIMEOUT
+    )
     logging.info("Application shutdown complete.")
@@ -0,0 +1,77 @@
+"""
+Robot Framework listener (API v3) that writes live execution events.
+
+This file runs inside the runner container, so it must only depend on the
+standard library and Robot Framework. Each event is appended to a JSON-lines
+file and flushed immediately so the backend can tail it while tests run:
+
+    {"type": "test_end", "name": "Login Works", "status": "FAIL", "elapsed": 3.2, "message": "..."}
+
+Usage:
+    robot --listener LiveEventsListener.py:/app/robot_tests/<run_id>/events.jsonl:2 tests.robot
+
+Arguments:
+    events_path: File to append events to
+    max_keyword_depth: Deepest keyword nesting level to report (0 = tests only)
+"""
+
+import json
+import time
+
+
+class LiveEventsListener:
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, events_path, max_keyword_depth=2):
+        self._file = open(events_path, "a", encoding="utf-8")
+        self._max_depth = int(max_keyword_depth)
+        self._depth = 0
+
+    def start_suite(self, data, result):
+        self._write("suite_start", name=result.name, tests=data.test_count)
+
+    def end_suite(self, data, result):
+        self._write("suite_end", name=result.name, status=result.status,
+                    elapsed=_elapsed(result), message=_message(result))
+
+    def start_test(self, data, result):
+        self._depth = 0
+        self._write("test_start", name=result.name)
+
+    def end_test(self, data, result):
+        self._write("test_end", name=result.name, status=result.status,
+                    elapsed=_elapsed(result), message=_message(result))
+
+    # Keyword methods are only called by Robot Framework 7.0+
+    def start_keyword(self, data, result):
+        self._depth += 1
+        if self._depth <= self._max_depth:
+            self._write("keyword_start", name=result.name, depth=self._depth)
+
+    def end_keyword(self, data, result):
+        if self._depth <= self._max_depth:
+            self._write("keyword_end", name=result.name, depth=self._depth,
+                        status=result.status, elapsed=_elapsed(result))
+        self._depth -= 1
+
+    def close(self):
+        self._file.close()
+
+    def _write(self, event_type, **fields):
+        event = {"type": event_type, "ts": round(time.time(), 3)}
+        event.update((key, value) for key, value in fields.items() if value not in (None, ""))
+        self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+
+def _elapsed(result):
+    """Elapsed seconds (RF 7 exposes a timedelta, older versions milliseconds)."""
+    elapsed = getattr(result, "elapsed_time", None)
+    if elapsed is not None:
+        return round(elapsed.total_seconds(), 3)
+    return round(getattr(result, "elapsedtime", 0) / 1000.0, 3)
+
+
+def _message(result):
+    message = getattr(result, "message", "") or ""
+    return message[:500]
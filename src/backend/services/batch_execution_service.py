@@ -0,0 +1,365 @@
+"""
+Parallel sharded execution of Robot Framework suites.
+
+A single ``/execute-test`` run executes one ``test.robot`` in one container,
+which makes regression runs of many generated tests strictly sequential.
+This module runs a batch of suites pabot-style:
+
+- All suites of a batch are written to ``robot_tests/<run_id>/suites/``
+- The batch is split by suite (file) or by individual test into N shards
+- Shards run concurrently, each in its own runner container, with
+  ``--log NONE --report NONE`` so only ``output.xml`` is produced
+- Shard outputs are merged with ``rebot --merge`` into a single
+  ``output.xml``/``log.html``/``report.html`` under ``/reports/<run_id>/``
+
+Every shard runs the same ``suites`` directory as its data source and selects
+its share with ``--suite``/``--test``, so all shard outputs have the same
+suite tree and rebot reassembles the original structure. Suite names must
+therefore be unique within a batch (see ``find_duplicate_suite_names``).
+
+Shards and the merge run on their own executor, so a batch never occupies
+the Docker executor that serves ``/execute-test`` and status checks.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Tuple
+
+from src.backend.services.docker_service import (
+    ROBOT_TESTS_DIR, build_image, execute_robot_command, get_docker_client, run_in_docker_executor
+)
+from src.backend.services.robot_output_parser import parse_output_xml
+
+logger = logging.getLogger(__name__)
+
+SPLIT_BY_SUITE = "suite"
+SPLIT_BY_TEST = "test"
+
+SUITES_DIRNAME = "suites"
+SHARDS_DIRNAME = "shards"
+
+# Robot exit codes above this value mean the run itself failed (invalid data,
+# interrupted, internal error) rather than "N tests failed"
+_ROBOT_MAX_FAILURE_RC = 250
+
+
+def _safe_filename(name: str, index: int) -> str:
+    """Turn a client-provided suite name into a unique ``.robot`` filename."""
+    stem = os.path.splitext(os.path.basename(name or ""))[0]
+    stem = re.sub(r"[^A-Za-z0-9 _-]+", "_", stem).strip() or f"suite_{index + 1}"
+    # Numeric prefix keeps client order (robot sorts files) and avoids collisions;
+    # robot strips "NN__" prefixes from suite names
+    return f"{index + 1:03d}__{stem}.robot"
+
+
+def suite_name_key(name: str, index: int = 0) -> str:
+    """
+    Key under which robot matches the suite created from a client suite name.
+
+    Mirrors how robot names a suite after its file (``NNN__`` prefix removed,
+    underscores as spaces, all-lowercase names title-cased) and how
+    ``--suite`` compares names (case, space and underscore insensitive).
+    """
+    stem = os.path.splitext(_safe_filename(name, index))[0].split("__", 1)[-1]
+    return re.sub(r"[\s_]+", "", stem).lower()
+
+
+def find_duplicate_suite_names(suites: List[Tuple[str, str]]) -> List[str]:
+    """
+    Return client suite names that robot would give the same suite name.
+
+    Such suites would be selected by several shards and merged twice, so a
+    batch containing them is rejected.
+    """
+    seen: Dict[str, str] = {}
+    duplicates = []
+    for index, (name, _) in enumerate(suites):
+        key = suite_name_key(name, index)
+        if key in seen:
+            duplicates.append(name)
+        else:
+            seen[key] = name
+    return duplicates
+
+
+def _escape_pattern(name: str) -> str:
+    """Escape robot's glob characters so --suite/--test match a name literally."""
+    return re.sub(r"([*?\[])", r"[\1]", name)
+
+
+def write_batch_suites(run_id: str, suites: List[Tuple[str, str]]) -> str:
+    """
+    Write the batch's suite files to ``robot_tests/<run_id>/suites``.
+
+    Args:
+        run_id: Batch run identifier
+        suites: List of (name, robot_code) tuples
+
+    Returns:
+        Host path of the suites directory
+    """
+    suites_dir = os.path.join(ROBOT_TESTS_DIR, run_id, SUITES_DIRNAME)
+    os.makedirs(suites_dir, exist_ok=True)
+    for index, (name, robot_code) in enumerate(suites):
+        with open(os.path.join(suites_dir, _safe_filename(name, index)), "w", encoding="utf-8") as f:
+            f.write(robot_code)
+    return suites_dir
+
+
+def discover_units(suites_dir: str, split_by: str) -> List[str]:
+    """
+    Parse the batch and return the selection units to distribute across shards.
+
+    Args:
+        suites_dir: Host path of the batch suites directory
+        split_by: SPLIT_BY_SUITE or SPLIT_BY_TEST
+
+    Returns:
+        Robot command-line selector arguments, one entry per unit
+        (e.g. ``--suite=Suites.Login`` or ``--test=Suites.Login.Valid Login``)
+    """
+    from robot.api import TestSuiteBuilder
+
+    top = TestSuiteBuilder().build(suites_dir)
+
+    def full_name(item) -> str:
+        # RF 7 renamed ``longname`` to ``full_name``
+        return getattr(item, "full_name", None) or item.longname
+
+    if split_by == SPLIT_BY_TEST:
+        return [f"--test={_escape_pattern(full_name(test))}" for test in top.all_tests]
+
+    units = []
+    for suite in top.suites:
+        if suite.test_count:
+            units.append(f"--suite={_escape_pattern(full_name(suite))}")
+    # A directory with a single file still produces a child suite; tests placed
+    # directly on the top suite cannot happen for a directory source
+    return units
+
+
+def plan_shards(units: List[str], shard_count: int) -> List[List[str]]:
+    """
+    Split units into at most ``shard_count`` contiguous, evenly sized shards.
+
+    Contiguous chunks keep tests of the same suite together, so suite setups
+    run as few times as possible.
+    """
+    shard_count = max(1, min(shard_count, len(units)))
+    base, extra = divmod(len(units), shard_count)
+    shards, start = [], 0
+    for i in range(shard_count):
+        size = base + (1 if i < extra else 0)
+        shards.append(units[start:start + size])
+        start += size
+    return shards
+
+
+# Executor for shard runs and merges, separate from the Docker executor
+_shard_executor: Optional[ThreadPoolExecutor] = None
+_shard_executor_lock = threading.Lock()
+
+
+def get_shard_executor() -> ThreadPoolExecutor:
+    """Get the executor running batch shards (EXECUTION_BATCH_MAX_SHARDS workers)."""
+    global _shard_executor
+    if _shard_executor is None:
+        with _shard_executor_lock:
+            if _shard_executor is None:
+                from src.backend.core.config import settings
+                _shard_executor = ThreadPoolExecutor(
+                    max_workers=settings.EXECUTION_BATCH_MAX_SHARDS,
+                    thread_name_prefix="batch-shard"
+                )
+    return _shard_executor
+
+
+async def run_in_shard_executor(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking shard or merge step in the shard executor and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_shard_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_shard_executor(wait: bool = False) -> None:
+    """Shut down the shard executor (called on application shutdown)."""
+    global _shard_executor
+    with _shard_executor_lock:
+        if _shard_executor is not None:
+            _shard_executor.shutdown(wait=wait, cancel_futures=True)
+            _shard_executor = None
+
+
+def run_shard(run_id: str, index: int, selectors: List[str]) -> Dict[str, Any]:
+    """
+    Execute one shard in a runner container (blocking; run on the shard executor).
+
+    Returns:
+        Dictionary with shard index, exit code, duration and host output.xml path
+    """
+    container_dir = f"/app/robot_tests/{run_id}"
+    robot_command = [
+        "robot",
+        "--outputdir", f"{container_dir}/{SHARDS_DIRNAME}/{index}",
+        "--output", "output.xml",
+        "--log", "NONE",
+        "--report", "NONE",
+        *selectors,
+        f"{container_dir}/{SUITES_DIRNAME}",
+    ]
+    started = time.monotonic()
+    client = get_docker_client()
+    exit_code = execute_robot_command(client, robot_command, f"robot-test-{run_id}-shard{index}")
+    output_xml = os.path.join(ROBOT_TESTS_DIR, run_id, SHARDS_DIRNAME, str(index), "output.xml")
+    return {
+        "shard": index,
+        "units": len(selectors),
+        "exit_code": exit_code,
+        "duration_seconds": round(time.monotonic() - started, 2),
+        "output_xml": output_xml if os.path.exists(output_xml) else None,
+    }
+
+
+def merge_shard_outputs(run_id: str, shard_results: List[Dict[str, Any]]) -> int:
+    """
+    Merge shard outputs with ``rebot --merge`` into ``robot_tests/<run_id>``.
+
+    Rebot runs inside the runner image so the merge uses the same Robot
+    Framework version that produced the outputs.
+
+    Returns:
+        Rebot exit code
+    """
+    container_dir = f"/app/robot_tests/{run_id}"
+    outputs = [f"{container_dir}/{SHARDS_DIRNAME}/{r['shard']}/output.xml"
+               for r in sorted(shard_results, key=lambda r: r["shard"]) if r["output_xml"]]
+    if not outputs:
+        raise RuntimeError("No shard produced an output.xml; nothing to merge.")
+
+    rebot_command = [
+        "rebot",
+        "--merge",
+        "--outputdir", container_dir,
+        "--output", "output.xml",
+        "--log", "log.html",
+        "--report", "report.html",
+        *outputs,
+    ]
+    client = get_docker_client()
+    return execute_robot_command(client, rebot_command, f"robot-test-{run_id}-merge")
+
+
+def read_statistics(output_xml_path: str) -> Optional[Dict[str, int]]:
+    """Read total pass/fail/skip counts from a merged output.xml."""
+    try:
+        return parse_output_xml(output_xml_path).statistics
+    except (ET.ParseError, OSError) as e:
+        logger.error(f"❌ BATCH: Failed to parse {output_xml_path}: {e}")
+        return None
+
+
+def _event(status: str, message: str, **extra) -> str:
+    return f"data: {json.dumps({'stage': 'execution', 'status': status, 'message': message, **extra})}\n\n"
+
+
+async def stream_batch_execution(run_id: str, suites: List[Tuple[str, str]], split_by: str,
+                                 shard_count: int) -> AsyncGenerator[str, None]:
+    """
+    Run a batch of suites in parallel shards and yield SSE frames with progress.
+
+    Args:
+        run_id: Batch run identifier (reports are served from /reports/<run_id>/)
+        suites: List of (name, robot_code) tuples
+        split_by: SPLIT_BY_SUITE or SPLIT_BY_TEST
+        shard_count: Maximum number of concurrent shards
+    """
+    loop = asyncio.get_running_loop()
+    batch_started = time.monotonic()
+
+    try:
+        suites_dir = await loop.run_in_executor(None, write_batch_suites, run_id, suites)
+        units = await loop.run_in_executor(None, discover_units, suites_dir, split_by)
+    except Exception as e:
+        logger.error(f"❌ BATCH: Failed to prepare batch {run_id}: {e}")
+        yield _event('error', f"Failed to prepare batch: {e}")
+        return
+
+    if not units:
+        yield _event('error', "The batch does not contain any test cases.")
+        return
+
+    shards = plan_shards(units, shard_count)
+    logger.info(f"🧩 BATCH: {run_id}: {len(units)} {split_by} units across {len(shards)} shards")
+    yield _event('running', f"Running {len(units)} {split_by}s in {len(shards)} parallel shards...",
+                 run_id=run_id, shards=len(shards))
+
+    try:
+        client = await run_in_docker_executor(get_docker_client)
+        for event in await run_in_docker_executor(lambda: list(build_image(client))):
+            yield f"data: {json.dumps({'stage': 'execution', **event})}\n\n"
+    except Exception as e:
+        logger.error(f"❌ BATCH: Docker unavailable for batch {run_id}: {e}")
+        yield _event('error', str(e))
+        return
+
+    tasks = [asyncio.ensure_future(run_in_shard_executor(run_shard, run_id, index, selectors))
+             for index, selectors in enumerate(shards)]
+    shard_results: List[Dict[str, Any]] = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                result = await next_done
+            except Exception as e:
+                logger.error(f"❌ BATCH: Shard failed in batch {run_id}: {e}")
+                yield _event('running', f"A shard failed to run: {e}")
+                continue
+            shard_results.append(result)
+            yield _event('running',
+                         f"Shard {result['shard'] + 1}/{len(shards)} finished in "
+                         f"{result['duration_seconds']}s (exit code {result['exit_code']})",
+                         shard=result['shard'], shards_done=len(shard_results))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    errored = [r for r in shard_results if r["exit_code"] > _ROBOT_MAX_FAILURE_RC or not r["output_xml"]]
+    for result in errored:
+        logger.warning(f"⚠️ BATCH: Shard {result['shard']} did not finish cleanly "
+                       f"(exit code {result['exit_code']})")
+
+    yield _event('running', "Merging shard results into a single report...")
+    try:
+        await run_in_shard_executor(merge_shard_outputs, run_id, shard_results)
+    except Exception as e:
+        logger.error(f"❌ BATCH: Failed to merge results of batch {run_id}: {e}")
+        yield _event('error', f"Failed to merge shard results: {e}")
+        return
+
+    statistics = read_statistics(os.path.join(ROBOT_TESTS_DIR, run_id, "output.xml"))
+    wall_clock = round(time.monotonic() - batch_started, 2)
+    shard_summary = [{k: r[k] for k in ("shard", "units", "exit_code", "duration_seconds")}
+                     for r in sorted(shard_results, key=lambda r: r["shard"])]
+    passed = (statistics is not None and statistics["fail"] == 0
+              and not errored and len(shard_results) == len(shards))
+    if statistics:
+        message = (f"Batch finished: {statistics['pass']} passed, {statistics['fail']} failed, "
+                   f"{statistics['skip']} skipped in {wall_clock}s.")
+    else:
+        message = f"Batch finished in {wall_clock}s, but the merged statistics could not be read."
+    logger.info(f"🏁 BATCH: {run_id}: {message}")
+
+    yield _event('complete', message, test_status="passed" if passed else "failed", result={
+        'run_id': run_id,
+        'statistics': statistics,
+        'shards': shard_summary,
+        'wall_clock_seconds': wall_clock,
+        'log_html': f"/reports/{run_id}/log.html",
+        'report_html': f"/reports/{run_id}/report.html",
+    })
@@ -1,9 +1,18 @@
 import os
-import docker
+import asyncio
+import functools
 import logging
+import threading
 import traceback
-import xml.etree.ElementTree as ET
-from typing import Generator, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Generator, Dict, Any, Callable, List, Optional
+
+from src.backend.services.robot_output_parser import RobotOutputSummary, parse_output_xml
+
+# The Docker SDK is imported inside the functions that use it, so importing this
+# module (and the API) does not pay for it
+if TYPE_CHECKING:
+    import docker
 
 IMAGE_TAG = "robot-test-runner:latest"
 # Default remote image - can be overridden by REMOTE_DOCKER_IMAGE env var
@@ -59,30 +68,102 @@ class ContainerLogsInterceptor:
         return getattr(self._container, name)
 
 
-def get_docker_client():
+# Dedicated executor for blocking Docker SDK calls (image checks, builds, container.wait()).
+# Keeping these off the event loop lets uvicorn serve other requests while tests run.
+_docker_executor: Optional[ThreadPoolExecutor] = None
+_docker_executor_lock = threading.Lock()
+
+
+def get_docker_executor() -> ThreadPoolExecutor:
+    """Get the global executor used for blocking Docker operations."""
+    global _docker_executor
+    if _docker_executor is None:
+        with _docker_executor_lock:
+            if _docker_executor is None:
+                from src.backend.core.config import settings
+                _docker_executor = ThreadPoolExecutor(
+                    max_workers=settings.EXECUTION_MAX_WORKERS,
+                    thread_name_prefix="docker"
+                )
+                logging.info(
+                    f"🐳 DOCKER SERVICE: Execution executor started with {settings.EXECUTION_MAX_WORKERS} workers")
+    return _docker_executor
+
+
+async def run_in_docker_executor(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking Docker SDK call in the Docker executor and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_docker_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_docker_executor(wait: bool = False) -> None:
+    """Shut down the Docker executor (called on application shutdown)."""
+    global _docker_executor
+    with _docker_executor_lock:
+        if _docker_executor is not None:
+            _docker_executor.shutdown(wait=wait, cancel_futures=True)
+            _docker_executor = None
+
+
+# Cached Docker client and image presence (avoid a ping and image lookup on every run)
+_docker_client: Optional["docker.DockerClient"] = None
+_image_verified = False
+
+
+def get_docker_client(ping: bool = False):
+    """
+    Get the shared Docker client, connecting (and pinging) on first use.
+
+    Args:
+        ping: Also ping an already-cached client (used by status checks)
+    """
+    import docker
+
+    global _docker_client
+    if _docker_client is not None and not ping:
+        return _docker_client
+
     log_docker_operation("get_docker_client",
                          "Attempting to connect to Docker")
     try:
-        client = docker.from_env()
+        client = _docker_client or docker.from_env()
         client.ping()
         log_docker_operation("get_docker_client",
                              "Successfully connected to Docker")
+        _docker_client = client
         return client
     except docker.errors.DockerException as e:
+        reset_docker_client()
         log_docker_operation("get_docker_client",
                              f"Docker connection failed: {e}", "error")
         raise ConnectionError(
             f"Docker is not available. Please ensure Docker Desktop is installed and running. Details: {e}")
 
 
-def build_image(client: docker.DockerClient) -> Generator[Dict[str, Any], None, None]:
+def reset_docker_client() -> None:
+    """Drop the cached Docker client and image state so the next call reconnects."""
+    global _docker_client, _image_verified
+    _docker_client = None
+    _image_verified = False
+
+
+def build_image(client: "docker.DockerClient") -> Generator[Dict[str, Any], None, None]:
     """
     Ensure the Docker image is available for test execution.
     Tries to pull from Docker Hub first, falls back to local build if needed.
+    Image presence is cached after the first successful check.
     """
+    import docker
+
+    global _image_verified
+    if _image_verified:
+        yield {"status": "running", "message": "Using existing container image for test execution..."}
+        return
+
     try:
         # Check if image already exists locally
         client.images.get(IMAGE_TAG)
+        _image_verified = True
         logging.info(
             f"Docker image '{IMAGE_TAG}' already exists. Skipping build.")
         yield {"status": "running", "message": "Using existing container image for test execution..."}
@@ -112,6 +193,7 @@ def build_image(client: docker.DockerClient) -> Generator[Dict[str, Any], None,
                 # Tag the pulled image with our local tag
                 remote_image = client.images.get(REMOTE_IMAGE)
                 remote_image.tag(IMAGE_TAG)
+                _image_verified = True
                 logging.info(f"✅ Successfully pulled and tagged image from Docker Hub as '{IMAGE_TAG}'")
                 yield {"status": "running", "message": "Pre-built image downloaded successfully!"}
                 return
@@ -144,89 +226,150 @@ def build_image(client: docker.DockerClient) -> Generator[Dict[str, Any], None,
                     raise docker.errors.BuildError(
                         log['error'], build_log=build_logs)
             logging.info(f"Successfully built Docker image '{IMAGE_TAG}'.")
+            _image_verified = True
             yield {"status": "running", "message": "Container image built successfully!"}
         except docker.errors.BuildError as e:
             logging.error(f"Failed to build Docker image: {e}")
             raise
 
 
-def run_test_in_container(client: docker.DockerClient, run_id: str, test_filename: str) -> Dict[str, Any]:
-    container = None
-    logging.info(
-        f"🚀 DOCKER SERVICE: Starting test execution for run_id={run_id}, test_filename={test_filename}")
+def execute_robot_command(client: "docker.DockerClient", robot_command: List[str], container_name: str) -> int:
+    """
+    Run a robot/rebot command in a warm pooled runner or an ephemeral container.
+
+    Args:
+        client: Docker client
+        robot_command: Full command line to execute inside the runner image
+        container_name: Name for the ephemeral container (used when no pooled runner is free)
+
+    Returns:
+        Exit code of the command
+    """
+    import docker
+    from src.backend.services.runner_pool import get_runner_pool
 
+    container = None
     try:
-        robot_command = ["robot", "--outputdir",
-                         f"/app/robot_tests/{run_id}", f"/app/robot_tests/{run_id}/{test_filename}"]
-        logging.info(
-            f"🤖 DOCKER SERVICE: Robot command: {' '.join(robot_command)}")
+        # Prefer a warm pooled runner; fall back to an ephemeral container when
+        # pooling is disabled or every pooled runner is busy
+        pool = get_runner_pool(client)
+        runner = pool.acquire() if pool else None
+        if runner:
+            try:
+                exit_code, _ = pool.run_robot(runner, robot_command)
+                logging.info(
+                    f"🏁 DOCKER SERVICE: Pooled runner {runner.name} finished with exit code: {exit_code}")
+            finally:
+                pool.release(runner)
+        else:
+            if pool:
+                logging.info(
+                    "ℹ️  DOCKER SERVICE: All warm runners busy, using an ephemeral container")
+            # Container configuration
+            container_config = {
+                "image": IMAGE_TAG,
+                "command": robot_command,
+                "volumes": {os.path.abspath(ROBOT_TESTS_DIR): {'bind': '/app/robot_tests', 'mode': 'rw'}},
+                "working_dir": "/app",
+                "detach": True,  # Run detached to manage container lifecycle
+                "auto_remove": False,  # Don't auto-remove so we can get logs properly
+                "name": container_name  # Give container a unique name
+            }
+            logging.info(
+                f"🐳 DOCKER SERVICE: Container config created for {container_name}")
 
-        # Container configuration
-        container_config = {
-            "image": IMAGE_TAG,
-            "command": robot_command,
-            "volumes": {os.path.abspath(ROBOT_TESTS_DIR): {'bind': '/app/robot_tests', 'mode': 'rw'}},
-            "working_dir": "/app",
-            "detach": True,  # Run detached to manage container lifecycle
-            "auto_remove": False,  # Don't auto-remove so we can get logs properly
-            "name": f"robot-test-{run_id}"  # Give container a unique name
-        }
-        logging.info(
-            f"🐳 DOCKER SERVICE: Container config created for robot-test-{run_id}")
+            # Clean up any existing container with the same name
+            logging.info(
+                f"🧹 DOCKER SERVICE: Checking for existing container: {container_name}")
+            try:
+                existing_container = client.containers.get(container_name)
+                logging.warning(
+                    f"🚨 DOCKER SERVICE: Found existing container {container_name}, removing it")
+                existing_container.remove(force=True)
+                logging.info(
+                    f"✅ DOCKER SERVICE: Successfully removed existing container {container_name}")
+            except docker.errors.NotFound:
+                logging.info(
+                    f"✅ DOCKER SERVICE: No existing container {container_name} found, proceeding")
+            except Exception as e:
+                logging.error(
+                    f"❌ DOCKER SERVICE: Failed to remove existing container {container_name}: {e}")
+                # Try to clean up all test containers
+                cleanup_test_containers(client)
 
-        # Clean up any existing container with the same name
-        container_name = f"robot-test-{run_id}"
-        logging.info(
-            f"🧹 DOCKER SERVICE: Checking for existing container: {container_name}")
-        try:
-            existing_container = client.containers.get(container_name)
-            logging.warning(
-                f"🚨 DOCKER SERVICE: Found existing container {container_name}, removing it")
-            existing_container.remove(force=True)
+            # Create and start the container
             logging.info(
-                f"✅ DOCKER SERVICE: Successfully removed existing container {container_name}")
-        except docker.errors.NotFound:
+                f"🚀 DOCKER SERVICE: Creating and starting container {container_name}")
+            container = client.containers.run(**container_config)
             logging.info(
-                f"✅ DOCKER SERVICE: No existing container {container_name} found, proceeding")
-        except Exception as e:
+                f"✅ DOCKER SERVICE: Container {container_name} created successfully with ID: {container.id}")
+
+            # Wrap container with interceptor to catch any logs() calls
+            container = ContainerLogsInterceptor(container)
+            log_docker_operation(
+                "container_wrapped", f"Container {container_name} wrapped with logs interceptor")
+
+            # Wait for container to finish
+            logging.info(
+                f"⏳ DOCKER SERVICE: Waiting for container {container_name} to finish execution")
+            result = container.wait()
+            exit_code = result['StatusCode']
+            logging.info(
+                f"🏁 DOCKER SERVICE: Container {container_name} finished with exit code: {exit_code}")
+
+            # Clean up container immediately after execution to prevent conflicts
+            logging.info(
+                f"🧹 DOCKER SERVICE: Starting container cleanup for {container_name}")
+            try:
+                container.remove()
+                logging.info(
+                    f"✅ DOCKER SERVICE: Successfully removed container {container_name}")
+            except docker.errors.NotFound:
+                logging.info(
+                    f"ℹ️  DOCKER SERVICE: Container {container_name} was already removed")
+            except Exception as e:
+                logging.error(
+                    f"❌ DOCKER SERVICE: Failed to remove container {container_name}: {e}")
+
+        return exit_code
+    except Exception:
+        # Clean up the ephemeral container if it exists
+        if container:
             logging.error(
-                f"❌ DOCKER SERVICE: Failed to remove existing container {container_name}: {e}")
-            # Try to clean up all test containers
-            cleanup_test_containers(client)
+                f"🧹 DOCKER SERVICE: Exception occurred, cleaning up container {container_name}")
+            try:
+                if hasattr(container, '_container'):  # It's our interceptor
+                    container._container.remove(force=True)
+                else:
+                    container.remove(force=True)
+                logging.info(f"✅ DOCKER SERVICE: Emergency cleanup successful")
+            except Exception as cleanup_error:
+                logging.error(
+                    f"❌ DOCKER SERVICE: Emergency cleanup failed: {cleanup_error}")
+        raise
 
-        # Create and start the container
-        logging.info(
-            f"🚀 DOCKER SERVICE: Creating and starting container {container_name}")
-        container = client.containers.run(**container_config)
-        logging.info(
-            f"✅ DOCKER SERVICE: Container {container_name} created successfully with ID: {container.id}")
 
-        # Wrap container with interceptor to catch any logs() calls
-        container = ContainerLogsInterceptor(container)
-        log_docker_operation(
-            "container_wrapped", f"Container {container_name} wrapped with logs interceptor")
+def run_test_in_container(client: "docker.DockerClient", run_id: str, test_filename: str,
+                          abort_on_failure: bool = False) -> Dict[str, Any]:
+    from src.backend.core.config import settings
+    from src.backend.services.live_events import listener_arguments
 
-        # Wait for container to finish
-        logging.info(
-            f"⏳ DOCKER SERVICE: Waiting for container {container_name} to finish execution")
-        result = container.wait()
-        exit_code = result['StatusCode']
-        logging.info(
-            f"🏁 DOCKER SERVICE: Container {container_name} finished with exit code: {exit_code}")
+    logging.info(
+        f"🚀 DOCKER SERVICE: Starting test execution for run_id={run_id}, test_filename={test_filename}")
 
-        # Clean up container immediately after execution to prevent conflicts
+    try:
+        robot_command = ["robot", "--outputdir", f"/app/robot_tests/{run_id}"]
+        if settings.EXECUTION_LIVE_EVENTS:
+            # Stream per-test/per-keyword events to robot_tests/<run_id>/events.jsonl
+            robot_command += listener_arguments(run_id, settings.EXECUTION_LIVE_EVENTS_MAX_DEPTH)
+        if abort_on_failure:
+            # Stop after the first failing test; remaining tests are reported as not run
+            robot_command.append("--exitonfailure")
+        robot_command.append(f"/app/robot_tests/{run_id}/{test_filename}")
         logging.info(
-            f"🧹 DOCKER SERVICE: Starting container cleanup for {container_name}")
-        try:
-            container.remove()
-            logging.info(
-                f"✅ DOCKER SERVICE: Successfully removed container {container_name}")
-        except docker.errors.NotFound:
-            logging.info(
-                f"ℹ️  DOCKER SERVICE: Container {container_name} was already removed")
-        except Exception as e:
-            logging.error(
-                f"❌ DOCKER SERVICE: Failed to remove container {container_name}: {e}")
+            f"🤖 DOCKER SERVICE: Robot command: {' '.join(robot_command)}")
+
+        exit_code = execute_robot_command(client, robot_command, f"robot-test-{run_id}")
 
         # Use Robot Framework output files instead of Docker container logs
         output_xml_path = os.path.join(ROBOT_TESTS_DIR, run_id, "output.xml")
@@ -239,41 +382,37 @@ def run_test_in_container(client: docker.DockerClient, run_id: str, test_filenam
         logging.info(f"   - log.html: {log_html_path}")
         logging.info(f"   - report.html: {report_html_path}")
 
+        # Parse output.xml once (streaming) for both the log summary and the result analysis
+        summary = None
+        if os.path.exists(output_xml_path):
+            try:
+                summary = parse_output_xml(output_xml_path)
+            except Exception as e:
+                logging.error(
+                    f"❌ DOCKER SERVICE: Failed to parse output.xml: {e}")
+
         # Generate logs from Robot Framework files (much more reliable than Docker logs)
         logging.info(
             f"📋 DOCKER SERVICE: Extracting logs from Robot Framework files (NOT from Docker container logs)")
         robot_logs = _extract_robot_framework_logs(
-            output_xml_path, log_html_path, exit_code)
+            output_xml_path, log_html_path, exit_code, summary)
         logging.info(
             f"✅ DOCKER SERVICE: Successfully extracted {len(robot_logs)} characters of Robot Framework logs")
 
         # Check test results from Robot Framework output files
         logging.info(
             f"🔍 DOCKER SERVICE: Analyzing test results from Robot Framework files")
-        if os.path.exists(output_xml_path):
+        if summary is not None:
             logging.info(
-                f"✅ DOCKER SERVICE: Found output.xml file, parsing test results")
+                f"✅ DOCKER SERVICE: Found output.xml file, analyzing test results")
             try:
-                # Parse XML properly to determine actual test results
-                # We need to check the TOP-LEVEL test status, not grep for "FAIL" strings
+                # Only the TOP-LEVEL test status counts (not any "FAIL" inside the test),
                 # because "Run Keyword And Ignore Error" can have FAIL status inside but test still passes
-                tree = ET.parse(output_xml_path)
-                root = tree.getroot()
-                
-                # Check statistics section for overall pass/fail count
-                stats = root.find('.//statistics/total/stat')
-                if stats is not None:
-                    fail_count = int(stats.get('fail', '0'))
-                    pass_count = int(stats.get('pass', '0'))
-                    tests_passed = fail_count == 0 and pass_count > 0
-                    logging.info(
-                        f"📊 DOCKER SERVICE: Test statistics: pass={pass_count}, fail={fail_count}, tests_passed={tests_passed}")
-                else:
-                    # Fallback to old method if statistics section not found
-                    with open(output_xml_path, 'r') as f:
-                        xml_content = f.read()
-                        tests_passed = 'fail="0"' in xml_content
-                    logging.warning(f"⚠️  DOCKER SERVICE: Statistics section not found in output.xml, using fallback method")
+                tests_passed = summary.all_passed
+                if summary.statistics is None:
+                    logging.warning(f"⚠️  DOCKER SERVICE: Statistics section not found in output.xml, using per-test statuses")
+                logging.info(
+                    f"📊 DOCKER SERVICE: Test statistics: pass={summary.pass_count}, fail={summary.fail_count}, tests_passed={tests_passed}")
 
                 if tests_passed:
                     message = "Test execution finished: All tests passed."
@@ -294,12 +433,12 @@ def run_test_in_container(client: docker.DockerClient, run_id: str, test_filenam
 
             except Exception as e:
                 logging.error(
-                    f"❌ DOCKER SERVICE: Failed to parse output.xml: {e}")
+                    f"❌ DOCKER SERVICE: Failed to analyze output.xml: {e}")
                 # Fall back to exit code analysis
 
         else:
             logging.warning(
-                f"⚠️  DOCKER SERVICE: output.xml file not found at {output_xml_path}")
+                f"⚠️  DOCKER SERVICE: output.xml file not found or unreadable at {output_xml_path}")
 
         # Fallback based on exit code when XML parsing fails
         logging.info(
@@ -344,31 +483,13 @@ def run_test_in_container(client: docker.DockerClient, run_id: str, test_filenam
             log_docker_operation(
                 "409_ERROR_STACK", f"Stack trace: {''.join(traceback.format_exc())}", "error")
 
-        # Clean up container if it exists
-        if container:
-            container_name = getattr(container, 'name', 'unknown')
-            if hasattr(container, '_container'):  # It's our interceptor
-                container_name = getattr(
-                    container._container, 'name', 'unknown')
-
-            logging.error(
-                f"🧹 DOCKER SERVICE: Exception occurred, cleaning up container {container_name}")
-            try:
-                if hasattr(container, '_container'):  # It's our interceptor
-                    container._container.remove(force=True)
-                else:
-                    container.remove(force=True)
-                logging.info(f"✅ DOCKER SERVICE: Emergency cleanup successful")
-            except Exception as cleanup_error:
-                logging.error(
-                    f"❌ DOCKER SERVICE: Emergency cleanup failed: {cleanup_error}")
-
         logging.error(
             f"❌ DOCKER SERVICE: Docker container execution failed: {e}")
         raise RuntimeError(f"Docker container execution failed: {e}")
 
 
-def _extract_robot_framework_logs(output_xml_path: str, log_html_path: str, exit_code: int) -> str:
+def _extract_robot_framework_logs(output_xml_path: str, log_html_path: str, exit_code: int,
+                                  summary: Optional[RobotOutputSummary] = None) -> str:
     """
     Extract logs from Robot Framework output files instead of Docker container logs.
 
@@ -376,6 +497,7 @@ def _extract_robot_framework_logs(output_xml_path: str, log_html_path: str, exit
         output_xml_path: Path to output.xml file
         log_html_path: Path to log.html file  
         exit_code: Container exit code
+        summary: Already parsed output.xml (parsed here if not provided)
 
     Returns:
         Formatted log string with test execution details
@@ -392,74 +514,49 @@ def _extract_robot_framework_logs(output_xml_path: str, log_html_path: str, exit
     logs.append("=" * 50)
 
     # Try to extract information from output.xml
-    if os.path.exists(output_xml_path):
+    if summary is None and os.path.exists(output_xml_path):
         logging.info(
             f"✅ LOG EXTRACTOR: Found output.xml file, parsing XML content")
         try:
-            import xml.etree.ElementTree as ET
-            tree = ET.parse(output_xml_path)
-            root = tree.getroot()
-            logging.info(
-                f"📊 LOG EXTRACTOR: Successfully parsed XML, root element: {root.tag}")
+            summary = parse_output_xml(output_xml_path)
+        except Exception as e:
+            logging.error(f"❌ LOG EXTRACTOR: Failed to parse output.xml: {e}")
+            logs.append(f"Failed to parse output.xml: {e}")
 
-            # Extract suite information
-            suite = root.find('.//suite')
-            if suite is not None:
-                suite_name = suite.get('name', 'Unknown Suite')
-                logs.append(f"Suite: {suite_name}")
-                logging.info(
-                    f"📁 LOG EXTRACTOR: Found test suite: {suite_name}")
+    if summary is not None:
+        if summary.suite_name is not None:
+            logs.append(f"Suite: {summary.suite_name}")
+            logging.info(
+                f"📁 LOG EXTRACTOR: Found test suite: {summary.suite_name}")
 
-                # Extract test information
-                tests = suite.findall('.//test')
-                logging.info(
-                    f"🧪 LOG EXTRACTOR: Found {len(tests)} test(s) in suite")
-                for test in tests:
-                    test_name = test.get('name', 'Unknown Test')
-                    test_status = test.find('.//status')
-                    if test_status is not None:
-                        status = test_status.get('status', 'UNKNOWN')
-                        start_time = test_status.get('starttime', '')
-                        end_time = test_status.get('endtime', '')
-
-                        logs.append(f"  Test: {test_name} - {status}")
-                        if start_time and end_time:
-                            logs.append(
-                                f"    Time: {start_time} to {end_time}")
-
-                        # Extract failure messages
-                        if status == 'FAIL':
-                            message = test_status.text
-                            if message:
-                                logs.append(f"    Error: {message.strip()}")
-
-                            # Extract keyword failures for more detail
-                            keywords = test.findall('.//kw')
-                            for kw in keywords:
-                                kw_status = kw.find('.//status')
-                                if kw_status is not None and kw_status.get('status') == 'FAIL':
-                                    kw_name = kw.get('name', 'Unknown Keyword')
-                                    kw_message = kw_status.text
-                                    logs.append(
-                                        f"    Failed Keyword: {kw_name}")
-                                    if kw_message:
-                                        logs.append(
-                                            f"      Details: {kw_message.strip()}")
-
-                # Extract statistics
-                statistics = root.find('.//statistics')
-                if statistics is not None:
-                    total = statistics.find('.//stat[@pass]')
-                    if total is not None:
-                        passed = total.get('pass', '0')
-                        failed = total.get('fail', '0')
+            logging.info(
+                f"🧪 LOG EXTRACTOR: Found {len(summary.tests)} test(s) in suite")
+            for test in summary.tests:
+                logs.append(f"  Test: {test.name} - {test.status}")
+                if test.start_time and test.end_time:
+                    logs.append(
+                        f"    Time: {test.start_time} to {test.end_time}")
+                elif test.start_time and test.elapsed:
+                    logs.append(
+                        f"    Time: {test.start_time} ({test.elapsed}s)")
+
+                # Extract failure messages
+                if test.status == 'FAIL':
+                    if test.message:
+                        logs.append(f"    Error: {test.message}")
+
+                    # Keyword failures for more detail
+                    for kw_name, kw_message in test.failed_keywords:
                         logs.append(
-                            f"Results: {passed} passed, {failed} failed")
+                            f"    Failed Keyword: {kw_name}")
+                        if kw_message:
+                            logs.append(
+                                f"      Details: {kw_message}")
 
-        except Exception as e:
-            logging.error(f"❌ LOG EXTRACTOR: Failed to parse output.xml: {e}")
-            logs.append(f"Failed to parse output.xml: {e}")
-    else:
+            if summary.statistics is not None:
+                logs.append(
+                    f"Results: {summary.statistics['pass']} passed, {summary.statistics['fail']} failed")
+    elif not os.path.exists(output_xml_path):
         logging.warning(
             f"⚠️  LOG EXTRACTOR: No output.xml file found at {output_xml_path}")
         logs.append(
@@ -481,7 +578,7 @@ def _extract_robot_framework_logs(output_xml_path: str, log_html_path: str, exit
     return final_logs
 
 
-def cleanup_test_containers(client: docker.DockerClient) -> Dict[str, Any]:
+def cleanup_test_containers(client: "docker.DockerClient") -> Dict[str, Any]:
     """Clean up any orphaned test containers."""
     try:
         # Find all containers with robot-test prefix
@@ -513,7 +610,14 @@ def cleanup_test_containers(client: docker.DockerClient) -> Dict[str, Any]:
         }
 
 
-def rebuild_image(client: docker.DockerClient) -> Dict[str, str]:
+def rebuild_image(client: "docker.DockerClient") -> Dict[str, str]:
+    import docker
+    from src.backend.services.runner_pool import shutdown_runner_pool
+
+    global _image_verified
+    _image_verified = False
+    # Warm runners use the old image; they are restarted lazily on the next run
+    shutdown_runner_pool()
     try:
         try:
             client.images.remove(image=IMAGE_TAG, force=True)
@@ -522,6 +626,7 @@ def rebuild_image(client: docker.DockerClient) -> Dict[str, str]:
             logging.info(f"No existing Docker image '{IMAGE_TAG}' to remove.")
 
         client.images.build(path=DOCKERFILE_PATH, tag=IMAGE_TAG, rm=True)
+        _image_verified = True
         logging.info(f"Successfully rebuilt Docker image '{IMAGE_TAG}'.")
         return {"status": "success", "message": f"Docker image '{IMAGE_TAG}' rebuilt successfully."}
     except docker.errors.DockerException as e:
@@ -529,7 +634,9 @@ def rebuild_image(client: docker.DockerClient) -> Dict[str, str]:
         raise ConnectionError(f"Docker error: {e}")
 
 
-def get_docker_status(client: docker.DockerClient) -> Dict[str, Any]:
+def get_docker_status(client: "docker.DockerClient") -> Dict[str, Any]:
+    import docker
+
     try:
         image = client.images.get(IMAGE_TAG)
         image_info = {
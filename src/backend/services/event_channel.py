@@ -0,0 +1,118 @@
+"""
+Async event channel bridging worker threads and SSE generators.
+
+CrewAI workflows run synchronously in worker threads, while the API streams
+progress over Server-Sent Events from async generators. This module connects
+the two without polling: workers publish events with
+``loop.call_soon_threadsafe`` into an ``asyncio.Queue`` that the SSE generator
+awaits, so events are delivered as soon as they are produced.
+
+Heartbeats are driven by a ``loop.call_later`` timer owned by the channel
+rather than by empty queue reads, so an idle stream costs one timer handle
+instead of a busy loop.
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default interval between SSE heartbeat comments (seconds)
+DEFAULT_HEARTBEAT_INTERVAL = 15.0
+
+# Sentinels placed on the queue alongside regular events
+HEARTBEAT = object()
+_END_OF_STREAM = object()
+
+
+class WorkflowEventChannel:
+    """
+    Thread-safe, single-consumer event channel bound to an asyncio event loop.
+
+    Producers (typically worker threads) call ``publish()`` and ``close()``.
+    The consumer iterates the channel with ``async for`` and receives either
+    event dictionaries or the ``HEARTBEAT`` sentinel when the stream has been
+    idle for ``heartbeat_interval`` seconds.
+
+    Example:
+        >>> channel = WorkflowEventChannel()
+        >>> Thread(target=worker, args=(channel,)).start()
+        >>> async for item in channel:
+        ...     if item is HEARTBEAT:
+        ...         yield ": heartbeat\\n\\n"
+        ...     else:
+        ...         yield f"data: {json.dumps(item)}\\n\\n"
+    """
+
+    def __init__(self, heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Create a channel bound to the running event loop.
+
+        Args:
+            heartbeat_interval: Seconds of inactivity before a heartbeat is emitted
+                (0 or less disables heartbeats)
+            loop: Event loop to deliver events on (defaults to the running loop)
+        """
+        self._loop = loop or asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._heartbeat_interval = heartbeat_interval
+        self._heartbeat_handle: Optional[asyncio.TimerHandle] = None
+        self._closed = False
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop this channel delivers events on."""
+        return self._loop
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """
+        Publish an event to the consumer. Safe to call from any thread.
+
+        Events published after the loop has been closed are dropped.
+        """
+        self._call_soon(self._queue.put_nowait, event)
+
+    def close(self) -> None:
+        """Signal that no further events will be published. Safe to call from any thread."""
+        self._call_soon(self._queue.put_nowait, _END_OF_STREAM)
+
+    def _call_soon(self, callback, *args) -> None:
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # Loop already closed (client disconnected and server shut down)
+            logger.debug("Event loop closed, dropping channel event")
+
+    def _schedule_heartbeat(self) -> None:
+        if self._heartbeat_interval > 0 and not self._closed:
+            self._heartbeat_handle = self._loop.call_later(
+                self._heartbeat_interval, self._emit_heartbeat)
+
+    def _cancel_heartbeat(self) -> None:
+        if self._heartbeat_handle is not None:
+            self._heartbeat_handle.cancel()
+            self._heartbeat_handle = None
+
+    def _emit_heartbeat(self) -> None:
+        self._heartbeat_handle = None
+        if self._queue.empty():
+            self._queue.put_nowait(HEARTBEAT)
+        self._schedule_heartbeat()
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        self._schedule_heartbeat()
+        try:
+            while True:
+                item = await self._queue.get()
+                if item is _END_OF_STREAM:
+                    return
+                if item is not HEARTBEAT:
+                    # Real traffic resets the idle timer
+                    self._cancel_heartbeat()
+                    self._schedule_heartbeat()
+                yield item
+        finally:
+            self._closed = True
+            self._cancel_heartbeat()
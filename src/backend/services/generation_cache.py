@@ -0,0 +1,280 @@
+"""
+Persistent exact-match cache for generated Robot Framework code.
+
+The same natural-language queries are regenerated repeatedly (e.g. CI jobs
+re-requesting "login to X and check dashboard"), and each generation costs a
+full four-agent crew run plus a browser-use session. This cache sits in front
+of the agentic workflow and returns the previously validated code instead.
+
+Cache key components (any change produces a new key):
+- Normalized query (whitespace collapsed and trailing "." / "!" stripped; case
+  is preserved because test data such as passwords and URLs are case-sensitive)
+- Model name
+- Robot Framework library (ROBOT_LIBRARY) and its installed version
+- Hash of the prompt templates (agents, tasks, prompt components, library contexts)
+
+Entries live in SQLite with a TTL and least-recently-used eviction.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Distribution that provides each supported ROBOT_LIBRARY value
+_LIBRARY_DISTRIBUTIONS = {
+    "selenium": "robotframework-seleniumlibrary",
+    "browser": "robotframework-browser",
+}
+
+# Files whose content defines the prompts sent to the agents
+_CREW_AI_DIR = Path(__file__).resolve().parent.parent / "crew_ai"
+_PROMPT_TEMPLATE_FILES = [
+    _CREW_AI_DIR / "agents.py",
+    _CREW_AI_DIR / "tasks.py",
+    _CREW_AI_DIR / "prompts" / "components.py",
+    *sorted((_CREW_AI_DIR / "library_context").glob("*.py")),
+]
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and strip trailing punctuation so trivially different queries share a key."""
+    return re.sub(r"\s+", " ", query).strip().rstrip(".!").strip()
+
+
+def get_library_version(robot_library: str) -> str:
+    """Installed version of the Robot Framework library package ("unknown" if not installed)."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    distribution = _LIBRARY_DISTRIBUTIONS.get(robot_library, robot_library)
+    try:
+        return version(distribution)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def compute_prompt_hash() -> str:
+    """Hash of all prompt template sources, so prompt edits invalidate cached code."""
+    digest = hashlib.sha256()
+    for path in _PROMPT_TEMPLATE_FILES:
+        try:
+            digest.update(path.name.encode("utf-8"))
+            digest.update(path.read_bytes())
+        except OSError:
+            logger.debug(f"Prompt template not readable: {path}")
+    return digest.hexdigest()[:16]
+
+
+class GenerationCache:
+    """
+    SQLite-backed generation cache with TTL expiry and LRU eviction.
+
+    Thread-safe: generation workers look up and store entries concurrently.
+    """
+
+    def __init__(self, db_path: str = "./data/generation_cache.db", ttl_seconds: int = 604800,
+                 max_entries: int = 500):
+        """
+        Initialize the cache and its database schema.
+
+        Args:
+            db_path: Path to the SQLite database file
+            ttl_seconds: Entry lifetime in seconds
+            max_entries: Maximum number of entries before least-recently-used ones are evicted
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._prompt_hash = compute_prompt_hash()
+        self._library_versions: Dict[str, str] = {}
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._init_database()
+        logger.info(f"GenerationCache initialized with database: {db_path} "
+                    f"(ttl={ttl_seconds}s, max_entries={max_entries})")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _init_database(self):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS generation_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    query TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    robot_library TEXT NOT NULL,
+                    library_version TEXT NOT NULL,
+                    prompt_hash TEXT NOT NULL,
+                    robot_code TEXT NOT NULL,
+                    validation TEXT,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    hit_count INTEGER DEFAULT 0
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_generation_cache_last_accessed
+                ON generation_cache(last_accessed)
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def make_key(self, query: str, model_name: str, robot_library: str) -> str:
+        """Build the cache key for a generation request."""
+        if robot_library not in self._library_versions:
+            self._library_versions[robot_library] = get_library_version(robot_library)
+        parts = [
+            normalize_query(query),
+            model_name,
+            robot_library,
+            self._library_versions[robot_library],
+            self._prompt_hash,
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, query: str, model_name: str, robot_library: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up cached code for a request.
+
+        Returns:
+            Dictionary with robot_code, validation and created_at, or None on a miss
+        """
+        key = self.make_key(query, model_name, robot_library)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    row = conn.execute(
+                        "SELECT robot_code, validation, created_at FROM generation_cache WHERE cache_key = ?",
+                        (key,)
+                    ).fetchone()
+                    if row and now - row[2] > self.ttl_seconds:
+                        conn.execute("DELETE FROM generation_cache WHERE cache_key = ?", (key,))
+                        conn.commit()
+                        row = None
+                    if row:
+                        conn.execute(
+                            "UPDATE generation_cache SET last_accessed = ?, hit_count = hit_count + 1 "
+                            "WHERE cache_key = ?", (now, key)
+                        )
+                        conn.commit()
+                        self._hits += 1
+                    else:
+                        self._misses += 1
+                finally:
+                    conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Generation cache lookup failed: {e}")
+            return None
+
+        if not row:
+            return None
+        robot_code, validation, created_at = row
+        return {
+            "robot_code": robot_code,
+            "validation": json.loads(validation) if validation else None,
+            "created_at": created_at,
+        }
+
+    def put(self, query: str, model_name: str, robot_library: str, robot_code: str,
+            validation: Optional[Dict[str, Any]] = None) -> None:
+        """Store validated code for a request and evict least-recently-used entries beyond the limit."""
+        key = self.make_key(query, model_name, robot_library)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    conn.execute("""
+                        INSERT OR REPLACE INTO generation_cache
+                        (cache_key, query, model_name, robot_library, library_version, prompt_hash,
+                         robot_code, validation, created_at, last_accessed, hit_count)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+                    """, (key, normalize_query(query), model_name, robot_library,
+                          self._library_versions[robot_library], self._prompt_hash,
+                          robot_code, json.dumps(validation) if validation else None, now, now))
+                    conn.execute("""
+                        DELETE FROM generation_cache WHERE cache_key IN (
+                            SELECT cache_key FROM generation_cache
+                            ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+                        )
+                    """, (self.max_entries,))
+                    conn.commit()
+                finally:
+                    conn.close()
+            logger.info(f"💾 Cached generated code for query: '{query[:50]}...'")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to store generation cache entry: {e}")
+
+    def clear(self) -> int:
+        """Remove all entries. Returns the number of entries removed."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                removed = conn.execute("DELETE FROM generation_cache").rowcount
+                conn.commit()
+            finally:
+                conn.close()
+        logger.info(f"🧹 Cleared {removed} generation cache entries")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters (since process start) and entry count."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                entries = conn.execute("SELECT COUNT(*) FROM generation_cache").fetchone()[0]
+            finally:
+                conn.close()
+            lookups = self._hits + self._misses
+            return {
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "prompt_hash": self._prompt_hash,
+            }
+
+
+# Global instance
+_generation_cache: Optional[GenerationCache] = None
+_generation_cache_lock = threading.Lock()
+
+
+def get_generation_cache() -> Optional[GenerationCache]:
+    """
+    Get the global generation cache instance.
+
+    Returns:
+        GenerationCache, or None if GENERATION_CACHE_ENABLED is false
+    """
+    global _generation_cache
+    from src.backend.core.config import settings
+
+    if not settings.GENERATION_CACHE_ENABLED:
+        return None
+    if _generation_cache is None:
+        with _generation_cache_lock:
+            if _generation_cache is None:
+                _generation_cache = GenerationCache(
+                    db_path=settings.GENERATION_CACHE_DB_PATH,
+                    ttl_seconds=settings.GENERATION_CACHE_TTL_SECONDS,
+                    max_entries=settings.GENERATION_CACHE_MAX_ENTRIES,
+                )
+    return _generation_cache
@@ -0,0 +1,232 @@
+"""
+Bounded worker pool for CrewAI test generation.
+
+Each generation runs a full four-agent crew plus a browser-use session, so
+running them without a limit lets a traffic burst exhaust the LLM quota and
+the browser-use service. This module provides admission control:
+
+- A fixed number of worker threads run generations concurrently
+- A bounded wait queue holds admitted requests until a worker frees up
+- Requests beyond that are rejected immediately (HTTP 429 + Retry-After)
+- Waiting requests receive queue position and estimated wait updates
+
+Wait estimates use an exponential moving average of recent generation times.
+"""
+
+import logging
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from src.backend.config.logging_config import EMOJI
+from src.backend.services.event_channel import WorkflowEventChannel
+
+logger = logging.getLogger(__name__)
+
+# Weight of the most recent duration in the moving average
+_DURATION_EWMA_ALPHA = 0.3
+
+
+class GenerationQueueFullError(RuntimeError):
+    """Raised when the generation wait queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Generation queue is full. Retry after {retry_after} seconds.")
+        self.retry_after = retry_after
+
+
+class GenerationTicket:
+    """Handle for a generation job admitted to the executor."""
+
+    def __init__(self, channel: WorkflowEventChannel):
+        self.channel = channel
+        self.future: Optional[Future] = None
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.last_position: Optional[int] = None
+
+
+class GenerationExecutor:
+    """
+    Fixed-size thread pool with a bounded, observable wait queue.
+
+    Capacity is ``max_workers`` running jobs plus ``max_queue_size`` waiting
+    jobs. ``submit()`` raises ``GenerationQueueFullError`` beyond that.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue_size: int = 8,
+                 initial_duration_estimate: float = 60.0):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Number of generations allowed to run concurrently
+            max_queue_size: Number of admitted generations allowed to wait for a worker
+            initial_duration_estimate: Seed (seconds) for the generation duration average
+        """
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._avg_duration = initial_duration_estimate
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generation")
+        self._lock = threading.Lock()
+        self._waiting: List[GenerationTicket] = []
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+        logger.info(
+            f"GenerationExecutor initialized: {max_workers} workers, queue size {max_queue_size}")
+
+    def has_capacity(self) -> bool:
+        """Return True if a new generation would currently be admitted."""
+        with self._lock:
+            return self._in_flight() < self.max_workers + self.max_queue_size
+
+    def retry_after_seconds(self) -> int:
+        """Estimated seconds until a queue slot frees up (for the Retry-After header)."""
+        with self._lock:
+            return max(1, math.ceil(self._avg_duration / self.max_workers))
+
+    def submit(self, channel: WorkflowEventChannel, fn: Callable[..., Any], *args) -> GenerationTicket:
+        """
+        Admit a generation job or reject it when the queue is full.
+
+        Args:
+            channel: Event channel of the requesting stream (receives queue updates)
+            fn: Callable to run on a worker thread
+            *args: Arguments for fn
+
+        Returns:
+            GenerationTicket for the admitted job
+
+        Raises:
+            GenerationQueueFullError: If running and waiting slots are all taken
+        """
+        ticket = GenerationTicket(channel)
+        with self._lock:
+            if self._in_flight() >= self.max_workers + self.max_queue_size:
+                self._rejected += 1
+                retry_after = max(1, math.ceil(self._avg_duration / self.max_workers))
+                logger.warning(
+                    f"Generation rejected: {self._running} running, {len(self._waiting)} waiting")
+                raise GenerationQueueFullError(retry_after)
+            self._waiting.append(ticket)
+            ticket.future = self._executor.submit(self._run, ticket, fn, *args)
+            position = self._position_of(ticket)
+
+        if position is not None:
+            self._publish_position(ticket, position)
+        return ticket
+
+    def cancel(self, ticket: GenerationTicket) -> bool:
+        """
+        Cancel a job that has not started yet (e.g. the client disconnected).
+
+        Returns:
+            True if the job was removed from the queue, False if it already started
+        """
+        if ticket.future is None or not ticket.future.cancel():
+            return False
+        with self._lock:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+            waiting = list(self._waiting)
+        logger.info("Cancelled queued generation (client disconnected)")
+        self._publish_positions(waiting)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return current executor statistics."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "running": self._running,
+                "waiting": len(self._waiting),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_duration_seconds": round(self._avg_duration, 1),
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting work and cancel queued jobs."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _in_flight(self) -> int:
+        return self._running + len(self._waiting)
+
+    def _position_of(self, ticket: GenerationTicket) -> Optional[int]:
+        """1-based wait-queue position, or None if the ticket will start immediately."""
+        index = self._waiting.index(ticket)
+        if self._running + index < self.max_workers:
+            return None
+        return self._running + index - self.max_workers + 1
+
+    def _estimated_wait(self, position: int) -> int:
+        return math.ceil(position * self._avg_duration / self.max_workers)
+
+    def _publish_position(self, ticket: GenerationTicket, position: int) -> None:
+        with self._lock:
+            if ticket.last_position == position:
+                return
+            ticket.last_position = position
+            estimated_wait = self._estimated_wait(position)
+        ticket.channel.publish({
+            "status": "queued",
+            "message": f"{EMOJI['thinking']} Waiting for a free generation worker "
+                       f"(position {position}, ~{estimated_wait}s)...",
+            "queue_position": position,
+            "estimated_wait_seconds": estimated_wait,
+        })
+
+    def _publish_positions(self, waiting: List[GenerationTicket]) -> None:
+        with self._lock:
+            positions = [(t, self._position_of(t)) for t in waiting if t in self._waiting]
+        for ticket, position in positions:
+            if position is not None:
+                self._publish_position(ticket, position)
+
+    def _run(self, ticket: GenerationTicket, fn: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+            self._running += 1
+            ticket.started_at = time.monotonic()
+            waiting = list(self._waiting)
+        queued_for = ticket.started_at - ticket.submitted_at
+        if queued_for > 0.5:
+            logger.info(f"Generation started after {queued_for:.1f}s in queue")
+        self._publish_positions(waiting)
+
+        try:
+            return fn(*args)
+        finally:
+            duration = time.monotonic() - ticket.started_at
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._avg_duration = (
+                    _DURATION_EWMA_ALPHA * duration + (1 - _DURATION_EWMA_ALPHA) * self._avg_duration
+                )
+
+
+# Global instance
+_generation_executor: Optional[GenerationExecutor] = None
+_generation_executor_lock = threading.Lock()
+
+
+def get_generation_executor() -> GenerationExecutor:
+    """Get the global generation executor instance (configured from settings)."""
+    global _generation_executor
+    if _generation_executor is None:
+        with _generation_executor_lock:
+            if _generation_executor is None:
+                from src.backend.core.config import settings
+                _generation_executor = GenerationExecutor(
+                    max_workers=settings.GENERATION_MAX_WORKERS,
+                    max_queue_size=settings.GENERATION_MAX_QUEUE_SIZE,
+                    initial_duration_estimate=settings.GENERATION_ESTIMATED_DURATION,
+                )
+    return _generation_executor
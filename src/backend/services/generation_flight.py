@@ -0,0 +1,135 @@
+"""
+Single-flight coalescing of concurrent identical generation requests.
+
+When several clients submit the same query at the same time, only the first
+one (the leader) runs the agentic workflow. Every concurrent duplicate
+subscribes to the leader's event stream and receives the same events,
+including the final ``complete`` event and its ``workflow_id``.
+
+A flight is driven by its own asyncio task rather than by the leader's SSE
+generator, so the flight keeps delivering events to the remaining
+subscribers when the leader's client disconnects.
+
+All methods must be called on the event loop thread; no locking is needed
+(``cancel_event`` is the only state shared with the worker thread).
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from src.backend.services.event_channel import HEARTBEAT, WorkflowEventChannel
+
+logger = logging.getLogger(__name__)
+
+# Sentinel delivered to subscribers when the flight has ended
+FLIGHT_ENDED = object()
+
+
+class GenerationFlight:
+    """One in-flight generation and the SSE streams subscribed to it."""
+
+    def __init__(self, key: str, channel: WorkflowEventChannel):
+        """
+        Args:
+            key: Coalescing key of the request
+            channel: Event channel the generation worker publishes to
+        """
+        self.key = key
+        self.channel = channel
+        self.ticket = None
+        # Set to stop the running crew once no subscriber is left
+        self.cancel_event: Optional[threading.Event] = None
+        self.done = False
+        self._history: List[Dict[str, Any]] = []
+        self._subscribers: List[asyncio.Queue] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Subscribe to the flight's events.
+
+        The returned queue first receives every event published so far, then
+        live events, HEARTBEAT while idle, and finally FLIGHT_ENDED.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for event in self._history:
+            queue.put_nowait(event)
+        if self.done:
+            queue.put_nowait(FLIGHT_ENDED)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> int:
+        """Remove a subscriber. Returns the number of remaining subscribers."""
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+        return len(self._subscribers)
+
+    def _broadcast(self, item: Any) -> None:
+        if item is not HEARTBEAT:
+            self._history.append(item)
+        for queue in self._subscribers:
+            queue.put_nowait(item)
+
+    async def _drive(self, on_finished: Callable[["GenerationFlight"], None]) -> None:
+        try:
+            async for event in self.channel:
+                self._broadcast(event)
+        finally:
+            self.done = True
+            on_finished(self)
+            for queue in self._subscribers:
+                queue.put_nowait(FLIGHT_ENDED)
+
+
+class GenerationFlightRegistry:
+    """In-flight generations by coalescing key."""
+
+    def __init__(self):
+        self._flights: Dict[str, GenerationFlight] = {}
+        self._coalesced = 0
+
+    def get(self, key: str) -> Optional[GenerationFlight]:
+        """Return the running flight for a key, if any (and count the coalesced request)."""
+        flight = self._flights.get(key)
+        if flight is not None and not flight.done:
+            self._coalesced += 1
+            logger.info(f"🔗 Joining in-flight generation ({flight.subscriber_count} subscribers so far)")
+            return flight
+        return None
+
+    def contains(self, key: str) -> bool:
+        """Return True if a generation for the key is currently running."""
+        flight = self._flights.get(key)
+        return flight is not None and not flight.done
+
+    def start(self, key: str, channel: WorkflowEventChannel, ticket,
+              cancel_event: Optional[threading.Event] = None) -> GenerationFlight:
+        """
+        Register a new flight whose worker was already submitted.
+
+        Args:
+            key: Coalescing key of the request
+            channel: Channel the worker publishes to
+            ticket: GenerationTicket returned by the generation executor
+            cancel_event: Event the worker checks to stop a running generation early
+        """
+        flight = GenerationFlight(key, channel)
+        flight.ticket = ticket
+        flight.cancel_event = cancel_event
+        self._flights[key] = flight
+        flight._task = asyncio.ensure_future(flight._drive(self._finished))
+        return flight
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self._flights), "coalesced_requests": self._coalesced}
+
+    def _finished(self, flight: GenerationFlight) -> None:
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
@@ -0,0 +1,205 @@
+"""
+Write-behind queue for pattern learning.
+
+Learning from a passed test embeds the query and writes ChromaDB and SQLite,
+which used to delay the end of the execution response. Executions now only
+enqueue a learn event; a background worker drains the bounded queue and
+stores events in batches (one ChromaDB add, and so one embedding batch, per
+flush).
+
+- A flush happens when ``batch_size`` events are waiting or the oldest
+  waiting event is ``flush_interval`` seconds old
+- When the queue is full new events are dropped (learning is best-effort)
+- ``shutdown()`` stores the events still queued before the worker exits
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Queued learn event: (user_query, robot_code)
+LearnEvent = Tuple[str, str]
+
+# Put on the queue by shutdown() to wake the worker
+_STOP = object()
+
+
+def _default_learner(events: List[LearnEvent]) -> int:
+    """Store a batch with the shared pattern matcher."""
+    from src.backend.crew_ai.optimization import get_component_registry
+    return get_component_registry().get_pattern_matcher().learn_batch(events)
+
+
+class PatternLearningQueue:
+    """
+    Bounded queue of learn events drained by one background worker thread.
+
+    ``submit()`` never blocks; the worker is started on first use.
+    """
+
+    def __init__(self, learner: Callable[[List[LearnEvent]], int] = _default_learner,
+                 max_size: int = 1000, batch_size: int = 32, flush_interval: float = 2.0):
+        """
+        Args:
+            learner: Stores a batch of events, returns the number stored
+            max_size: Maximum queued events before new ones are dropped
+            batch_size: Events stored per flush at most
+            flush_interval: Maximum seconds an event waits for its batch to fill
+        """
+        self.learner = learner
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self._submitted = 0
+        self._dropped = 0
+        self._learned = 0
+        self._failed = 0
+        self._flushes = 0
+        self._last_flush_seconds = 0.0
+
+    def submit(self, user_query: str, robot_code: str) -> bool:
+        """
+        Queue a passed test for learning.
+
+        Returns:
+            True if queued, False if the queue is full or shut down
+        """
+        # The put happens under the lock that shutdown() takes to close the queue, so no
+        # event can be queued behind the stop marker (where the drain would never see it)
+        with self._lock:
+            if self._closed:
+                self._dropped += 1
+                logger.debug("Pattern learning queue is shut down, dropping learn event")
+                return False
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="pattern-learning", daemon=True)
+                self._worker.start()
+            try:
+                self._queue.put_nowait((user_query, robot_code))
+            except queue.Full:
+                self._dropped += 1
+                logger.warning("⚠️ Pattern learning queue is full, dropping learn event")
+                return False
+            self._submitted += 1
+        return True
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[LearnEvent] = []
+            item = self._queue.get()
+            if item is _STOP:
+                stopping = True
+            else:
+                batch.append(item)
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+            if stopping:
+                # Drain whatever is still queued before exiting
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        batch.append(item)
+            for start in range(0, len(batch), self.batch_size):
+                self._flush(batch[start:start + self.batch_size])
+
+    def _flush(self, batch: List[LearnEvent]) -> None:
+        started = time.perf_counter()
+        try:
+            learned = self.learner(batch)
+            failed = 0
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to learn from {len(batch)} executions: {e}")
+            learned, failed = 0, len(batch)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._learned += learned
+            self._failed += failed
+            self._flushes += 1
+            self._last_flush_seconds = elapsed
+        if learned:
+            logger.info(f"📚 Learned {learned} patterns from passed tests in {elapsed:.2f}s")
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting events and wait (up to timeout seconds) until queued events are stored."""
+        with self._lock:
+            if self._closed:
+                return
+            # From here on submit() rejects events, so _STOP is the last item queued
+            self._closed = True
+            worker = self._worker
+        if worker is None:
+            return
+        try:
+            # Waits only while the queue is full; the worker keeps draining it
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        worker.join(timeout)
+        if worker.is_alive():
+            logger.warning(f"⚠️ Pattern learning queue not drained after {timeout}s, "
+                           f"{self._queue.qsize()} events lost")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue depth and learn event counters."""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_size": self._queue.maxsize,
+                "submitted": self._submitted,
+                "dropped": self._dropped,
+                "learned": self._learned,
+                "failed": self._failed,
+                "flushes": self._flushes,
+                "last_flush_seconds": round(self._last_flush_seconds, 3),
+            }
+
+
+# Global instance
+_learning_queue: Optional[PatternLearningQueue] = None
+_learning_queue_lock = threading.Lock()
+
+
+def get_learning_queue() -> PatternLearningQueue:
+    """Get the global pattern learning queue, creating it on first use."""
+    global _learning_queue
+    if _learning_queue is None:
+        with _learning_queue_lock:
+            if _learning_queue is None:
+                from src.backend.core.config import settings
+                _learning_queue = PatternLearningQueue(
+                    max_size=settings.OPTIMIZATION_LEARNING_QUEUE_SIZE,
+                    batch_size=settings.OPTIMIZATION_LEARNING_BATCH_SIZE,
+                    flush_interval=settings.OPTIMIZATION_LEARNING_FLUSH_SECONDS,
+                )
+    return _learning_queue
+
+
+def shutdown_learning_queue(timeout: Optional[float] = None) -> None:
+    """Drain and stop the global learning queue (on application shutdown)."""
+    global _learning_queue
+    with _learning_queue_lock:
+        if _learning_queue is not None:
+            _learning_queue.shutdown(timeout)
+            _learning_queue = None
@@ -0,0 +1,165 @@
+"""
+Live per-keyword execution events.
+
+The runner container writes JSON-lines events through the
+``LiveEventsListener`` Robot Framework listener. This module installs that
+listener into the shared ``robot_tests`` volume (so prebuilt runner images
+pick it up without a rebuild), builds the ``--listener`` arguments for a run,
+and tails the events file from a background thread while the run executes.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from src.backend.services.docker_service import ROBOT_TESTS_DIR
+
+logger = logging.getLogger(__name__)
+
+LIVE_EVENTS_FILENAME = "events.jsonl"
+
+_LISTENER_SOURCE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'robot_listeners', 'LiveEventsListener.py')
+_LISTENER_DIRNAME = ".listeners"
+_LISTENER_CONTAINER_PATH = f"/app/robot_tests/{_LISTENER_DIRNAME}/LiveEventsListener.py"
+
+_listener_installed = False
+_listener_lock = threading.Lock()
+
+_STATUS_ICONS = {"PASS": "✅", "FAIL": "❌", "SKIP": "⏭️", "NOT RUN": "⏭️"}
+
+
+def install_listener() -> None:
+    """Copy the listener into the shared robot_tests volume (once per process)."""
+    global _listener_installed
+    if _listener_installed:
+        return
+    with _listener_lock:
+        if _listener_installed:
+            return
+        target_dir = os.path.join(ROBOT_TESTS_DIR, _LISTENER_DIRNAME)
+        os.makedirs(target_dir, exist_ok=True)
+        shutil.copyfile(_LISTENER_SOURCE, os.path.join(target_dir, os.path.basename(_LISTENER_SOURCE)))
+        _listener_installed = True
+        logger.info(f"🎧 LIVE EVENTS: Installed listener into {target_dir}")
+
+
+def listener_arguments(run_id: str, max_keyword_depth: int) -> List[str]:
+    """
+    Build robot command-line arguments that attach the live events listener.
+
+    Args:
+        run_id: Run identifier (events go to robot_tests/<run_id>/events.jsonl)
+        max_keyword_depth: Deepest keyword nesting level to report (0 = tests only)
+    """
+    install_listener()
+    events_path = f"/app/robot_tests/{run_id}/{LIVE_EVENTS_FILENAME}"
+    return ["--listener", f"{_LISTENER_CONTAINER_PATH}:{events_path}:{max_keyword_depth}"]
+
+
+def describe_event(event: Dict[str, Any]) -> Optional[str]:
+    """Render a listener event as a short human-readable progress message."""
+    event_type = event.get("type")
+    name = event.get("name", "")
+    status = event.get("status", "")
+    icon = _STATUS_ICONS.get(status, "•")
+    elapsed = event.get("elapsed")
+    timing = f" ({elapsed:.1f}s)" if isinstance(elapsed, (int, float)) else ""
+
+    if event_type == "suite_start":
+        return f"📂 Suite '{name}' started ({event.get('tests', 0)} tests)"
+    if event_type == "test_start":
+        return f"▶️ Test '{name}' started"
+    if event_type == "test_end":
+        message = f"{icon} Test '{name}' {status}{timing}"
+        if status == "FAIL" and event.get("message"):
+            message += f": {event['message']}"
+        return message
+    if event_type == "keyword_start":
+        return f"{'  ' * event.get('depth', 1)}↳ {name}"
+    if event_type == "keyword_end":
+        return f"{'  ' * event.get('depth', 1)}{icon} {name}{timing}"
+    return None
+
+
+class LiveEventTailer:
+    """
+    Follows a JSON-lines events file from a background thread.
+
+    Parsed events are passed to ``on_event`` in file order. ``stop()`` reads
+    whatever is left in the file before returning, so every event written
+    by the run is delivered before the caller publishes the final result.
+    """
+
+    def __init__(self, events_path: str, on_event: Callable[[Dict[str, Any]], None],
+                 poll_interval: float = 0.2):
+        """
+        Args:
+            events_path: Host path of the events file
+            on_event: Callback for each parsed event (called on the tailer thread)
+            poll_interval: Seconds between reads while the file is idle
+        """
+        self.events_path = events_path
+        self.on_event = on_event
+        self.poll_interval = poll_interval
+        self._offset = 0
+        self._partial = ""
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start tailing, discarding a stale events file from an earlier run with the same id."""
+        try:
+            os.remove(self.events_path)
+        except FileNotFoundError:
+            pass
+        self._thread = threading.Thread(target=self._run, name="live-events", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop tailing after delivering all remaining events."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.poll_interval):
+            self._read_new_lines()
+        self._read_new_lines()
+
+    def _read_new_lines(self) -> None:
+        try:
+            with open(self.events_path, "r", encoding="utf-8") as f:
+                f.seek(self._offset)
+                chunk = f.read()
+                self._offset = f.tell()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.debug(f"LIVE EVENTS: Could not read {self.events_path}: {e}")
+            return
+
+        lines = (self._partial + chunk).split("\n")
+        # The last element is an incomplete line (or empty) until its newline is written
+        self._partial = lines.pop()
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                logger.debug(f"LIVE EVENTS: Skipping malformed event line: {line[:200]}")
+                continue
+            try:
+                self.on_event(event)
+            except Exception as e:
+                logger.warning(f"⚠️ LIVE EVENTS: Event callback failed: {e}")
+
+
+def live_events_path(run_id: str) -> str:
+    """Host path of the events file for a run."""
+    return os.path.join(ROBOT_TESTS_DIR, run_id, LIVE_EVENTS_FILENAME)
@@ -0,0 +1,143 @@
+"""
+Single-pass streaming parser for Robot Framework output.xml files.
+
+``ET.parse`` builds the whole document tree in memory, and long data-driven
+runs produce output.xml files of hundreds of MB. This parser walks the file
+once with ``iterparse`` and releases every element as soon as it has been
+read, so memory stays bounded by the nesting depth (plus the failures it
+records) regardless of file size.
+
+One pass produces everything the execution service needs:
+
+- Total pass/fail/skip statistics
+- Per-test name, status, timing and failure message
+- Failing keywords (name and message) of each failed test, in document order
+"""
+
+import logging
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RobotTestResult:
+    """Status of a single test case."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = "UNKNOWN"
+        self.message = ""
+        self.start_time = ""
+        self.end_time = ""
+        self.elapsed = ""
+        # (keyword name, failure message) for every failing keyword, outermost first
+        self.failed_keywords: List[Tuple[str, str]] = []
+
+    @property
+    def passed(self) -> bool:
+        return self.status == "PASS"
+
+
+class RobotOutputSummary:
+    """Everything extracted from one output.xml pass."""
+
+    def __init__(self):
+        self.suite_name: Optional[str] = None
+        self.tests: List[RobotTestResult] = []
+        self.statistics: Optional[Dict[str, int]] = None
+
+    @property
+    def pass_count(self) -> int:
+        if self.statistics is not None:
+            return self.statistics["pass"]
+        return sum(1 for t in self.tests if t.status == "PASS")
+
+    @property
+    def fail_count(self) -> int:
+        if self.statistics is not None:
+            return self.statistics["fail"]
+        return sum(1 for t in self.tests if t.status == "FAIL")
+
+    @property
+    def all_passed(self) -> bool:
+        """True if at least one test passed and none failed."""
+        return self.fail_count == 0 and self.pass_count > 0
+
+
+def parse_output_xml(output_xml_path: str) -> RobotOutputSummary:
+    """
+    Parse an output.xml file in a single streaming pass.
+
+    Only the top-level status of each test counts towards its result, so a
+    FAIL inside "Run Keyword And Ignore Error" does not mark the test failed.
+
+    Args:
+        output_xml_path: Path to output.xml
+
+    Returns:
+        RobotOutputSummary
+
+    Raises:
+        ET.ParseError: If the file is not well-formed XML
+        OSError: If the file cannot be read
+    """
+    summary = RobotOutputSummary()
+    stack: List[ET.Element] = []
+    current_test: Optional[RobotTestResult] = None
+    # Open keywords of the current test: [document order, name, status, message]
+    open_keywords: List[list] = []
+    failed_keywords: List[Tuple[int, str, str]] = []
+    keyword_order = 0
+
+    for event, elem in ET.iterparse(output_xml_path, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            stack.append(elem)
+            if tag == "suite" and summary.suite_name is None:
+                summary.suite_name = elem.get("name", "Unknown Suite")
+            elif tag == "test":
+                current_test = RobotTestResult(elem.get("name", "Unknown Test"))
+                failed_keywords = []
+                keyword_order = 0
+            elif tag == "kw" and current_test is not None:
+                open_keywords.append([keyword_order, elem.get("name", "Unknown Keyword"), None, ""])
+                keyword_order += 1
+            continue
+
+        stack.pop()
+        parent = stack[-1] if stack else None
+
+        if tag == "status" and parent is not None and current_test is not None:
+            status = elem.get("status", "UNKNOWN")
+            message = (elem.text or "").strip()
+            if parent.tag == "test":
+                current_test.status = status
+                current_test.message = message
+                # RF < 7 uses starttime/endtime, RF 7 uses start/elapsed
+                current_test.start_time = elem.get("starttime") or elem.get("start", "")
+                current_test.end_time = elem.get("endtime", "")
+                current_test.elapsed = elem.get("elapsed", "")
+            elif parent.tag == "kw" and open_keywords:
+                open_keywords[-1][2] = status
+                open_keywords[-1][3] = message
+        elif tag == "kw" and current_test is not None and open_keywords:
+            order, name, status, message = open_keywords.pop()
+            if status == "FAIL":
+                failed_keywords.append((order, name, message))
+        elif tag == "test" and current_test is not None:
+            current_test.failed_keywords = [(name, message) for _, name, message in sorted(failed_keywords)]
+            summary.tests.append(current_test)
+            current_test = None
+            open_keywords = []
+        elif (tag == "stat" and parent is not None and parent.tag == "total"
+              and summary.statistics is None):
+            summary.statistics = {key: int(elem.get(key, "0")) for key in ("pass", "fail", "skip")}
+
+        # Release the element and its already-processed siblings
+        elem.clear()
+        if parent is not None:
+            del parent[:]
+
+    logger.debug(f"Parsed {len(summary.tests)} tests from {output_xml_path}")
+    return summary
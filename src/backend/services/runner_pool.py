@@ -0,0 +1,322 @@
+"""
+Warm pool of Robot Framework runner containers.
+
+Creating, starting and removing a fresh container per execution (plus the
+browser cold start inside it) dominates the latency of short tests. This
+module keeps a small pool of long-lived runner containers that idle on
+``sleep infinity`` and executes ``robot`` inside them via ``exec``.
+
+- Containers mount the shared ``robot_tests`` volume; each run writes to its
+  own ``/app/robot_tests/<run_id>`` output directory, which keeps runs isolated
+- Containers are health-checked before every run and replaced when dead
+- Containers are recycled after a configurable number of runs so leaked
+  browser processes and temp files do not accumulate
+- Runners that fail to start are retried in the background, so the pool
+  grows back to its size once Docker recovers
+- When every container is busy, callers fall back to an ephemeral container
+- Containers are labelled with their pool id and owning process, so several
+  API processes or replicas sharing one Docker daemon never remove each
+  other's runners
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+import docker
+
+from src.backend.services.docker_service import IMAGE_TAG, ROBOT_TESTS_DIR, log_docker_operation
+
+logger = logging.getLogger(__name__)
+
+POOL_CONTAINER_PREFIX = "robot-runner-"
+POOL_LABEL = "nlrf.runner-pool"
+# Id of the RunnerContainerPool instance that started the container
+POOL_ID_LABEL = "nlrf.runner-pool.id"
+# "<hostname>:<pid>" of the API process that owns the container
+POOL_OWNER_LABEL = "nlrf.runner-pool.owner"
+
+# Minimum seconds between attempts to start missing runners
+RUNNER_REFILL_RETRY_SECONDS = 30.0
+
+
+def _process_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class PooledRunner:
+    """A warm runner container and its usage counter."""
+
+    def __init__(self, container):
+        self.container = container
+        self.runs = 0
+
+    @property
+    def name(self) -> str:
+        return getattr(self.container, 'name', self.container.id)
+
+
+class RunnerContainerPool:
+    """
+    Fixed-size pool of pre-started runner containers.
+
+    Thread-safe: acquire()/release() may be called from any Docker worker thread.
+    """
+
+    def __init__(self, client: docker.DockerClient, size: int = 2, max_runs_per_container: int = 20):
+        """
+        Initialize the pool and start its containers.
+
+        Args:
+            client: Docker client
+            size: Number of warm containers to keep
+            max_runs_per_container: Recycle a container after this many runs
+        """
+        self.client = client
+        self.size = size
+        self.max_runs_per_container = max_runs_per_container
+        self.pool_id = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._idle: List[PooledRunner] = []
+        self._busy = 0
+        # Runners in existence (idle or busy); below size means some failed to start
+        self._live = 0
+        self._closed = False
+        self._refilling = False
+        self._last_refill = time.monotonic()
+
+        self._remove_stale_containers()
+        for _ in range(size):
+            runner = self._start_runner()
+            if runner:
+                self._idle.append(runner)
+        self._live = len(self._idle)
+        logger.info(f"🐳 RUNNER POOL: Started {self._live}/{size} warm runner containers")
+
+    def acquire(self) -> Optional[PooledRunner]:
+        """
+        Take a healthy idle runner from the pool.
+
+        Returns:
+            PooledRunner, or None if all runners are busy (caller should fall back
+            to an ephemeral container)
+        """
+        self._schedule_refill()
+        while True:
+            with self._lock:
+                if self._closed or not self._idle:
+                    return None
+                runner = self._idle.pop()
+                self._busy += 1
+
+            if self._is_healthy(runner):
+                return runner
+
+            log_docker_operation("runner_pool_unhealthy",
+                                 f"Runner {runner.name} failed health check, replacing it", "warning")
+            replacement = self._replace(runner)
+            with self._lock:
+                self._busy -= 1
+                if replacement:
+                    self._idle.append(replacement)
+                else:
+                    self._live -= 1
+
+    def release(self, runner: PooledRunner) -> None:
+        """Return a runner to the pool, recycling it if it reached its run limit."""
+        runner.runs += 1
+        if runner.runs >= self.max_runs_per_container:
+            logger.info(f"♻️ RUNNER POOL: Recycling {runner.name} after {runner.runs} runs")
+            runner = self._replace(runner)
+
+        with self._lock:
+            self._busy -= 1
+            if runner is None:
+                self._live -= 1
+                return
+            closed = self._closed
+            if not closed:
+                self._idle.append(runner)
+        if closed:
+            self._remove(runner)
+
+    def run_robot(self, runner: PooledRunner, robot_command: List[str]) -> Tuple[int, str]:
+        """
+        Execute a robot command inside a warm runner container.
+
+        Args:
+            runner: Runner obtained from acquire()
+            robot_command: Full robot command line
+
+        Returns:
+            Tuple of (exit_code, combined stdout/stderr output)
+        """
+        logger.info(f"🚀 RUNNER POOL: Executing in {runner.name}: {' '.join(robot_command)}")
+        exit_code, output = runner.container.exec_run(cmd=robot_command, workdir="/app")
+        if isinstance(output, bytes):
+            output = output.decode('utf-8', errors='replace')
+        return exit_code, output or ""
+
+    def get_stats(self) -> dict:
+        """Return pool utilization statistics."""
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "busy": self._busy,
+                "missing": max(0, self.size - self._live),
+                "max_runs_per_container": self.max_runs_per_container,
+            }
+
+    def shutdown(self) -> None:
+        """Remove all idle containers; busy ones are removed when released."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for runner in idle:
+            self._remove(runner)
+        logger.info("🐳 RUNNER POOL: Shut down")
+
+    def _start_runner(self) -> Optional[PooledRunner]:
+        name = f"{POOL_CONTAINER_PREFIX}{uuid.uuid4().hex[:8]}"
+        try:
+            container = self.client.containers.run(
+                image=IMAGE_TAG,
+                command=["sleep", "infinity"],
+                volumes={os.path.abspath(ROBOT_TESTS_DIR): {'bind': '/app/robot_tests', 'mode': 'rw'}},
+                working_dir="/app",
+                detach=True,
+                auto_remove=False,
+                name=name,
+                labels={POOL_LABEL: "true", POOL_ID_LABEL: self.pool_id, POOL_OWNER_LABEL: _process_owner()},
+            )
+            log_docker_operation("runner_pool_start", f"Started warm runner {name} ({container.id[:12]})")
+            return PooledRunner(container)
+        except docker.errors.DockerException as e:
+            log_docker_operation("runner_pool_start", f"Failed to start warm runner {name}: {e}", "warning")
+            return None
+
+    def _schedule_refill(self) -> None:
+        """Start missing runners in a background thread (at most every RUNNER_REFILL_RETRY_SECONDS)."""
+        with self._lock:
+            if (self._closed or self._refilling or self._live >= self.size
+                    or time.monotonic() - self._last_refill < RUNNER_REFILL_RETRY_SECONDS):
+                return
+            self._refilling = True
+            self._last_refill = time.monotonic()
+        threading.Thread(target=self._refill, name="runner-pool-refill", daemon=True).start()
+
+    def _refill(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if self._closed or self._live >= self.size:
+                        return
+                runner = self._start_runner()
+                if runner is None:
+                    return
+                with self._lock:
+                    closed = self._closed
+                    if not closed:
+                        self._idle.append(runner)
+                        self._live += 1
+                if closed:
+                    self._remove(runner)
+                    return
+                logger.info(f"🐳 RUNNER POOL: Replaced missing runner with {runner.name}")
+        finally:
+            with self._lock:
+                self._refilling = False
+
+    def _is_healthy(self, runner: PooledRunner) -> bool:
+        try:
+            runner.container.reload()
+            return runner.container.status == "running"
+        except docker.errors.DockerException:
+            return False
+
+    def _replace(self, runner: PooledRunner) -> Optional[PooledRunner]:
+        self._remove(runner)
+        if self._closed:
+            return None
+        return self._start_runner()
+
+    def _remove(self, runner: PooledRunner) -> None:
+        try:
+            runner.container.remove(force=True)
+        except docker.errors.NotFound:
+            pass
+        except docker.errors.DockerException as e:
+            log_docker_operation("runner_pool_remove", f"Failed to remove {runner.name}: {e}", "warning")
+
+    def _remove_stale_containers(self) -> None:
+        """
+        Remove pool containers left behind by an exited process on this host.
+
+        Runners owned by a running process (this one, another worker, or
+        another API replica on the same Docker daemon) are left alone.
+        """
+        hostname = socket.gethostname()
+        try:
+            for container in self.client.containers.list(all=True, filters={"label": POOL_LABEL}):
+                owner = (container.labels or {}).get(POOL_OWNER_LABEL, "")
+                host, _, pid = owner.rpartition(":")
+                if host != hostname or not pid.isdigit():
+                    continue
+                if _process_alive(int(pid)):
+                    continue
+                container.remove(force=True)
+                logger.info(f"🧹 RUNNER POOL: Removed stale runner {container.name}")
+        except docker.errors.DockerException as e:
+            logger.warning(f"⚠️ RUNNER POOL: Could not clean up stale runners: {e}")
+
+
+# Global instance
+_runner_pool: Optional[RunnerContainerPool] = None
+_runner_pool_lock = threading.Lock()
+
+
+def get_runner_pool(client: docker.DockerClient) -> Optional[RunnerContainerPool]:
+    """
+    Get the global runner pool, creating it on first use.
+
+    Returns:
+        RunnerContainerPool, or None if pooling is disabled (EXECUTION_POOL_SIZE=0)
+    """
+    global _runner_pool
+    from src.backend.core.config import settings
+
+    if settings.EXECUTION_POOL_SIZE <= 0:
+        return None
+    if _runner_pool is None:
+        with _runner_pool_lock:
+            if _runner_pool is None:
+                _runner_pool = RunnerContainerPool(
+                    client,
+                    size=settings.EXECUTION_POOL_SIZE,
+                    max_runs_per_container=settings.EXECUTION_POOL_MAX_RUNS,
+                )
+    return _runner_pool
+
+
+def shutdown_runner_pool() -> None:
+    """Shut down the global runner pool (on application shutdown or image rebuild)."""
+    global _runner_pool
+    with _runner_pool_lock:
+        if _runner_pool is not None:
+            _runner_pool.shutdown()
+            _runner_pool = None
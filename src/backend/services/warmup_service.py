@@ -0,0 +1,171 @@
+"""
+Startup warm-up of the expensive, lazily initialized subsystems.
+
+Without warm-up, the first request after a deploy pays for libdoc
+extraction, the embedding model load, the Chroma collection check and the
+Docker image check, which together take tens of seconds. When
+STARTUP_WARMUP_ENABLED is set, the application runs these steps in parallel
+in the background right after startup. ``/ready`` reports 503 until they
+have finished, so load balancers only route traffic to hot nodes.
+
+A failed step is reported by ``/ready`` but does not keep the node out of
+rotation. The subsystem then initializes on first use, as it does without
+warm-up.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+
+class WarmupState:
+    """Progress and outcome of the startup warm-up."""
+
+    def __init__(self):
+        self.enabled = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.checks: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def ready(self) -> bool:
+        """True once warm-up has finished (or immediately when it is disabled)."""
+        return not self.enabled or self.finished_at is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        duration = None
+        if self.started_at is not None:
+            duration = round((self.finished_at or time.monotonic()) - self.started_at, 2)
+        return {
+            "ready": self.ready,
+            "warmup_enabled": self.enabled,
+            "warmup_seconds": duration,
+            "checks": self.checks,
+        }
+
+
+_warmup_state = WarmupState()
+
+
+def get_warmup_state() -> WarmupState:
+    """Get the global warm-up state."""
+    return _warmup_state
+
+
+def _warm_library_documentation() -> str:
+    from src.backend.core.config import settings
+    from src.backend.crew_ai.library_context import get_library_context
+    from src.backend.crew_ai.library_context.dynamic_context import DynamicLibraryDocumentation
+
+    # Renders the shared context of every agent role (loads the libdoc spec)
+    library_name = get_library_context(settings.ROBOT_LIBRARY).prerender().library_name
+    doc_data = DynamicLibraryDocumentation(library_name).get_library_documentation()
+    return f"{library_name} {doc_data.get('version', 'unknown')}: {len(doc_data.get('keywords', []))} keywords"
+
+
+def _warm_optimization_components() -> str:
+    from src.backend.core.config import settings
+    from src.backend.crew_ai.library_context import get_library_context
+    from src.backend.crew_ai.optimization import get_component_registry
+
+    registry = get_component_registry()
+    # Dummy embed forces the model weights into memory
+    registry.embedding_function(["warm-up"])
+    library_name = get_library_context(settings.ROBOT_LIBRARY).library_name
+    vector_store = registry.get_vector_store(library_name)
+    # Name trie and BM25 index of the keyword search tool
+    vector_store.get_hybrid_retriever(library_name)
+    registry.get_pattern_matcher()
+    if settings.OPTIMIZATION_CONTEXT_PRUNING_ENABLED:
+        # Category centroids are embedded once per library version, then loaded
+        registry.get_context_pruner().prepare(library_name)
+    keyword_count = vector_store.create_or_get_collection(library_name).count()
+    return f"embedding model loaded, {keyword_count} keywords in {library_name} collection"
+
+
+def _warm_docker_image() -> str:
+    from src.backend.services.docker_service import IMAGE_TAG, build_image, get_docker_client
+
+    client = get_docker_client(ping=True)
+    # build_image verifies the image, pulling or building it when missing (raises on failure)
+    for _ in build_image(client):
+        pass
+    return f"image '{IMAGE_TAG}' available"
+
+
+def _warm_browser_use_service() -> str:
+    import requests
+    from src.backend.core.config import settings
+
+    response = requests.get(f"{settings.BROWSER_USE_SERVICE_URL}/health", timeout=10)
+    response.raise_for_status()
+    return f"{settings.BROWSER_USE_SERVICE_URL} healthy"
+
+
+async def _run_check(name: str, func: Callable[[], str], timeout: float, executor=None) -> None:
+    state = _warmup_state
+    state.checks[name] = {"status": STATUS_PENDING}
+    started = time.monotonic()
+    loop = asyncio.get_running_loop()
+    try:
+        detail = await asyncio.wait_for(loop.run_in_executor(executor, func), timeout)
+        state.checks[name] = {"status": STATUS_OK, "seconds": round(time.monotonic() - started, 2),
+                              "detail": detail}
+        logger.info(f"🔥 WARM-UP: {name} ready in {state.checks[name]['seconds']}s ({detail})")
+    except asyncio.TimeoutError:
+        state.checks[name] = {"status": STATUS_FAILED, "seconds": round(time.monotonic() - started, 2),
+                              "error": f"Timed out after {timeout}s"}
+        logger.warning(f"⚠️ WARM-UP: {name} timed out after {timeout}s")
+    except Exception as e:
+        state.checks[name] = {"status": STATUS_FAILED, "seconds": round(time.monotonic() - started, 2),
+                              "error": str(e)}
+        logger.warning(f"⚠️ WARM-UP: {name} failed: {e}")
+
+
+def schedule_startup_warmup() -> "asyncio.Task":
+    """
+    Start the warm-up in a background task (called from the startup handler).
+
+    The state is marked enabled before the task is scheduled, so /ready
+    answers 503 from the first request until the warm-up has finished.
+    """
+    _warmup_state.enabled = True
+    return asyncio.create_task(run_startup_warmup())
+
+
+async def run_startup_warmup() -> None:
+    """Run all warm-up steps in parallel and mark the node ready when they have finished."""
+    from src.backend.core.config import settings
+    from src.backend.services.docker_service import get_docker_executor
+
+    state = _warmup_state
+    state.enabled = True
+    state.started_at = time.monotonic()
+    timeout = settings.STARTUP_WARMUP_TIMEOUT
+    logger.info("🔥 WARM-UP: Starting startup warm-up...")
+
+    checks = [
+        _run_check("library_documentation", _warm_library_documentation, timeout),
+        _run_check("docker_image", _warm_docker_image, timeout, get_docker_executor()),
+        _run_check("browser_use_service", _warm_browser_use_service, timeout),
+    ]
+    if settings.OPTIMIZATION_ENABLED:
+        checks.append(_run_check("optimization_components", _warm_optimization_components, timeout))
+    else:
+        state.checks["optimization_components"] = {"status": STATUS_SKIPPED, "detail": "OPTIMIZATION_ENABLED=False"}
+
+    try:
+        await asyncio.gather(*checks)
+    finally:
+        state.finished_at = time.monotonic()
+        failed = [name for name, check in state.checks.items() if check["status"] == STATUS_FAILED]
+        logger.info(f"✅ WARM-UP: Finished in {round(state.finished_at - state.started_at, 2)}s"
+                    + (f" (failed: {', '.join(failed)})" if failed else ""))
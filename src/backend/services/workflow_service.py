@@ -4,13 +4,21 @@ import logging
 import json
 import re
 import asyncio
-from queue import Queue, Empty
-from threading import Thread
-from typing import Generator, Dict, Any
+import threading
+from typing import Callable, Generator, Dict, Any, List, Optional
 from datetime import datetime
 
-from src.backend.crew_ai.crew import run_crew, extract_url_from_query
-from src.backend.services.docker_service import get_docker_client, build_image, run_test_in_container
+from src.backend.crew_ai.crew import run_crew
+from src.backend.crew_ai.query_analysis import QueryAnalysis, extract_url_from_query
+from src.backend.crew_ai.stage_progress import GenerationCancelledError
+from src.backend.services.docker_service import (
+    get_docker_client, build_image, run_test_in_container, get_docker_executor, reset_docker_client
+)
+from src.backend.services.live_events import LiveEventTailer, describe_event as describe_live_event, live_events_path
+from src.backend.services.event_channel import WorkflowEventChannel, HEARTBEAT
+from src.backend.services.generation_executor import get_generation_executor, GenerationQueueFullError
+from src.backend.services.generation_cache import get_generation_cache, normalize_query
+from src.backend.services.generation_flight import GenerationFlightRegistry, FLIGHT_ENDED
 from src.backend.config.logging_config import EMOJI
 from src.backend.core.temp_metrics_storage import get_temp_metrics_storage
 from src.backend.core.workflow_metrics import (
@@ -27,7 +35,55 @@ logging.basicConfig(
 )
 
 
-def run_agentic_workflow(natural_language_query: str, model_provider: str, model_name: str) -> Generator[Dict[str, Any], None, None]:
+def cached_generation_events(natural_language_query: str, model_name: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Look up the generation cache and build the workflow events for a hit.
+
+    A hit is recorded in the workflow metrics as a zero-cost workflow with
+    generation_cache_hit=True.
+
+    Returns:
+        Events to stream for a cache hit, or None on a miss (or when the cache is disabled)
+    """
+    from src.backend.core.config import settings
+
+    cache = get_generation_cache()
+    if cache is None:
+        return None
+
+    cached = cache.get(natural_language_query, model_name, settings.ROBOT_LIBRARY)
+    if cached is None:
+        return None
+
+    workflow_id = str(uuid.uuid4())
+    robot_code = cached["robot_code"]
+    logging.info(f"⚡ Generation cache hit (workflow {workflow_id}) for query: '{natural_language_query[:50]}...'")
+
+    try:
+        get_workflow_metrics_collector().record_workflow(WorkflowMetrics(
+            workflow_id=workflow_id,
+            timestamp=datetime.now(),
+            url=extract_url_from_query(natural_language_query),
+            total_llm_calls=0,
+            total_cost=0.0,
+            execution_time=0.0,
+            generation_cache_hit=True,
+        ))
+    except Exception as metrics_error:
+        logging.error(f"❌ Failed to record cache hit metrics: {metrics_error}")
+
+    lines = len(robot_code.split('\n'))
+    return [
+        {"status": "running", "message": f"{EMOJI['success']} Found previously generated test code for this request ({lines} lines).", "progress": 100},
+        {"status": "complete", "robot_code": robot_code, "workflow_id": workflow_id, "cached": True,
+         "message": f"{EMOJI['success']} Test generation complete (served from cache)."},
+    ]
+
+
+def run_agentic_workflow(natural_language_query: str, model_provider: str, model_name: str,
+                         bypass_cache: bool = False,
+                         progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                         cancel_event: Optional[threading.Event] = None) -> Generator[Dict[str, Any], None, None]:
     """
     Orchestrates the CrewAI workflow to generate Robot Framework code,
     yielding progress updates and the final code.
@@ -43,7 +99,17 @@ def run_agentic_workflow(natural_language_query: str, model_provider: str, model
         natural_language_query: User's test description
         model_provider: "local" or "online"
         model_name: Model identifier
+        bypass_cache: The caller skipped the generation cache lookup (the validated
+            result still refreshes the cache entry)
+        progress_callback: Receives stage progress events while the crew runs. Without
+            it, stage events are yielded after the crew has finished.
+        cancel_event: When set, the crew run is aborted at the next agent step
+
+    Cache lookups happen before a generation worker is taken (see
+    cached_generation_events); this function only stores validated results.
     """
+    from src.backend.core.config import settings
+
     logging.info("--- Starting CrewAI Workflow with Vision Integration ---")
     
     # Generate unique workflow ID for metrics tracking
@@ -67,27 +133,29 @@ def run_agentic_workflow(natural_language_query: str, model_provider: str, model
     try:
         # Start AI workflow
         yield {"status": "running", "message": f"{EMOJI['ai']} Starting AI workflow...", "progress": 5}
-        
-        # Stage 1: Planning (10-25%)
-        yield {"status": "running", "message": f"{EMOJI['ai']} Planning test steps...", "progress": 10}
-        yield {"status": "info", "message": "💡 AI breaks complex tasks into atomic steps for better accuracy", "progress": 10}
-        
-        # Stage 2: Identifying (25-50%)
-        yield {"status": "running", "message": f"{EMOJI['search']} Identifying page elements...", "progress": 30}
-        yield {"status": "info", "message": "🎯 Using AI detection with 95%+ accuracy", "progress": 30}
-        
-        # Run CrewAI workflow (this takes most of the time - 10-15 seconds)
-        # User sees progress messages above while this runs
+
+        # Stages (planner 10-25%, identifier 25-50%, assembler 50-75%, validator 75-90%)
+        # are reported by the crew's task/step callbacks while it runs
+        buffered_stage_events: List[Dict[str, Any]] = []
+        stage_timings: Dict[str, Dict[str, Any]] = {}
+
+        def on_stage_event(event: Dict[str, Any]):
+            if event.get("stage_event") == "end":
+                stage_timings[event["agent_stage"]] = {
+                    "duration_seconds": event["duration_seconds"],
+                    "tokens": event["tokens"],
+                }
+            if progress_callback is not None:
+                progress_callback(event)
+            else:
+                buffered_stage_events.append(event)
+
+        # Query facts (URL, embedding, predictions) are computed once and shared with the crew
+        query_analysis = QueryAnalysis.from_query(natural_language_query)
         validation_output, crew_with_results, optimization_metrics = run_crew(
-            natural_language_query, model_provider, model_name, library_type=None, workflow_id=workflow_id)
-        
-        # Stage 3: Generating (50-75%)
-        yield {"status": "running", "message": f"{EMOJI['code']} Generating test code...", "progress": 60}
-        yield {"status": "info", "message": "⚡ Browser Library is 2-3x faster than Selenium", "progress": 60}
-        
-        # Stage 4: Validating (75-95%)
-        yield {"status": "running", "message": f"{EMOJI['validate']} Validating code...", "progress": 85}
-        yield {"status": "info", "message": "🔬 Validating syntax, structure, and best practices", "progress": 85}
+            natural_language_query, model_provider, model_name, library_type=None, workflow_id=workflow_id,
+            progress_callback=on_stage_event, cancel_event=cancel_event, query_analysis=query_analysis)
+        yield from buffered_stage_events
 
         # Extract robot code from task[2] (code_assembler)
         # With output_pydantic=AssemblyOutput, code is in output.pydantic.code
@@ -267,6 +335,11 @@ def run_agentic_workflow(natural_language_query: str, model_provider: str, model
             logging.info(
                 "CrewAI workflow complete. Code validation successful.")
 
+            generation_cache = get_generation_cache()
+            if generation_cache is not None:
+                generation_cache.put(natural_language_query, model_name, settings.ROBOT_LIBRARY,
+                                     robot_code, validation_data)
+
             # ============================================
             # NEW: Collect and merge metrics
             # ============================================
@@ -322,7 +395,7 @@ def run_agentic_workflow(natural_language_query: str, model_provider: str, model
                 unified_metrics = WorkflowMetrics(
                     workflow_id=workflow_id,
                     timestamp=datetime.now(),
-                    url=extract_url_from_query(natural_language_query),
+                    url=query_analysis.url,
                     
                     # Totals
                     total_llm_calls=crewai_metrics['llm_calls'] + browser_llm_calls,
@@ -357,6 +430,12 @@ def run_agentic_workflow(natural_language_query: str, model_provider: str, model
                     
                     # Per-element approach metrics for pattern analysis
                     element_approach_metrics=browser_metrics.get('element_approach_metrics', []),
+
+                    # Generation cache miss (None when the cache was bypassed or is disabled)
+                    generation_cache_hit=None if bypass_cache or generation_cache is None else False,
+
+                    # Per-stage wall time and tokens from the crew callbacks
+                    stage_timings=stage_timings or None,
                 )
                 
                 # 4. Record unified metrics
@@ -396,6 +475,13 @@ def run_agentic_workflow(natural_language_query: str, model_provider: str, model
                 f"CrewAI workflow finished, but code validation failed. Reason: {validation_data.get('reason')}")
             yield {"status": "error", "message": f"Code validation failed: {validation_data.get('reason')}"}
 
+    except GenerationCancelledError as e:
+        logging.info(f"🛑 {e}")
+        try:
+            get_temp_metrics_storage().delete_temp_file(workflow_id)
+        except Exception:
+            pass
+        yield {"status": "error", "message": str(e)}
     except (json.JSONDecodeError, AttributeError, ValueError) as e:
         logging.error(
             "Failed to generate valid Robot Framework code." + str(e))
@@ -420,20 +506,145 @@ def run_agentic_workflow(natural_language_query: str, model_provider: str, model
     
 
 
-def run_workflow_in_thread(queue: Queue, user_query: str, model_provider: str, model_name: str):
-    """Runs the synchronous agentic workflow and puts results in a queue."""
+def run_workflow_in_thread(channel: WorkflowEventChannel, user_query: str, model_provider: str, model_name: str,
+                           bypass_cache: bool = False, cancel_event: Optional[threading.Event] = None):
+    """Runs the synchronous agentic workflow (on a generation worker) and publishes results to the event channel."""
     try:
-        # Run workflow and put all yielded events into queue
-        for event in run_agentic_workflow(user_query, model_provider, model_name):
-            queue.put(event)
+        # Run workflow and publish all yielded events (and live stage events) to the SSE consumer
+        for event in run_agentic_workflow(user_query, model_provider, model_name, bypass_cache,
+                                          progress_callback=channel.publish, cancel_event=cancel_event):
+            channel.publish(event)
     except Exception as e:
         logging.error(f"Exception in workflow thread: {e}")
-        queue.put({"status": "error", "message": f"Workflow thread failed: {e}"})
+        channel.publish({"status": "error", "message": f"Workflow thread failed: {e}"})
+    finally:
+        channel.close()
+
+
+# In-flight generations by coalescing key (accessed only from the event loop)
+_generation_flights = GenerationFlightRegistry()
+
+
+def _generation_flight_key(user_query: str, model_name: str) -> str:
+    """Coalescing key: requests with the same key produce the same generation."""
+    from src.backend.core.config import settings
+    return "\x1f".join([normalize_query(user_query), model_name, settings.ROBOT_LIBRARY])
+
+
+def has_inflight_generation(user_query: str, model_name: str) -> bool:
+    """Return True if an identical generation is running (a new request would join it)."""
+    return _generation_flights.contains(_generation_flight_key(user_query, model_name))
+
+
+def get_generation_flight_stats() -> Dict[str, int]:
+    """Return single-flight statistics (in-flight generations, coalesced requests)."""
+    return _generation_flights.get_stats()
+
+
+async def _stream_generation_events(user_query: str, model_provider: str, model_name: str, result: Dict[str, Any],
+                                    bypass_cache: bool = False,
+                                    cached_events: Optional[List[Dict[str, Any]]] = None):
+    """
+    Run the agentic workflow on the bounded generation pool and yield SSE frames for its events.
+
+    Events are awaited from an asyncio-native channel, so they reach the client as soon
+    as the worker publishes them. Heartbeat comments are emitted by the channel's timer
+    only while the stream is idle. While the job waits for a free worker, the executor
+    publishes "queued" events with queue position and estimated wait.
+
+    Concurrent identical requests are coalesced: only the first one runs the workflow,
+    duplicates subscribe to its events and receive the same result and workflow_id.
+
+    Args:
+        user_query: User's test description
+        model_provider: "local" or "online"
+        model_name: Model identifier
+        result: Dict populated with 'robot_code' and 'workflow_id' on successful completion
+        bypass_cache: Skip the generation cache lookup and always run the crew
+        cached_events: Result of a cache lookup the caller already did (events of a hit,
+            [] for a miss); None looks the cache up here
+    """
+    from src.backend.core.config import settings
+
+    if not bypass_cache:
+        if cached_events is None:
+            # Cache hits are served without taking a generation worker (SQLite stays off the event loop)
+            loop = asyncio.get_running_loop()
+            cached_events = await loop.run_in_executor(None, cached_generation_events, user_query, model_name)
+        if cached_events:
+            for event in cached_events:
+                yield f"data: {json.dumps({'stage': 'generation', **event})}\n\n"
+            result["robot_code"] = cached_events[-1]["robot_code"]
+            result["workflow_id"] = cached_events[-1]["workflow_id"]
+            return
+
+    # Single-flight: concurrent identical requests share one running workflow
+    executor = get_generation_executor()
+    key = _generation_flight_key(user_query, model_name)
+    flight = _generation_flights.get(key)
+    if flight is None:
+        channel = WorkflowEventChannel(heartbeat_interval=settings.SSE_HEARTBEAT_INTERVAL)
+        cancel_event = threading.Event()
+        try:
+            ticket = executor.submit(channel, run_workflow_in_thread, channel, user_query, model_provider, model_name,
+                                     bypass_cache, cancel_event)
+        except GenerationQueueFullError as e:
+            logging.warning(f"Generation rejected: {e}")
+            result["error"] = True
+            yield f"data: {json.dumps({'stage': 'generation', 'status': 'error', 'message': str(e), 'retry_after': e.retry_after})}\n\n"
+            return
+        flight = _generation_flights.start(key, channel, ticket, cancel_event)
+
+    events = flight.subscribe()
+    # Set once the flight delivered its final event; until then leaving the loop means
+    # the client disconnected (or the stream failed)
+    finished = False
+    try:
+        while True:
+            event = await events.get()
+            if event is FLIGHT_ENDED:
+                finished = True
+                break
+            if event is HEARTBEAT:
+                yield ": heartbeat\n\n"
+                continue
+
+            if event.get("status") in ("complete", "error"):
+                finished = True
+
+            event_data = {'stage': 'generation', **event}
+            yield f"data: {json.dumps(event_data)}\n\n"
+
+            if event.get("status") == "complete" and "robot_code" in event:
+                result["robot_code"] = event["robot_code"]
+                result["workflow_id"] = event.get("workflow_id")
+                return
+            elif event.get("status") == "error":
+                result["error"] = True
+                return
+    finally:
+        # When every subscribed client went away before the end, free the queue slot if the
+        # job has not started, otherwise stop the running crew at its next step
+        if flight.unsubscribe(events) == 0 and not finished and not flight.done:
+            if executor.cancel(flight.ticket):
+                flight.channel.close()
+            elif flight.cancel_event is not None:
+                logging.info("🛑 All clients left a running generation, cancelling it")
+                flight.cancel_event.set()
+
+    if not result.get("robot_code"):
+        final_error_message = "Agentic workflow finished without generating code."
+        logging.error(final_error_message)
+        result["error"] = True
+        yield f"data: {json.dumps({'stage': 'generation', 'status': 'error', 'message': final_error_message})}\n\n"
 
 
 def _learn_from_successful_test(user_query: str, robot_code: str, test_status: str) -> None:
     """
-    Learn from a successful test execution for pattern optimization.
+    Queue a successful test execution for pattern learning.
+    
+    The background learning queue stores it later, so the execution response
+    does not wait for embedding and database writes.
     
     Args:
         user_query: Original user query (None if not provided)
@@ -448,213 +659,181 @@ def _learn_from_successful_test(user_query: str, robot_code: str, test_status: s
         logging.info("⏭️  Test PASSED but skipping pattern learning - no user query provided")
         return
     
-    try:
-        from src.backend.core.config import settings
-        if not settings.OPTIMIZATION_ENABLED:
-            return
-            
-        from src.backend.crew_ai.optimization import SmartKeywordProvider, QueryPatternMatcher, KeywordVectorStore
-        from src.backend.crew_ai.library_context import get_library_context
-        
-        logging.info("📚 Test PASSED - Learning from successful execution...")
-        
-        # Initialize components
-        library_context = get_library_context(settings.ROBOT_LIBRARY)
-        chroma_store = KeywordVectorStore(persist_directory=settings.OPTIMIZATION_CHROMA_DB_PATH)
-        pattern_matcher = QueryPatternMatcher(db_path=settings.OPTIMIZATION_PATTERN_DB_PATH, chroma_store=chroma_store)
-        smart_provider = SmartKeywordProvider(
-            library_context=library_context,
-            pattern_matcher=pattern_matcher,
-            vector_store=chroma_store
-        )
-        
-        # Learn from the successful execution
-        smart_provider.learn_from_execution(user_query, robot_code)
-        logging.info("✅ Pattern learning completed - learned from PASSED test")
-    except Exception as e:
-        logging.warning(f"⚠️ Failed to learn from execution: {e}")
+    from src.backend.core.config import settings
+    if not settings.OPTIMIZATION_ENABLED:
+        return
+    
+    from src.backend.services.learning_queue import get_learning_queue
+    if get_learning_queue().submit(user_query, robot_code):
+        logging.info("📚 Test PASSED - queued for pattern learning")
 
 
-async def stream_generate_only(user_query: str, model_provider: str, model_name: str) -> Generator[str, None, None]:
-    """
-    Generates Robot Framework test code without executing it.
-    Allows user to review and edit before execution.
-    """
-    robot_code = None
-    q = Queue()
+def _publish_live_event(channel: WorkflowEventChannel, event: Dict[str, Any]):
+    """Relay a Robot Framework listener event to the SSE channel."""
+    message = describe_live_event(event)
+    if message:
+        channel.publish({'status': 'running', 'message': message, 'live_event': event})
+
 
-    workflow_thread = Thread(
-        target=run_workflow_in_thread,
-        args=(q, user_query, model_provider, model_name)
-    )
-    workflow_thread.start()
+def run_execution_in_thread(channel: WorkflowEventChannel, run_id: str, test_filename: str,
+                            abort_on_failure: bool = False):
+    """Runs the blocking Docker build/run steps (on a Docker worker) and publishes events to the event channel."""
+    try:
+        client = get_docker_client()
+        for event in build_image(client):
+            channel.publish(event)
 
-    # Wait for workflow to complete and stream events
-    while workflow_thread.is_alive():
+        # Execute test (healing system removed - locators are validated during generation)
+        logging.info(f"🚀 Executing test: {test_filename}")
+        # Tail the listener's events file so progress is streamed while the test runs
+        tailer = LiveEventTailer(live_events_path(run_id), lambda e: _publish_live_event(channel, e))
+        tailer.start()
         try:
-            event = q.get_nowait()
-            event_data = {'stage': 'generation', **event}
-            yield f"data: {json.dumps(event_data)}\n\n"
+            result = run_test_in_container(client, run_id, test_filename, abort_on_failure)
+        finally:
+            tailer.stop()
+        channel.publish(result)
+    except (ConnectionError, RuntimeError, Exception) as e:
+        logging.error(f"An error occurred during Docker execution: {e}")
+        # Force a reconnect and image re-check on the next run in case Docker restarted
+        reset_docker_client()
+        channel.publish({'status': 'error', 'message': str(e)})
+    finally:
+        channel.close()
 
-            if event.get("status") == "complete" and "robot_code" in event:
-                robot_code = event["robot_code"]
-                workflow_thread.join()
-                break
-            elif event.get("status") == "error":
-                workflow_thread.join()
-                return
-        except Empty:
-            yield ": heartbeat\n\n"
-            await asyncio.sleep(1)
 
-    # Process remaining events in queue
-    if not robot_code:
-        while not q.empty():
-            event = q.get_nowait()
-            event_data = {'stage': 'generation', **event}
-            yield f"data: {json.dumps(event_data)}\n\n"
-            if event.get("status") == "complete" and "robot_code" in event:
-                robot_code = event["robot_code"]
-            elif event.get("status") == "error":
-                return
-        if not robot_code:
-            final_error_message = "Agentic workflow finished without generating code."
-            logging.error(final_error_message)
-            yield f"data: {json.dumps({'stage': 'generation', 'status': 'error', 'message': final_error_message})}\n\n"
-            return
-
-    # Generation complete - return code without execution
-    logging.info("✅ Test generation complete. Ready for user review.")
+# Run IDs with an execution in progress (accessed only from the event loop)
+_active_execution_runs = set()
 
 
-async def stream_execute_only(robot_code: str, user_query: str = None, workflow_id: str = None) -> Generator[str, None, None]:
+async def _stream_execution_events(robot_code: str, run_id: str, user_query: str = None,
+                                   abort_on_failure: bool = False):
     """
-    Executes provided Robot Framework test code in Docker container.
-    Accepts user-edited or manually-written code.
-    
+    Save the test file, execute it in Docker and yield SSE frames for the execution stage.
+
+    All Docker SDK calls (client ping, image check/build, container run and wait) happen on
+    the dedicated Docker executor, so the event loop keeps serving other requests while the
+    test runs. Events are relayed through an asyncio-native channel.
+
     Args:
         robot_code: Robot Framework test code to execute
+        run_id: Unified workflow/run identifier (used for the robot_tests/<run_id> directory)
         user_query: Optional original user query for pattern learning
-        workflow_id: Optional workflow ID from generation phase (for unified ID tracking)
+        abort_on_failure: Stop the run after the first failing test
     """
-    if not robot_code or not robot_code.strip():
-        yield f"data: {json.dumps({'stage': 'execution', 'status': 'error', 'message': 'No test code provided'})}\n\n"
-        return
+    from src.backend.core.config import settings
+
+    if run_id in _active_execution_runs:
+        # Coalesced generations share a workflow_id; concurrent runs need separate directories/containers
+        run_id = f"{run_id}-{uuid.uuid4().hex[:8]}"
+        logging.info(f"🆔 Run ID already executing, using {run_id}")
+    _active_execution_runs.add(run_id)
 
-    # Use provided workflow_id for unified tracking, or generate new one for standalone execution
-    run_id = workflow_id if workflow_id else str(uuid.uuid4())
-    logging.info(f"🆔 Execution ID (unified): {run_id}")
     robot_tests_dir = os.path.join(os.path.dirname(
         os.path.abspath(__file__)), '..', '..', '..', 'robot_tests')
     run_dir = os.path.join(robot_tests_dir, run_id)
     os.makedirs(run_dir, exist_ok=True)
     test_filename = "test.robot"
     test_filepath = os.path.join(run_dir, test_filename)
-    
+
     try:
         with open(test_filepath, 'w', encoding='utf-8') as f:
             f.write(robot_code)
         logging.info(f"📝 Saved test code to {test_filepath}")
     except Exception as e:
         logging.error(f"Failed to save test code: {e}")
+        _active_execution_runs.discard(run_id)
         yield f"data: {json.dumps({'stage': 'execution', 'status': 'error', 'message': f'Failed to save test code: {str(e)}'})}\n\n"
         return
 
-    try:
-        client = get_docker_client()
-        for event in build_image(client):
-            yield f"data: {json.dumps({'stage': 'execution', **event})}\n\n"
+    loop = asyncio.get_running_loop()
+    channel = WorkflowEventChannel(heartbeat_interval=settings.SSE_HEARTBEAT_INTERVAL)
+    execution = loop.run_in_executor(get_docker_executor(), run_execution_in_thread, channel, run_id, test_filename,
+                                     abort_on_failure)
+    # Release the run ID when the run finishes, even if the client disconnected earlier
+    execution.add_done_callback(lambda _: _active_execution_runs.discard(run_id))
 
-        # Execute test
-        logging.info(f"🚀 Executing test: {test_filename}")
-        result = run_test_in_container(client, run_id, test_filename)
-        yield f"data: {json.dumps({'stage': 'execution', **result})}\n\n"
-        
-        # Pattern learning: ONLY learn from PASSED tests
-        _learn_from_successful_test(user_query, robot_code, result.get('test_status', 'unknown'))
+    test_status = None
+    async for event in channel:
+        if event is HEARTBEAT:
+            yield ": heartbeat\n\n"
+            continue
+        yield f"data: {json.dumps({'stage': 'execution', **event})}\n\n"
+        if 'test_status' in event:
+            test_status = event['test_status']
 
-    except (ConnectionError, RuntimeError, Exception) as e:
-        logging.error(f"An error occurred during Docker execution: {e}")
-        yield f"data: {json.dumps({'stage': 'execution', 'status': 'error', 'message': str(e)})}\n\n"
+    if test_status:
+        # Pattern learning: ONLY learn from PASSED tests (queued, stored by a background worker)
+        _learn_from_successful_test(user_query, robot_code, test_status)
 
 
-async def stream_generate_and_run(user_query: str, model_provider: str, model_name: str) -> Generator[str, None, None]:
+async def stream_generate_only(user_query: str, model_provider: str, model_name: str,
+                               bypass_cache: bool = False,
+                               cached_events: Optional[List[Dict[str, Any]]] = None) -> Generator[str, None, None]:
     """
-    Legacy endpoint: Generates and executes test in one flow.
-    Kept for backward compatibility.
+    Generates Robot Framework test code without executing it.
+    Allows user to review and edit before execution.
     """
-    robot_code = None
-    workflow_id = None  # Capture workflow_id from generation for unified tracking
-    q = Queue()
+    result: Dict[str, Any] = {}
+    async for frame in _stream_generation_events(user_query, model_provider, model_name, result, bypass_cache,
+                                                 cached_events):
+        yield frame
 
-    workflow_thread = Thread(
-        target=run_workflow_in_thread,
-        args=(q, user_query, model_provider, model_name)
-    )
-    workflow_thread.start()
+    if not result.get("robot_code"):
+        return
 
-    while workflow_thread.is_alive():
-        try:
-            event = q.get_nowait()
-            event_data = {'stage': 'generation', **event}
-            yield f"data: {json.dumps(event_data)}\n\n"
+    # Generation complete - return code without execution
+    logging.info("✅ Test generation complete. Ready for user review.")
 
-            if event.get("status") == "complete" and "robot_code" in event:
-                robot_code = event["robot_code"]
-                workflow_id = event.get("workflow_id")  # Capture for unified execution
-                workflow_thread.join()
-                break
-            elif event.get("status") == "error":
-                workflow_thread.join()
-                return
-        except Empty:
-            yield ": heartbeat\n\n"
-            await asyncio.sleep(1)
 
+async def stream_execute_only(robot_code: str, user_query: str = None, workflow_id: str = None,
+                              abort_on_failure: bool = False) -> Generator[str, None, None]:
+    """
+    Executes provided Robot Framework test code in Docker container.
+    Accepts user-edited or manually-written code.
+    
+    Args:
+        robot_code: Robot Framework test code to execute
+        user_query: Optional original user query for pattern learning
+        workflow_id: Optional workflow ID from generation phase (for unified ID tracking)
+        abort_on_failure: Stop the run after the first failing test
+    """
+    if not robot_code or not robot_code.strip():
+        yield f"data: {json.dumps({'stage': 'execution', 'status': 'error', 'message': 'No test code provided'})}\n\n"
+        return
+
+    # Use provided workflow_id for unified tracking, or generate new one for standalone execution
+    run_id = workflow_id if workflow_id else str(uuid.uuid4())
+    logging.info(f"🆔 Execution ID (unified): {run_id}")
+
+    async for frame in _stream_execution_events(robot_code, run_id, user_query, abort_on_failure):
+        yield frame
+
+
+async def stream_generate_and_run(user_query: str, model_provider: str, model_name: str,
+                                  bypass_cache: bool = False,
+                                  cached_events: Optional[List[Dict[str, Any]]] = None) -> Generator[str, None, None]:
+    """
+    Legacy endpoint: Generates and executes test in one flow.
+    Kept for backward compatibility.
+    """
+    result: Dict[str, Any] = {}
+    async for frame in _stream_generation_events(user_query, model_provider, model_name, result, bypass_cache,
+                                                 cached_events):
+        yield frame
+
+    robot_code = result.get("robot_code")
     if not robot_code:
-        while not q.empty():
-            event = q.get_nowait()
-            event_data = {'stage': 'generation', **event}
-            yield f"data: {json.dumps(event_data)}\n\n"
-            if event.get("status") == "complete" and "robot_code" in event:
-                robot_code = event["robot_code"]
-                workflow_id = event.get("workflow_id")  # Capture for unified execution
-            elif event.get("status") == "error":
-                return
-        if not robot_code:
-            final_error_message = "Agentic workflow finished without generating code."
-            logging.error(final_error_message)
-            yield f"data: {json.dumps({'stage': 'generation', 'status': 'error', 'message': final_error_message})}\n\n"
-            return
+        return
+    # Capture workflow_id from generation for unified tracking
+    workflow_id = result.get("workflow_id")
 
     # Use workflow_id from generation for unified tracking (same ID for metrics and files)
     run_id = workflow_id if workflow_id else str(uuid.uuid4())
     logging.info(f"🆔 Execution ID (unified with generation): {run_id}")
-    robot_tests_dir = os.path.join(os.path.dirname(
-        os.path.abspath(__file__)), '..', '..', '..', 'robot_tests')
-    run_dir = os.path.join(robot_tests_dir, run_id)
-    os.makedirs(run_dir, exist_ok=True)
-    test_filename = "test.robot"
-    test_filepath = os.path.join(run_dir, test_filename)
-    with open(test_filepath, 'w', encoding='utf-8') as f:
-        f.write(robot_code)
-
-    try:
-        client = get_docker_client()
-        for event in build_image(client):
-            yield f"data: {json.dumps({'stage': 'execution', **event})}\n\n"
 
-        # Execute test (healing system removed - locators are validated during generation)
-        logging.info(f"🚀 Executing test: {test_filename}")
-        result = run_test_in_container(client, run_id, test_filename)
-        yield f"data: {json.dumps({'stage': 'execution', **result})}\n\n"
-        
-        # Pattern learning: ONLY learn from PASSED tests
-        _learn_from_successful_test(user_query, robot_code, result.get('test_status', 'unknown'))
-
-    except (ConnectionError, RuntimeError, Exception) as e:
-        logging.error(f"An error occurred during Docker execution: {e}")
-        yield f"data: {json.dumps({'stage': 'execution', 'status': 'error', 'message': str(e)})}\n\n"
+    async for frame in _stream_execution_events(robot_code, run_id, user_query):
+        yield frame
 
 
 # Healing system removed - locators are validated during generation by browser-use
@@ -984,6 +984,11 @@ document.addEventListener('DOMContentLoaded', () => {
                 body: JSON.stringify(requestPayload),
             });
 
+            if (response.status === 429) {
+                const retryAfter = response.headers.get('Retry-After');
+                throw new Error(`Server is busy with other generations. Please retry in ${retryAfter || 'a few'} seconds.`);
+            }
+
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
@@ -1114,7 +1119,7 @@ document.addEventListener('DOMContentLoaded', () => {
     function handleGenerationData(data) {
         updateStatus('processing', data.message);
 
-        if (data.status === 'running') {
+        if (data.status === 'running' || data.status === 'queued') {
             const stage = data.stage || 'generation';
             const logEntry = createLogEntry(data, stage);
             routeLogToContainer(logEntry, stage);
@@ -1277,7 +1282,7 @@ document.addEventListener('DOMContentLoaded', () => {
     function handleExecutionData(data) {
         updateStatus('processing', data.message);
 
-        if (data.status === 'running') {
+        if (data.status === 'running' || data.status === 'queued') {
             const stage = data.stage || 'execution';
             const logEntry = createLogEntry(data, stage);
             routeLogToContainer(logEntry, stage);
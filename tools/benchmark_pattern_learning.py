@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Pattern Learning Throughput Benchmark
+
+Measures how many learn_from_execution calls per second QueryPatternMatcher
+sustains with several writer threads, while one reader polls
+get_keyword_stats. Only the SQLite statistics path is exercised (no ChromaDB
+store), against a temporary database.
+
+Usage:
+    python tools/benchmark_pattern_learning.py
+    python tools/benchmark_pattern_learning.py --threads 16 --calls 20000
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.crew_ai.optimization.pattern_learning import QueryPatternMatcher  # noqa: E402
+
+SAMPLE_CODE = """*** Settings ***
+Library    Browser
+
+*** Test Cases ***
+Search Product
+    New Browser    chromium    headless=True
+    New Page    https://example.com
+    Fill Text    id=search    laptop
+    Click    id=submit
+    ${title}=    Get Text    h1
+    Close Browser
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark QueryPatternMatcher learning throughput'
+    )
+    parser.add_argument(
+        '--threads', '-t', type=int, default=8,
+        help='Number of writer threads (default: 8)'
+    )
+    parser.add_argument(
+        '--calls', '-n', type=int, default=8000,
+        help='Total learn_from_execution calls (default: 8000)'
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        matcher = QueryPatternMatcher(db_path=str(Path(workdir) / "pattern_learning.db"))
+        calls_per_thread = max(1, args.calls // args.threads)
+
+        def writer():
+            for _ in range(calls_per_thread):
+                matcher.learn_from_execution("search for a laptop on example.com", SAMPLE_CODE)
+
+        threads = [threading.Thread(target=writer) for _ in range(args.threads)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        reads = 0
+        while any(thread.is_alive() for thread in threads):
+            matcher.get_keyword_stats()
+            reads += 1
+
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        total = calls_per_thread * args.threads
+        usage = matcher.get_keyword_stats().get("Click", {}).get("usage_count", 0)
+        matcher.close()
+
+    print(f"\n📊 Pattern learning: {args.threads} writer threads, {total} learn calls")
+    print(f"   Throughput:       {total / elapsed:,.0f} learn calls/s")
+    print(f"   Concurrent reads: {reads:,} get_keyword_stats calls")
+    print(f"   Consistency:      'Click' usage_count={usage} (expected {total})")
+
+
+if __name__ == '__main__':
+    main()
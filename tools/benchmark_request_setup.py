@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Per-Request Prompt Setup Benchmark
+
+Measures what every generation request pays to build its library context and
+task prompt fragments, before (fresh context and fragments per request) and
+after (shared per-library context, fragments rendered once).
+
+The libdoc spec is loaded before timing starts, so the numbers show the
+rendering cost only, not the one-time libdoc extraction.
+
+Usage:
+    python tools/benchmark_request_setup.py
+    python tools/benchmark_request_setup.py --library selenium
+    python tools/benchmark_request_setup.py --requests 1000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.crew_ai import tasks as tasks_module  # noqa: E402
+from src.backend.crew_ai.library_context import (  # noqa: E402
+    BrowserLibraryContext,
+    SeleniumLibraryContext,
+    get_library_context,
+)
+from src.backend.crew_ai.tasks import RobotTasks  # noqa: E402
+
+CONTEXT_CLASSES = {
+    "selenium": SeleniumLibraryContext,
+    "browser": BrowserLibraryContext,
+}
+
+
+def setup_request_uncached(library_type: str) -> None:
+    """Per-request setup as before: new context instance, fragments rendered again."""
+    tasks_module._prompt_fragments.clear()
+    library_context = CONTEXT_CLASSES[library_type]()
+    RobotTasks(library_context)
+    library_context.prerender()
+
+
+def setup_request_cached(library_type: str) -> None:
+    """Per-request setup with the shared context and rendered fragments."""
+    library_context = get_library_context(library_type)
+    RobotTasks(library_context)
+    library_context.prerender()
+
+
+def measure(setup, library_type: str, requests: int) -> list:
+    """Return the duration of each simulated request in microseconds."""
+    durations = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        setup(library_type)
+        durations.append((time.perf_counter() - started) * 1e6)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the per-request library context and task prompt setup'
+    )
+    parser.add_argument(
+        '--library', '-l', type=str, default='browser', choices=sorted(CONTEXT_CLASSES),
+        help='Library type (default: browser)'
+    )
+    parser.add_argument(
+        '--requests', '-n', type=int, default=500,
+        help='Number of simulated requests per variant (default: 500)'
+    )
+
+    args = parser.parse_args()
+
+    # Load the libdoc spec once so both variants start from the same warm state
+    get_library_context(args.library).prerender()
+
+    print(f"\n⏱️  Per-request setup for {args.library} ({args.requests} requests)\n")
+    print(f"   {'variant':<10} {'mean':>10} {'median':>10} {'p95':>10}")
+    results = {}
+    for name, setup in (("before", setup_request_uncached), ("after", setup_request_cached)):
+        durations = sorted(measure(setup, args.library, args.requests))
+        results[name] = statistics.mean(durations)
+        p95 = durations[int(len(durations) * 0.95) - 1]
+        print(f"   {name:<10} {results[name]:>8.1f}us {statistics.median(durations):>8.1f}us {p95:>8.1f}us")
+
+    if results["after"] > 0:
+        print(f"\n✅ Setup is {results['before'] / results['after']:.1f}x faster with shared contexts")
+
+
+if __name__ == '__main__':
+    main()
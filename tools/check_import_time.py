@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+API Import-Time Budget Check
+
+Imports the API entry point in a fresh interpreter with ``-X importtime`` and
+fails (exit code 1) when startup regresses:
+
+- The total import time exceeds the budget, or
+- A heavy subsystem that must only load on first use (crewai, LLM clients,
+  Docker SDK, ChromaDB, ...) is imported at startup
+
+Autoscaled replicas only become healthy after this import finishes, so run
+this in CI after dependency or import changes.
+
+Usage:
+    python tools/check_import_time.py
+    python tools/check_import_time.py --budget 0.8       # Seconds
+    python tools/check_import_time.py --top 25           # Show the 25 slowest imports
+    python tools/check_import_time.py --module src.backend.api.endpoints
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Subsystems that are imported lazily on first use and must not load at startup
+LAZY_MODULES = [
+    "crewai",
+    "crewai_tools",
+    "langchain_ollama",
+    "langchain_core",
+    "litellm",
+    "docker",
+    "chromadb",
+    "sentence_transformers",
+    "torch",
+    "robot",
+]
+
+# "import time: self [us] | cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_imports(module: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        List of (module, self_us, cumulative_us, depth) in import order
+    """
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        print("\n".join(errors[-40:]), file=sys.stderr)
+        raise SystemExit(f"❌ Importing {module} failed (exit code {result.returncode})")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            # Nesting is shown as two spaces per level after the separator
+            entries.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def find_lazy_violations(entries: List[Tuple[str, int, int, int]]) -> Dict[str, int]:
+    """Return the cumulative import time (us) of every lazy subsystem that was imported."""
+    violations = {}
+    for name, _, cumulative_us, _ in entries:
+        top_level = name.split(".")[0]
+        if name == top_level and top_level in LAZY_MODULES:
+            violations[top_level] = cumulative_us
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check the import time of the API process against a budget'
+    )
+    parser.add_argument(
+        '--module', '-m', type=str, default='src.backend.main',
+        help='Module to import (default: src.backend.main)'
+    )
+    parser.add_argument(
+        '--budget', '-b', type=float, default=1.0,
+        help='Maximum total import time in seconds (default: 1.0)'
+    )
+    parser.add_argument(
+        '--top', '-n', type=int, default=15,
+        help='Number of slowest top-level imports to show'
+    )
+
+    args = parser.parse_args()
+
+    entries = measure_imports(args.module)
+    top_level = [e for e in entries if e[3] == 0]
+    total_us = sum(cumulative_us for _, _, cumulative_us, _ in top_level)
+
+    print(f"\n📦 Import time of {args.module}: {total_us / 1e6:.3f}s (budget {args.budget:.3f}s)\n")
+    print(f"   {'cumulative':>12}  module")
+    for name, _, cumulative_us, _ in sorted(top_level, key=lambda e: e[2], reverse=True)[:args.top]:
+        print(f"   {cumulative_us / 1000:>10.1f}ms  {name}")
+
+    failed = False
+    violations = find_lazy_violations(entries)
+    if violations:
+        failed = True
+        print("\n❌ Heavy subsystems imported at startup (must be imported lazily):")
+        for name, cumulative_us in sorted(violations.items(), key=lambda v: v[1], reverse=True):
+            print(f"   {cumulative_us / 1000:>10.1f}ms  {name}")
+
+    if total_us / 1e6 > args.budget:
+        failed = True
+        print(f"\n❌ Import time {total_us / 1e6:.3f}s exceeds the budget of {args.budget:.3f}s")
+
+    if failed:
+        sys.exit(1)
+    print("\n✅ Import time within budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Query Pattern Compaction Tool
+
+Maintenance command for the learned query pattern collection: merges
+near-duplicate patterns (unioning their keywords and keeping counts),
+re-keys patterns by content hash and evicts the least used patterns above
+the size limit. Learning already does this incrementally; run this after
+changing the limits or to compact a store created by an older version.
+
+Stop the API server first when using the NumPy vector backend, since it
+keeps its own in-memory copy of the collection.
+
+Usage:
+    python tools/compact_patterns.py
+    python tools/compact_patterns.py --dry-run
+    python tools/compact_patterns.py --threshold 0.85 --max-patterns 2000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.core.config import settings  # noqa: E402
+from src.backend.crew_ai.optimization import get_component_registry  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compact the learned query pattern collection'
+    )
+    parser.add_argument(
+        '--threshold', '-t', type=float, default=settings.OPTIMIZATION_PATTERN_MERGE_THRESHOLD,
+        help=f'Similarity above which patterns are merged '
+             f'(default: OPTIMIZATION_PATTERN_MERGE_THRESHOLD={settings.OPTIMIZATION_PATTERN_MERGE_THRESHOLD})'
+    )
+    parser.add_argument(
+        '--max-patterns', '-m', type=int, default=settings.OPTIMIZATION_PATTERN_MAX_COUNT,
+        help=f'Maximum patterns to keep, 0 for no limit '
+             f'(default: OPTIMIZATION_PATTERN_MAX_COUNT={settings.OPTIMIZATION_PATTERN_MAX_COUNT})'
+    )
+    parser.add_argument(
+        '--dry-run', '-n', action='store_true',
+        help='Only report what would change'
+    )
+
+    args = parser.parse_args()
+
+    if not 0.0 <= args.threshold <= 1.0:
+        parser.error(f"--threshold must be between 0.0 and 1.0, got {args.threshold}")
+    if args.max_patterns < 0:
+        parser.error(f"--max-patterns must be 0 or greater, got {args.max_patterns}")
+
+    matcher = get_component_registry().get_pattern_matcher()
+
+    started = time.perf_counter()
+    stats = matcher.compact(merge_threshold=args.threshold, max_patterns=args.max_patterns,
+                            dry_run=args.dry_run)
+    elapsed = time.perf_counter() - started
+
+    title = "Dry run, nothing changed" if args.dry_run else "Compaction complete"
+    print(f"\n🧹 {title} ({elapsed:.2f}s)")
+    print(f"   Patterns before: {stats['patterns_before']}")
+    print(f"   Merged:          {stats['merged']}")
+    print(f"   Evicted:         {stats['evicted']}")
+    print(f"   Re-keyed:        {stats['rekeyed']}")
+    print(f"   Patterns after:  {stats['patterns_after']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Keyword Search Evaluation
+
+Runs a fixed set of agent-style keyword searches against one library in
+each retrieval mode of KeywordVectorStore.hybrid_search ("vector",
+"lexical", "hybrid") and reports retrieval quality and latency:
+
+- hit@1 / hit@3: share of queries with an expected keyword in the top 1 / 3
+- MRR: mean reciprocal rank of the first expected keyword
+- p50 / p95 latency per search (the search cache is not involved)
+- embedded: share of searches that ran the embedding model
+
+Queries whose expected keywords do not exist in the installed library
+version are skipped. With --mode lexical the keyword index is built
+straight from the libdoc spec, so neither ChromaDB nor the embedding model
+is loaded.
+
+Usage:
+    python tools/evaluate_keyword_search.py
+    python tools/evaluate_keyword_search.py --library SeleniumLibrary
+    python tools/evaluate_keyword_search.py --library Browser --mode lexical --verbose
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.crew_ai.optimization import get_component_registry  # noqa: E402
+from src.backend.crew_ai.optimization.chroma_store import build_keyword_index  # noqa: E402
+from src.backend.crew_ai.optimization.hybrid_search import SEARCH_MODES, HybridKeywordRetriever  # noqa: E402
+
+# (query, acceptable keyword names) per library
+QUERY_SETS = {
+    "Browser": [
+        ("Wait For Elements State", ["Wait For Elements State"]),
+        ("fill text", ["Fill Text"]),
+        ("new page", ["New Page"]),
+        ("click", ["Click"]),
+        ("click a button", ["Click", "Click With Options"]),
+        ("type text into the search field", ["Fill Text", "Type Text"]),
+        ("enter password", ["Fill Secret", "Type Secret"]),
+        ("checkbox", ["Check Checkbox", "Uncheck Checkbox", "Get Checkbox State"]),
+        ("tick the terms checkbox", ["Check Checkbox"]),
+        ("select option from dropdown", ["Select Options By"]),
+        ("open the website", ["New Page", "Go To"]),
+        ("navigate to url", ["Go To", "New Page"]),
+        ("get the heading text", ["Get Text"]),
+        ("how many items are in the list", ["Get Element Count"]),
+        ("wait for element to be visible", ["Wait For Elements State"]),
+        ("wait until the page is loaded", ["Wait For Load State"]),
+        ("take a screenshot", ["Take Screenshot"]),
+        ("hover over the menu", ["Hover"]),
+        ("upload a file", ["Upload File By Selector"]),
+        ("accept the alert dialog", ["Handle Future Dialogs"]),
+        ("press enter key", ["Keyboard Key", "Press Keys"]),
+        ("scroll down the page", ["Scroll By", "Scroll To", "Scroll To Element"]),
+        ("read an attribute of an element", ["Get Attribute"]),
+        ("current page url", ["Get Url"]),
+        ("close the browser", ["Close Browser"]),
+    ],
+    "SeleniumLibrary": [
+        ("Wait Until Element Is Visible", ["Wait Until Element Is Visible"]),
+        ("input text", ["Input Text"]),
+        ("open browser", ["Open Browser"]),
+        ("click element", ["Click Element"]),
+        ("click a button", ["Click Button", "Click Element"]),
+        ("type text into the search field", ["Input Text"]),
+        ("enter password", ["Input Password"]),
+        ("checkbox", ["Select Checkbox", "Unselect Checkbox", "Checkbox Should Be Selected"]),
+        ("tick the terms checkbox", ["Select Checkbox"]),
+        ("select option from dropdown", ["Select From List By Label", "Select From List By Value",
+                                         "Select From List By Index"]),
+        ("open the website", ["Open Browser", "Go To"]),
+        ("navigate to url", ["Go To"]),
+        ("get the heading text", ["Get Text"]),
+        ("how many items are in the list", ["Get Element Count"]),
+        ("wait for element to be visible", ["Wait Until Element Is Visible"]),
+        ("wait until the page contains text", ["Wait Until Page Contains"]),
+        ("take a screenshot", ["Capture Page Screenshot"]),
+        ("hover over the menu", ["Mouse Over"]),
+        ("upload a file", ["Choose File"]),
+        ("accept the alert dialog", ["Handle Alert"]),
+        ("switch into the iframe", ["Select Frame"]),
+        ("press enter key", ["Press Keys"]),
+        ("scroll down the page", ["Scroll Element Into View", "Execute Javascript"]),
+        ("read an attribute of an element", ["Get Element Attribute"]),
+        ("close the browser", ["Close Browser"]),
+    ],
+}
+
+
+def evaluate(search, queries, mode, top_k, verbose):
+    """
+    Run the queries in one mode and return the aggregated metrics.
+
+    Args:
+        search: Callable(query, top_k, mode) returning hybrid search results
+        queries: (query, acceptable keyword names) pairs
+        mode: "hybrid", "lexical" or "vector"
+        top_k: Results per search
+        verbose: Print the results of every query
+    """
+    latencies = []
+    reciprocal_ranks = []
+    hits_at_1 = 0
+    hits_at_k = 0
+    embedded = 0
+    for query, expected in queries:
+        started = time.perf_counter()
+        results = search(query, top_k, mode)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        names = [kw["name"] for kw in results]
+        rank = next((i + 1 for i, name in enumerate(names) if name in expected), None)
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+        hits_at_1 += rank == 1
+        hits_at_k += rank is not None
+        match = results[0].get("match") if results else None
+        embedded += match in ("hybrid", "vector")
+        if verbose:
+            status = f"rank {rank}" if rank else "miss"
+            print(f"   [{mode:7}] {query!r:42} {status:7} {match or '-':8} {names}")
+
+    latencies.sort()
+    return {
+        "hit@1": hits_at_1 / len(queries),
+        f"hit@{top_k}": hits_at_k / len(queries),
+        "mrr": statistics.mean(reciprocal_ranks),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "embedded": embedded / len(queries),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Evaluate keyword search quality and latency per retrieval mode'
+    )
+    parser.add_argument(
+        '--library', '-l', choices=sorted(QUERY_SETS), default='Browser',
+        help='Library whose keyword collection to search (default: Browser)'
+    )
+    parser.add_argument(
+        '--mode', '-m', choices=SEARCH_MODES, action='append',
+        help='Retrieval mode to evaluate, repeatable (default: all; lexical alone needs no ChromaDB)'
+    )
+    parser.add_argument(
+        '--top-k', '-k', type=int, default=3,
+        help='Results per search (default: 3)'
+    )
+    parser.add_argument(
+        '--verbose', '-v', action='store_true',
+        help='Print the results of every query'
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    modes = [mode for mode in SEARCH_MODES[::-1] if mode in (args.mode or SEARCH_MODES)]
+    if modes == ["lexical"]:
+        try:
+            keyword_index = build_keyword_index(args.library)
+        except Exception as e:
+            print(f"❌ Could not load the {args.library} libdoc: {e}")
+            sys.exit(1)
+        retriever = HybridKeywordRetriever(keyword_index)
+        search = retriever.search
+    else:
+        vector_store = get_component_registry().get_vector_store(args.library)
+        keyword_index = vector_store.get_keyword_index(args.library)
+
+        def search(query, top_k, mode):
+            return vector_store.hybrid_search(args.library, query, top_k, mode=mode)
+
+    queries = [(query, expected) for query, expected in QUERY_SETS[args.library]
+               if any(name.lower() in keyword_index for name in expected)]
+    skipped = len(QUERY_SETS[args.library]) - len(queries)
+    if not queries:
+        print(f"❌ No keywords of {args.library} available, is the library installed?")
+        sys.exit(1)
+
+    # Warm the embedding model and the lexical indexes so the first query is not penalized
+    for mode in modes:
+        search("warm up", args.top_k, mode)
+
+    print(f"\n📊 Keyword search on {args.library}: {len(queries)} queries"
+          + (f" ({skipped} skipped, keywords not in this version)" if skipped else ""))
+    print(f"   {'mode':8} {'hit@1':>6} {f'hit@{args.top_k}':>6} {'MRR':>6} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'embedded':>9}")
+    for mode in modes:
+        metrics = evaluate(search, queries, mode, args.top_k, args.verbose)
+        print(f"   {mode:8} {metrics['hit@1']:6.2f} {metrics[f'hit@{args.top_k}']:6.2f} {metrics['mrr']:6.2f} "
+              f"{metrics['p50_ms']:8.2f} {metrics['p95_ms']:8.2f} {metrics['embedded']:9.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Libdoc Spec Export Tool
+
+Extracts the libdoc JSON spec of each installed Robot Framework library into
+the spec cache directory (``<library>-<version>.json``). Run it at image
+build time to ship the specs with the image: API nodes then never run libdoc,
+and nodes without the libraries installed still get keyword documentation.
+
+Usage:
+    python tools/export_libdoc_specs.py
+    python tools/export_libdoc_specs.py --library Browser
+    python tools/export_libdoc_specs.py --output build/libdoc --force
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.crew_ai.library_context.dynamic_context import (  # noqa: E402
+    _LIBRARY_DISTRIBUTIONS,
+    get_installed_library_version,
+    get_libdoc_spec_dir,
+    get_libdoc_spec_path,
+    write_libdoc_spec,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export libdoc JSON specs of the installed Robot Framework libraries'
+    )
+    parser.add_argument(
+        '--library', '-l', action='append', choices=sorted(_LIBRARY_DISTRIBUTIONS),
+        help='Library to export (repeatable, default: all installed libraries)'
+    )
+    parser.add_argument(
+        '--output', '-o', type=str, default=None,
+        help='Output directory (default: LIBDOC_SPEC_DIR)'
+    )
+    parser.add_argument(
+        '--force', '-f', action='store_true',
+        help='Re-extract specs that already exist'
+    )
+
+    args = parser.parse_args()
+
+    spec_dir = Path(args.output) if args.output else get_libdoc_spec_dir()
+    libraries = args.library or sorted(_LIBRARY_DISTRIBUTIONS)
+    failed = False
+
+    for library_name in libraries:
+        version = get_installed_library_version(library_name)
+        if version is None:
+            print(f"⏭️  {library_name}: not installed, skipped")
+            failed = failed or bool(args.library)
+            continue
+
+        spec_path = get_libdoc_spec_path(library_name, version, spec_dir)
+        if spec_path.exists() and not args.force:
+            print(f"✅ {library_name} {version}: {spec_path} already exists")
+            continue
+
+        started = time.monotonic()
+        try:
+            doc_data = write_libdoc_spec(library_name, spec_path)
+        except Exception as e:
+            print(f"❌ {library_name} {version}: {e}")
+            failed = True
+            continue
+        print(f"✅ {library_name} {version}: {len(doc_data.get('keywords', []))} keywords -> {spec_path} "
+              f"({time.monotonic() - started:.1f}s)")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()